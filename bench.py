@@ -0,0 +1,723 @@
+# bench.py
+"""
+Benchmark de ponta a ponta: replay de eventos do gateway contra os cogs reais.
+
+    # 1) gravação real (anonimizada) — rode o bot com GATEWAY_RECORD=gravacao.jsonl.gz
+    #    (ver core/recorder.py), ou gere uma sintética:
+    python bench.py sintetico bench.jsonl.gz --servidores 3 --membros 300 --segundos 60 --taxa 30
+
+    # 2) replay a 1x, 10x e 100x (um processo por velocidade)
+    python bench.py replay bench.jsonl.gz
+    python bench.py replay bench.jsonl.gz --velocidades 1,10,100,max --latencia-ms 40 --json > build_nova.json
+    python bench.py replay bench.jsonl.gz --comparar build_antiga.json
+
+O replay importa o main.py de verdade (mesmos cogs, pipeline, cache,
+filas e métricas de produção) e troca só as bordas:
+
+    - gateway: os eventos entram pelos mesmos parsers do discord.py
+      (`ConnectionState.parsers`), no ritmo da gravação dividido pela
+      velocidade ("max" = sem esperar);
+    - REST: `HTTPClient.request` e o adapter de webhooks (respostas de
+      interação) viram um Discord falso que responde na hora (ou com
+      --latencia-ms) e conta as chamadas por rota;
+    - banco: SQLite embutido num diretório temporário (padrão), ou um
+      Mongo local com --mongo (bancos "bench_*", apagados no fim).
+
+Antes do replay, cada servidor recebe configs que ligam segurança,
+auto-mod, auto-resposta, XP e boas-vindas (--sem-configs desliga). Em
+gravações reais o texto está anonimizado: palavras proibidas e gatilhos de
+auto-resposta não batem, mas CAPS, repetição, links, convites e menções
+continuam valendo.
+
+Relatório por velocidade: eventos/s, latência p50/p95/p99 de cada etapa
+do pipeline, de cada listener (ex.: Welcome.on_member_join) e de cada
+comando (medida desde a chegada do evento), operações de banco e chamadas
+REST por evento, maior atraso do event loop e etapas adiadas/descartadas
+pelo controle de sobrecarga.
+"""
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import asyncio
+import argparse
+import datetime
+import tempfile
+import subprocess
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from core.recorder import read_recording, write_recording
+
+DISCORD_EPOCH = 1420070400000
+SPEEDS = "1,10,100"
+DRAIN_TIMEOUT = 120
+
+
+def _percentiles(values: List[float]) -> dict:
+    if not values:
+        return {"count": 0, "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+    values = sorted(values)
+
+    def pick(q: float) -> float:
+        return round(values[min(len(values) - 1, int(q * len(values)))] * 1000, 2)
+    return {
+        "count": len(values),
+        "p50_ms": pick(0.5),
+        "p95_ms": pick(0.95),
+        "p99_ms": pick(0.99),
+        "max_ms": round(values[-1] * 1000, 2),
+    }
+
+
+# ────────────────────────────────────────────────
+# Gravação sintética
+# ────────────────────────────────────────────────
+
+WORDS = (
+    "bom dia pessoal alguem vai jogar hoje mais tarde eu acho que sim nao sei talvez "
+    "o servidor ta muito bom kkkk verdade qual era o nome daquele filme vamos marcar "
+    "amanha depois do almoco quem ganhou a partida ontem foi demais obrigado valeu"
+).split()
+LINKS = (
+    "https://youtube.com/watch?v=dQw4w9WgXcQ",
+    "https://discord.gg/convite123",
+    "https://exemplo.com.br/promocao",
+    "https://tenor.com/view/gato-123",
+)
+BANNED = ("palavrao", "golpe")
+TRIGGERS = {"oi": "Olá! 👋", "tchau": "Até mais!"}
+COMMANDS = ("rank", "balance", "daily", "work")
+
+
+class _Synthetic:
+    def __init__(self, seed: int):
+        self.rng = random.Random(seed)
+        self.now_ms = int(time.time() * 1000)
+        self._seq = 0
+
+    def snowflake(self, ago_seconds: float = 0.0) -> str:
+        self._seq = (self._seq + 1) & 0xFFF
+        ms = int(self.now_ms - ago_seconds * 1000) - DISCORD_EPOCH
+        return str((ms << 22) | (self.rng.getrandbits(10) << 12) | self._seq)
+
+    @staticmethod
+    def iso(ago_seconds: float = 0.0) -> str:
+        moment = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(seconds=ago_seconds)
+        return moment.isoformat()
+
+    def user(self, new_account: bool = False) -> dict:
+        age = self.rng.uniform(60, 600) if new_account else self.rng.uniform(30, 2000) * 86400
+        user_id = self.snowflake(age)
+        return {"id": user_id, "username": f"user-{user_id[-6:]}", "global_name": None,
+                "discriminator": "0", "avatar": None, "bot": False}
+
+    def member(self, user: Optional[dict], roles: List[str], joined_ago: float) -> dict:
+        member = {"roles": roles, "joined_at": self.iso(joined_ago), "nick": None,
+                  "deaf": False, "mute": False, "flags": 0, "pending": False}
+        if user is not None:
+            member["user"] = user  # em MESSAGE_CREATE o usuário vem em "author"
+        return member
+
+    def text(self, words: Tuple[int, int] = (3, 14)) -> str:
+        return " ".join(self.rng.choice(WORDS) for _ in range(self.rng.randint(*words)))
+
+
+def synthetic_recording(path: str, guilds: int = 3, members: int = 300, seconds: float = 60.0,
+                        rate: float = 30.0, joins_per_minute: float = 6.0, commands_per_minute: float = 30.0,
+                        seed: int = 1) -> int:
+    """Gera uma gravação com a mistura de tráfego de um servidor movimentado. Retorna o nº de eventos."""
+    gen = _Synthetic(seed)
+    rng = gen.rng
+    bot_user = {"id": gen.snowflake(3 * 365 * 86400), "username": "bench-bot", "global_name": None,
+                "discriminator": "0", "avatar": None, "bot": True}
+    events: List[Tuple[float, str, dict]] = [(0.0, "READY", {"user": bot_user})]
+    world = []
+
+    for index in range(guilds):
+        guild_id = gen.snowflake(2 * 365 * 86400)
+        bot_role, muted_role = gen.snowflake(365 * 86400), gen.snowflake(365 * 86400)
+        channels = [gen.snowflake(365 * 86400) for _ in range(3)]
+        users = [gen.user() for _ in range(members)]
+        events.append((0.0, "GUILD_CREATE", {
+            "id": guild_id, "name": f"guild-{index}", "owner_id": users[0]["id"], "unavailable": False,
+            "member_count": members + 1, "large": members > 250, "features": [], "premium_tier": 0,
+            "verification_level": 0, "default_message_notifications": 0, "explicit_content_filter": 0,
+            "mfa_level": 0, "nsfw_level": 0, "system_channel_flags": 0, "preferred_locale": "pt-BR",
+            "joined_at": gen.iso(365 * 86400), "emojis": [], "stickers": [], "threads": [],
+            "stage_instances": [], "guild_scheduled_events": [], "soundboard_sounds": [],
+            "presences": [], "voice_states": [],
+            "roles": [
+                {"id": guild_id, "name": "@everyone", "permissions": "1071698660929", "position": 0,
+                 "color": 0, "hoist": False, "managed": False, "mentionable": False, "flags": 0},
+                {"id": muted_role, "name": "Muted", "permissions": "0", "position": 1,
+                 "color": 0, "hoist": False, "managed": False, "mentionable": False, "flags": 0},
+                {"id": bot_role, "name": "bench-bot", "permissions": "8", "position": 2,
+                 "color": 0, "hoist": False, "managed": True, "mentionable": False, "flags": 0},
+            ],
+            "channels": [
+                {"id": channel_id, "type": 0, "name": name, "position": position, "guild_id": guild_id,
+                 "permission_overwrites": [], "nsfw": False, "parent_id": None, "rate_limit_per_user": 0}
+                for position, (channel_id, name) in enumerate(zip(channels, ("geral", "boas-vindas", "off-topic")))
+            ],
+            "members": [gen.member(bot_user, [bot_role], 365 * 86400)] + [
+                gen.member(user, [], rng.uniform(1, 700) * 86400) for user in users
+            ],
+        }))
+        world.append({"id": guild_id, "channels": [channels[0], channels[2]], "users": users})
+
+    def message(at: float, guild: dict, user: dict, content: str):
+        events.append((at, "MESSAGE_CREATE", {
+            "id": gen.snowflake(seconds - at), "type": 0, "channel_id": rng.choice(guild["channels"]),
+            "guild_id": guild["id"], "author": user, "member": gen.member(None, [], 86400), "content": content, "timestamp": gen.iso(seconds - at),
+            "edited_timestamp": None, "tts": False, "mention_everyone": False,
+            "mentions": [], "mention_roles": [], "attachments": [], "embeds": [], "pinned": False,
+        }))
+
+    # Mensagens: conversa normal com links, CAPS, menções, palavrões, gatilhos e rajadas de spam
+    at = 0.1
+    while at < seconds:
+        guild = rng.choice(world)
+        user = rng.choice(guild["users"])
+        kind = rng.random()
+        if kind < 0.04:
+            spam = gen.text((2, 5))
+            for _ in range(rng.randint(4, 7)):
+                message(at, guild, user, spam)
+                at += rng.uniform(0.05, 0.3)
+            continue
+        if kind < 0.10:
+            content = f"{gen.text((1, 5))} {rng.choice(LINKS)}"
+        elif kind < 0.15:
+            content = gen.text().upper()
+        elif kind < 0.20:
+            content = f"<@{rng.choice(guild['users'])['id']}> {gen.text()}"
+        elif kind < 0.23:
+            content = f"{gen.text((1, 4))} {rng.choice(BANNED)}"
+        elif kind < 0.28:
+            content = f"{rng.choice(list(TRIGGERS))} {gen.text((0, 3))}"
+        else:
+            content = gen.text()
+        message(at, guild, user, content)
+        at += rng.expovariate(rate)
+
+    # Entradas: fluxo normal e uma onda de contas novas (anti-raid) no meio
+    for guild in world:
+        def join(at: float, new_account: bool = False):
+            user = gen.user(new_account)
+            events.append((at, "GUILD_MEMBER_ADD", {"guild_id": guild["id"], **gen.member(user, [], seconds - at)}))
+
+        at = rng.expovariate(joins_per_minute / 60) if joins_per_minute else seconds
+        while at < seconds:
+            join(at)
+            at += rng.expovariate(joins_per_minute / 60)
+        if seconds >= 20:
+            raid_at = seconds / 2
+            for _ in range(15):
+                join(raid_at, new_account=True)
+                raid_at += rng.uniform(0.05, 0.4)
+
+    # Slash commands
+    command_ids = {name: gen.snowflake(365 * 86400) for name in COMMANDS}
+    at = rng.expovariate(commands_per_minute / 60) if commands_per_minute else seconds
+    while at < seconds:
+        guild = rng.choice(world)
+        user = rng.choice(guild["users"])
+        name = rng.choice(COMMANDS)
+        channel_id = guild["channels"][0]
+        events.append((at, "INTERACTION_CREATE", {
+            "id": gen.snowflake(seconds - at), "application_id": bot_user["id"], "type": 2,
+            "token": "%032x" % rng.getrandbits(128), "version": 1, "guild_id": guild["id"],
+            "channel_id": channel_id, "channel": {"id": channel_id, "type": 0, "guild_id": guild["id"], "name": "geral"},
+            "member": gen.member(user, [], 86400) | {"permissions": "1071698660929"},
+            "data": {"id": command_ids[name], "name": name, "type": 1, "options": []},
+            "app_permissions": "8", "locale": "pt-BR", "guild_locale": "pt-BR", "entitlements": [],
+            "authorizing_integration_owners": {"0": guild["id"]}, "context": 0,
+            "attachment_size_limit": 8 * 1024 * 1024,
+        }))
+        at += rng.expovariate(commands_per_minute / 60)
+
+    events.sort(key=lambda event: event[0])
+    events = [(round(offset, 4), kind, data) for offset, kind, data in events]
+    write_recording(path, events, synthetic=True, seed=seed)
+    return len(events)
+
+
+# ────────────────────────────────────────────────
+# Discord falso (REST)
+# ────────────────────────────────────────────────
+
+class FakeDiscord:
+    """Responde às chamadas REST com payloads plausíveis e conta por rota."""
+
+    def __init__(self, bot, latency: float = 0.0):
+        self.bot = bot
+        self.latency = latency
+        self.calls: Counter = Counter()
+        self.interaction_channels: Dict[str, int] = {}  # token → canal (followups)
+        self._seq = 0
+
+    def install(self):
+        from discord.webhook.async_ import AsyncWebhookAdapter
+
+        self.bot.http.request = self.request
+        fake = self
+
+        async def webhook_request(adapter, route, session=None, **kwargs):
+            return await fake.request(route, **kwargs)
+        AsyncWebhookAdapter.request = webhook_request
+
+    def _snowflake(self) -> str:
+        self._seq = (self._seq + 1) & 0x3FFFFF
+        return str(((int(time.time() * 1000) - DISCORD_EPOCH) << 22) | self._seq)
+
+    def _message(self, channel_id, payload: Optional[dict]) -> dict:
+        me = self.bot.user
+        payload = payload or {}
+        return {
+            "id": self._snowflake(), "type": 0, "channel_id": str(channel_id or 0),
+            "author": {"id": str(me.id), "username": me.name, "discriminator": "0", "avatar": None, "bot": True},
+            "content": payload.get("content") or "", "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "edited_timestamp": None, "tts": False, "mention_everyone": False, "mentions": [], "mention_roles": [],
+            "attachments": [], "embeds": payload.get("embeds") or [], "pinned": False, "flags": payload.get("flags", 0),
+        }
+
+    def _member(self, route, payload: Optional[dict]) -> Optional[dict]:
+        guild = self.bot.get_guild(int(route.guild_id))
+        user_id = int(route.url.rstrip("/").rsplit("/", 1)[1])
+        member = guild.get_member(user_id) if guild else None
+        if member is None:
+            return None
+        return {
+            "user": {"id": str(member.id), "username": member.name, "discriminator": "0", "avatar": None},
+            "roles": [str(role_id) for role_id in member._roles], "joined_at": member.joined_at.isoformat()
+            if member.joined_at else None, "deaf": False, "mute": False, "flags": 0, "nick": member.nick,
+            "communication_disabled_until": (payload or {}).get("communication_disabled_until"),
+        }
+
+    async def request(self, route, **kwargs):
+        self.calls[f"{route.method} {route.path}"] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        payload = kwargs.get("json") or kwargs.get("payload")
+        key = (route.method, route.path)
+
+        if key == ("GET", "/gateway/bot"):
+            return {"url": "wss://gateway.discord.gg", "shards": 1, "session_start_limit": {
+                "total": 1000, "remaining": 1000, "reset_after": 0, "max_concurrency": 1}}
+        if key == ("POST", "/channels/{channel_id}/messages"):
+            return self._message(route.channel_id, payload)
+        if key == ("PATCH", "/guilds/{guild_id}/members/{user_id}"):
+            return self._member(route, payload)
+        if key == ("GET", "/users/{user_id}"):
+            user_id = int(route.url.rsplit("/", 1)[1])
+            user = self.bot.get_user(user_id)
+            return {"id": str(user_id), "username": user.name if user else f"user-{user_id % 1000000}",
+                    "discriminator": "0", "avatar": None, "global_name": None}
+        if key == ("POST", "/interactions/{webhook_id}/{webhook_token}/callback"):
+            return {"interaction": {"id": str(route.webhook_id), "type": 2, "response_message_loading": False,
+                                    "response_message_ephemeral": False}}
+        if route.path.startswith("/webhooks/{webhook_id}/{webhook_token}"):
+            if route.method == "DELETE":
+                return None
+            # Followups / edição da resposta original
+            return self._message(self.interaction_channels.get(route.webhook_token), payload)
+        return None
+
+
+# ────────────────────────────────────────────────
+# Replay (processo filho, uma velocidade)
+# ────────────────────────────────────────────────
+
+class Timings:
+    def __init__(self):
+        self.values: Dict[str, List[float]] = defaultdict(list)
+        self.pending = 0
+
+    def add(self, name: str, elapsed: float):
+        self.values[name].append(elapsed)
+
+    def summary(self, prefix: str = "") -> Dict[str, dict]:
+        return {
+            name[len(prefix):]: _percentiles(values)
+            for name, values in sorted(self.values.items()) if name.startswith(prefix)
+        }
+
+
+def _instrument(bot, timings: Timings):
+    # Etapas do pipeline: tempo de cada handler
+    for stage in bot.pipeline.stages:
+        def timed_stage(ctx, _handler=stage.handler, _name=f"etapa:{stage.name}"):
+            async def run():
+                start = time.perf_counter()
+                try:
+                    await _handler(ctx)
+                finally:
+                    timings.add(_name, time.perf_counter() - start)
+            return run()
+        stage.handler = timed_stage
+
+    # Listeners: desde a chegada do evento (inclui a fila do event loop)
+    schedule = bot._schedule_event
+
+    def schedule_event(coro, event_name, *args, **kwargs):
+        name = f"listener:{getattr(coro, '__qualname__', event_name)}"
+        queued = time.perf_counter()
+        timings.pending += 1
+
+        async def timed(*a, **kw):
+            try:
+                await coro(*a, **kw)
+            finally:
+                timings.pending -= 1
+                timings.add(name, time.perf_counter() - queued)
+        return schedule(timed, event_name, *args, **kwargs)
+    bot._schedule_event = schedule_event
+
+    # Slash commands: da chegada da interação ao fim do comando
+    tree = bot.tree
+    from_interaction, call = tree._from_interaction, tree._call
+    queued_at: Dict[int, float] = {}
+
+    def tree_from_interaction(interaction):
+        queued_at[interaction.id] = time.perf_counter()
+        timings.pending += 1
+        return from_interaction(interaction)
+
+    async def tree_call(interaction):
+        try:
+            await call(interaction)
+        finally:
+            timings.pending -= 1
+            start = queued_at.pop(interaction.id, None)
+            if start is not None:
+                timings.add(f"comando:/{interaction.data.get('name')}", time.perf_counter() - start)
+    tree._from_interaction = tree_from_interaction
+    tree._call = tree_call
+
+
+async def _seed_configs(bot, guilds: List[dict]):
+    """Liga segurança, auto-mod, auto-resposta, XP e boas-vindas em todos os servidores."""
+    for guild in guilds:
+        guild_id = int(guild["id"])
+        text_channels = [int(c["id"]) for c in guild.get("channels", []) if c.get("type") == 0]
+        await bot.cogs_db.security_configs.replace_one({"_id": str(guild_id)}, {
+            "_id": str(guild_id),
+            "anti_raid": {"enabled": True, "join_threshold": 10, "time_window": 10, "action": "kick"},
+            "anti_links": {"enabled": True, "allowed_domains": ["youtube.com", "tenor.com"], "action": "delete"},
+            "anti_spam": {"enabled": True, "message_threshold": 5, "time_window": 10, "action": "delete"},
+            "anti_nuke": {"enabled": False, "change_threshold": 3, "time_window": 60, "action": "ban"},
+        }, upsert=True)
+        await bot.cogs_db.automod_configs.replace_one({"_id": str(guild_id)}, {
+            "_id": str(guild_id), "enabled": True, "banned_words": list(BANNED),
+            "caps_threshold": 70, "repeat_threshold": 3, "action": "delete",
+        }, upsert=True)
+        await bot.db.guild_configs.replace_one({"guild_id": guild_id}, {
+            "guild_id": guild_id, "xp_per_msg": 10, "xp_cooldown": 45, "xp_multiplier": 1.0,
+            "xp_curve": 1.5, "level_rewards": [], "auto_responses": TRIGGERS,
+        }, upsert=True)
+        if text_channels:
+            await bot.db.welcome_configs.replace_one({"guild_id": guild_id}, {
+                "guild_id": guild_id, "enabled": True, "channel_id": text_channels[-1],
+            }, upsert=True)
+
+
+def _prepare_environment(ready: dict, mongo_uri: Optional[str], workdir: str):
+    """Antes de importar o main.py: ele lê tudo do ambiente."""
+    os.environ["DISCORD_TOKEN"] = "bench"
+    os.environ["APPLICATION_ID"] = ready["user"]["id"]
+    os.environ["CLUSTER_ID"] = "1"          # não sincroniza os slash commands
+    os.environ["GATEWAY_RECORD"] = ""       # nunca grava o próprio replay
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    if mongo_uri:
+        os.environ["STORAGE_BACKEND"] = "mongo"
+        os.environ["MONGO_URI"] = mongo_uri
+        os.environ["DATABASE_NAME"] = "bench_discordbot"
+        os.environ["COGS_DATABASE_NAME"] = "bench_discord_bot"
+    else:
+        os.environ["STORAGE_BACKEND"] = "sqlite"
+        os.environ["MONGO_URI"] = ""
+        os.environ["SQLITE_PATH"] = os.path.join(workdir, "bench.db")
+
+
+def _now_iso() -> str:
+    return datetime.datetime.now(datetime.timezone.utc).isoformat()
+
+
+async def replay(path: str, speed: float, latency: float, mongo_uri: Optional[str], seed_configs: bool) -> dict:
+    _, stream = read_recording(path)
+    events = list(stream)
+    ready = next((data for _, kind, data in events if kind == "READY"), None)
+    if ready is None:
+        raise SystemExit(f"{path}: gravação sem READY")
+    guilds = [data for _, kind, data in events if kind == "GUILD_CREATE"]
+    traffic = [(offset, kind, data) for offset, kind, data in events if kind not in ("READY", "GUILD_CREATE")]
+
+    workdir = tempfile.mkdtemp(prefix="bench-")
+    _prepare_environment(ready, mongo_uri, workdir)
+
+    import discord
+    import main
+    from core import metrics, dbprofile
+
+    bot = main.bot
+    fake = FakeDiscord(bot, latency)
+    fake.install()
+    await bot._async_setup_hook()
+
+    state = bot._connection
+    state.user = discord.ClientUser(state=state, data=ready["user"])
+    state._users[state.user.id] = state.user
+    if mongo_uri:
+        await bot.db.client.drop_database(bot.db.name)
+        await bot.db.client.drop_database(bot.cogs_db.name)
+    await bot.setup_hook()
+    if bot.db is None:
+        raise SystemExit("Banco indisponível para o replay")
+    for data in guilds:
+        state._add_guild_from_data(data)
+    if seed_configs:
+        await _seed_configs(bot, guilds)
+    bot._ready.set()
+
+    timings = Timings()
+    _instrument(bot, timings)
+    parsers = state.parsers
+
+    # Zera os contadores depois do setup (carga dos cogs, configs)
+    db_ops_before = dict(metrics.MONGO_OPS._values)
+    shed_before = dict(metrics.PIPELINE_SHED._values)
+    fake.calls.clear()
+    if dbprofile.PROFILER is not None:
+        dbprofile.PROFILER.reset()
+    bot.loop_monitor.max_lag = 0.0
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    behind = 0.0
+    kinds = Counter()
+    for offset, kind, data in traffic:
+        if speed:
+            delay = started + offset / speed - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                behind = max(behind, -delay)
+        # Horários da gravação viram "agora" (cooldowns, anti-raid, idade da entrada)
+        if kind == "MESSAGE_CREATE":
+            data["timestamp"] = _now_iso()
+        elif kind == "GUILD_MEMBER_ADD":
+            data["joined_at"] = _now_iso()
+        elif kind == "INTERACTION_CREATE":
+            fake.interaction_channels[data["token"]] = data.get("channel_id")
+        parser = parsers.get(kind)
+        if parser is None:
+            continue
+        kinds[kind] += 1
+        try:
+            parser(data)
+        except Exception as e:
+            print(f"Erro ao despachar {kind}: {e}", file=sys.stderr)
+        if not speed:
+            await asyncio.sleep(0)  # como o websocket: um evento por volta do loop
+    dispatched = loop.time() - started
+
+    # Espera listeners, comandos e etapas adiadas terminarem
+    deadline = loop.time() + DRAIN_TIMEOUT
+    while (timings.pending or bot.pipeline._deferred) and loop.time() < deadline:
+        await asyncio.sleep(0.01)
+    elapsed = loop.time() - started
+    total_events = sum(kinds.values())
+
+    db_ops = Counter()
+    for key, value in metrics.MONGO_OPS._values.items():
+        delta = value - db_ops_before.get(key, 0)
+        if delta:
+            db_ops[".".join(key)] += delta
+    shed = {
+        "/".join(key): value - shed_before.get(key, 0)
+        for key, value in metrics.PIPELINE_SHED._values.items() if value - shed_before.get(key, 0)
+    }
+    db_total = sum(db_ops.values())
+    rest_total = sum(fake.calls.values())
+
+    result = {
+        "speed": f"{speed:g}x" if speed else "max",
+        "backend": bot.db.backend,
+        "events": total_events,
+        "by_type": dict(kinds),
+        "guilds": len(guilds),
+        "seconds": round(elapsed, 3),
+        "dispatch_seconds": round(dispatched, 3),
+        "behind_ms": round(behind * 1000, 1),
+        "events_per_s": round(total_events / elapsed, 1) if elapsed else 0.0,
+        "messages_per_s": round(kinds["MESSAGE_CREATE"] / elapsed, 1) if elapsed else 0.0,
+        "unfinished": timings.pending,
+        "stages": timings.summary("etapa:"),
+        "listeners": timings.summary("listener:"),
+        "commands": timings.summary("comando:"),
+        "db_ops": db_total,
+        "db_ops_per_event": round(db_total / total_events, 3) if total_events else 0.0,
+        "db_ops_by_collection": dict(db_ops.most_common(15)),
+        "db_by_cog": dbprofile.PROFILER.by_cog(8) if dbprofile.PROFILER is not None else [],
+        "rest_calls": rest_total,
+        "rest_per_event": round(rest_total / total_events, 3) if total_events else 0.0,
+        "rest_by_route": dict(fake.calls.most_common(15)),
+        "loop_lag_max_ms": round(bot.loop_monitor.max_lag * 1000, 1),
+        "shed": shed,
+    }
+
+    if mongo_uri:
+        await bot.db.client.drop_database(bot.db.name)
+        await bot.db.client.drop_database(bot.cogs_db.name)
+    await bot.close()
+    shutil.rmtree(workdir, ignore_errors=True)
+    return result
+
+
+# ────────────────────────────────────────────────
+# Relatório
+# ────────────────────────────────────────────────
+
+def _print_report(results: List[dict], baseline: Optional[List[dict]] = None):
+    print()
+    print(f"{'velocidade':>10} {'eventos':>8} {'tempo(s)':>9} {'ev/s':>8} {'msg/s':>8} "
+          f"{'db/ev':>7} {'rest/ev':>8} {'lag máx':>9} {'atraso':>9}")
+    for r in results:
+        print(f"{r['speed']:>10} {r['events']:>8} {r['seconds']:>9.2f} {r['events_per_s']:>8.1f} "
+              f"{r['messages_per_s']:>8.1f} {r['db_ops_per_event']:>7.2f} {r['rest_per_event']:>8.2f} "
+              f"{r['loop_lag_max_ms']:>7.0f}ms {r['behind_ms']:>7.0f}ms")
+
+    for section, title in (("stages", "Etapas do pipeline"), ("listeners", "Listeners"), ("commands", "Comandos")):
+        names = sorted({name for r in results for name in r[section]})
+        if not names:
+            continue
+        print(f"\n{title} (p50 / p95 / p99 em ms)")
+        print(f"{'':<36}" + "".join(f"{r['speed']:>26}" for r in results))
+        for name in names:
+            cells = []
+            for r in results:
+                s = r[section].get(name)
+                cells.append(f"{s['p50_ms']:>7.2f} /{s['p95_ms']:>7.2f} /{s['p99_ms']:>7.2f}" if s else f"{'—':>24}")
+            print(f"{name[:36]:<36}" + "".join(f"{cell:>26}" for cell in cells))
+
+    for r in results:
+        extras = []
+        if r["shed"]:
+            extras.append("sobrecarga " + ", ".join(f"{k}={v:g}" for k, v in r["shed"].items()))
+        if r["unfinished"]:
+            extras.append(f"{r['unfinished']} tarefas não terminaram em {DRAIN_TIMEOUT}s")
+        if extras:
+            print(f"\n{r['speed']}: " + "; ".join(extras))
+
+    first = results[0] if results else None
+    if first:
+        print(f"\nBanco ({first['backend']}) — operações por coleção a {first['speed']}: "
+              + ", ".join(f"{k}={v:g}" for k, v in list(first["db_ops_by_collection"].items())[:8]))
+        print(f"REST a {first['speed']}: " + ", ".join(f"{k}={v}" for k, v in list(first["rest_by_route"].items())[:6]))
+
+    if baseline:
+        previous = {r["speed"]: r for r in baseline}
+        print("\nComparação com a build anterior (ev/s, p95 das etapas)")
+        for r in results:
+            old = previous.get(r["speed"])
+            if old is None:
+                continue
+            change = (r["events_per_s"] / old["events_per_s"] - 1) * 100 if old["events_per_s"] else 0.0
+            stages = ", ".join(
+                f"{name} {old['stages'][name]['p95_ms']:.2f}→{s['p95_ms']:.2f}ms"
+                for name, s in r["stages"].items() if name in old["stages"]
+            )
+            print(f"{r['speed']:>10}: {old['events_per_s']:.1f} → {r['events_per_s']:.1f} ev/s ({change:+.1f}%)  {stages}")
+
+
+def _parse_speed(value: str) -> float:
+    value = value.strip().lower()
+    if value == "max":
+        return 0.0
+    return float(value[:-1] if value.endswith("x") else value)
+
+
+def _run_speeds(args) -> List[dict]:
+    """Uma velocidade por processo: métricas e caches do bot são globais do processo."""
+    results = []
+    for speed in args.velocidades.split(","):
+        with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as handle:
+            output = handle.name
+        command = [sys.executable, os.path.abspath(__file__), "_executar", args.gravacao,
+                   "--velocidade", speed, "--latencia-ms", str(args.latencia_ms), "--saida", output]
+        if args.mongo:
+            command += ["--mongo", args.mongo]
+        if args.sem_configs:
+            command.append("--sem-configs")
+        label = speed if speed.strip().lower() == "max" else f"{speed}x"
+        print(f"Replay a {label}...", file=sys.stderr)
+        completed = subprocess.run(command)
+        try:
+            if completed.returncode != 0:
+                print(f"Replay a {label} falhou (código {completed.returncode})", file=sys.stderr)
+                continue
+            with open(output, encoding="utf-8") as handle:
+                results.append(json.load(handle))
+        finally:
+            os.unlink(output)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de replay de eventos do gateway")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    synth = sub.add_parser("sintetico", help="gera uma gravação sintética")
+    synth.add_argument("saida")
+    synth.add_argument("--servidores", type=int, default=3)
+    synth.add_argument("--membros", type=int, default=300)
+    synth.add_argument("--segundos", type=float, default=60.0)
+    synth.add_argument("--taxa", type=float, default=30.0, help="mensagens por segundo")
+    synth.add_argument("--entradas", type=float, default=6.0, help="entradas por minuto por servidor")
+    synth.add_argument("--comandos", type=float, default=30.0, help="slash commands por minuto")
+    synth.add_argument("--semente", type=int, default=1)
+
+    for name in ("replay", "_executar"):
+        run = sub.add_parser(name, help="replay da gravação" if name == "replay" else argparse.SUPPRESS)
+        run.add_argument("gravacao")
+        run.add_argument("--latencia-ms", type=float, default=0.0, help="latência simulada do REST")
+        run.add_argument("--mongo", default=None, help="URI de um Mongo local (padrão: SQLite temporário)")
+        run.add_argument("--sem-configs", action="store_true", help="não liga as configs dos cogs")
+        if name == "replay":
+            run.add_argument("--velocidades", default=SPEEDS, help="ex.: 1,10,100,max")
+            run.add_argument("--json", action="store_true", help="resultado em JSON (para comparar builds)")
+            run.add_argument("--comparar", default=None, help="JSON de uma execução anterior")
+        else:
+            run.add_argument("--velocidade", required=True)
+            run.add_argument("--saida", required=True)
+
+    args = parser.parse_args()
+
+    if args.comando == "sintetico":
+        count = synthetic_recording(args.saida, args.servidores, args.membros, args.segundos, args.taxa,
+                                    args.entradas, args.comandos, args.semente)
+        print(f"{count} eventos gravados em {args.saida}")
+    elif args.comando == "_executar":
+        result = asyncio.run(replay(args.gravacao, _parse_speed(args.velocidade), args.latencia_ms / 1000,
+                                    args.mongo, not args.sem_configs))
+        with open(args.saida, "w", encoding="utf-8") as handle:
+            json.dump(result, handle)
+    else:
+        results = _run_speeds(args)
+        if args.json:
+            print(json.dumps(results, indent=2, ensure_ascii=False))
+        else:
+            baseline = None
+            if args.comparar:
+                with open(args.comparar, encoding="utf-8") as handle:
+                    baseline = json.load(handle)
+            _print_report(results, baseline)
+        if not results:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
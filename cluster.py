@@ -0,0 +1,306 @@
+# cluster.py
+"""
+Launcher multi-processo: roda N processos (clusters), cada um com um
+intervalo de shards do AutoShardedBot, para usar todos os núcleos da máquina.
+
+    python cluster.py            # em vez de `python main.py`
+
+Variáveis (.env):
+    CLUSTER_COUNT  → número de processos (padrão: núcleos da CPU, limitado ao nº de shards)
+    SHARD_COUNT    → total de shards (padrão: o recomendado pelo Discord em /gateway/bot)
+
+O processo principal só supervisiona: reinicia clusters que caírem ou
+pararem de mandar status (com backoff) e expõe a saúde combinada de todos
+eles no `/health` do FastAPI. Só o supervisor importa fastapi/uvicorn:
+os workers sobem com spawn e reimportam este módulo, que precisa continuar leve.
+"""
+import os
+import time
+import signal
+import logging
+import asyncio
+import threading
+import multiprocessing as mp
+from queue import Empty
+from typing import Dict, List
+
+import aiohttp
+from dotenv import load_dotenv
+
+from core.logging_setup import setup_logging
+
+load_dotenv()
+
+setup_logging()
+logger = logging.getLogger("cluster")
+
+TOKEN = os.getenv('DISCORD_TOKEN')
+PORT = int(os.getenv('PORT', 10000))
+
+STATUS_INTERVAL = 15       # segundos entre status enviados por cada cluster
+HEARTBEAT_TIMEOUT = 120    # sem status por esse tempo (depois de pronto) → cluster travado
+STABLE_AFTER = 300         # rodando esse tempo sem cair → zera o backoff
+MAX_BACKOFF = 300
+
+
+# ────────────────────────────────────────────────
+# Lado do worker (roda dentro de cada processo filho)
+# ────────────────────────────────────────────────
+
+async def _report_status(bot, cluster_id: int, queue):
+    from core.health import latency_ms
+
+    while True:
+        try:
+            queue.put_nowait({
+                "cluster": cluster_id,
+                "pid": os.getpid(),
+                "ready": bot.is_ready(),
+                "guilds": len(bot.guilds),
+                "shards": {
+                    shard_id: {"latency_ms": latency_ms(shard.latency), "closed": shard.is_closed()}
+                    for shard_id, shard in bot.shards.items()
+                },
+                "ts": time.time(),
+            })
+        except Exception as e:
+            logger.warning(f"[cluster {cluster_id}] Falha ao enviar status: {e}")
+        await asyncio.sleep(STATUS_INTERVAL)
+
+
+async def _run_worker(cluster_id: int, queue):
+    # Importado só aqui: o main.py lê SHARD_COUNT/SHARD_IDS do ambiente ao ser importado
+    import main
+
+    reporter = asyncio.create_task(_report_status(main.bot, cluster_id, queue))
+    # supervisor.stop() manda SIGTERM: drena comandos e salva a agenda antes de sair
+    loop = asyncio.get_running_loop()
+    loop.add_signal_handler(signal.SIGTERM, lambda: asyncio.ensure_future(main.bot.shutdown.shutdown()))
+    try:
+        await main.start_bot()
+    finally:
+        reporter.cancel()
+        if not main.bot.is_closed():
+            await main.bot.close()
+
+
+def run_cluster(cluster_id: int, shard_ids: List[int], shard_count: int, queue):
+    os.environ["CLUSTER_ID"] = str(cluster_id)
+    os.environ["SHARD_COUNT"] = str(shard_count)
+    os.environ["SHARD_IDS"] = ",".join(map(str, shard_ids))
+    asyncio.run(_run_worker(cluster_id, queue))
+    # start_bot só retorna se o bot parou → código != 0 para o supervisor reiniciar
+    raise SystemExit(1)
+
+
+# ────────────────────────────────────────────────
+# Lado do supervisor
+# ────────────────────────────────────────────────
+
+async def fetch_gateway_info(token: str) -> dict:
+    """Número de shards recomendado e max_concurrency do IDENTIFY."""
+    async with aiohttp.ClientSession() as session:
+        async with session.get(
+            "https://discord.com/api/v10/gateway/bot",
+            headers={"Authorization": f"Bot {token}"}
+        ) as resp:
+            resp.raise_for_status()
+            return await resp.json()
+
+
+def split_shards(shard_count: int, cluster_count: int) -> List[List[int]]:
+    """Divide os shards em intervalos contíguos, o mais equilibrado possível."""
+    base, extra = divmod(shard_count, cluster_count)
+    ranges, start = [], 0
+    for i in range(cluster_count):
+        size = base + (1 if i < extra else 0)
+        ranges.append(list(range(start, start + size)))
+        start += size
+    return ranges
+
+
+class Cluster:
+    def __init__(self, cluster_id: int, shard_ids: List[int]):
+        self.id = cluster_id
+        self.shard_ids = shard_ids
+        self.process = None
+        self.started_at = 0.0
+        self.restarts = 0
+        self.backoff = 1
+        self.next_start = 0.0
+        self.status: dict = {}
+
+
+class ClusterSupervisor:
+    def __init__(self, shard_count: int, cluster_count: int, max_concurrency: int = 1):
+        self.ctx = mp.get_context("spawn")
+        self.queue = self.ctx.Queue()
+        self.shard_count = shard_count
+        self.clusters = [Cluster(i, ids) for i, ids in enumerate(split_shards(shard_count, cluster_count)) if ids]
+        # O Discord aceita `max_concurrency` IDENTIFYs a cada 5s → escalona o início dos clusters
+        self.identify_interval = 5 / max(1, max_concurrency)
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self):
+        delay = 0.0
+        now = time.monotonic()
+        for cluster in self.clusters:
+            cluster.next_start = now + delay
+            delay += len(cluster.shard_ids) * self.identify_interval
+        threading.Thread(target=self._collect_status, daemon=True, name="cluster-status").start()
+        threading.Thread(target=self._supervise, daemon=True, name="cluster-supervisor").start()
+
+    def _spawn(self, cluster: Cluster):
+        cluster.process = self.ctx.Process(
+            target=run_cluster,
+            args=(cluster.id, cluster.shard_ids, self.shard_count, self.queue),
+            name=f"cluster-{cluster.id}",
+            daemon=False,
+        )
+        cluster.process.start()
+        cluster.started_at = time.monotonic()
+        cluster.status = {}
+        logger.info(f"Cluster {cluster.id} iniciado (pid {cluster.process.pid}, shards {cluster.shard_ids[0]}-{cluster.shard_ids[-1]})")
+
+    def _collect_status(self):
+        while not self._stopping.is_set():
+            try:
+                status = self.queue.get(timeout=1)
+            except Empty:
+                continue
+            except (EOFError, OSError):
+                return
+            with self._lock:
+                cluster = self.clusters[status["cluster"]]
+                if cluster.process is not None and status["pid"] == cluster.process.pid:
+                    cluster.status = status
+
+    def _supervise(self):
+        while not self._stopping.is_set():
+            now = time.monotonic()
+            for cluster in self.clusters:
+                proc = cluster.process
+                if proc is None:
+                    if now >= cluster.next_start:
+                        self._spawn(cluster)
+                    continue
+
+                if proc.is_alive():
+                    # Processo vivo mas sem mandar status → loop travado
+                    last = cluster.status.get("ts")
+                    if last and time.time() - last > HEARTBEAT_TIMEOUT:
+                        logger.error(f"Cluster {cluster.id} sem status há {HEARTBEAT_TIMEOUT}s — reiniciando")
+                        proc.terminate()
+                        proc.join(10)
+                    elif now - cluster.started_at > STABLE_AFTER:
+                        cluster.backoff = 1
+                    continue
+
+                if self._stopping.is_set():
+                    return
+                cluster.restarts += 1
+                logger.warning(
+                    f"Cluster {cluster.id} parou (código {proc.exitcode}). "
+                    f"Reiniciando em {cluster.backoff}s (reinício #{cluster.restarts})"
+                )
+                cluster.process = None
+                cluster.next_start = now + cluster.backoff
+                cluster.backoff = min(cluster.backoff * 2, MAX_BACKOFF)
+            time.sleep(1)
+
+    def stop(self, timeout: float = 20):
+        self._stopping.set()
+        for cluster in self.clusters:
+            if cluster.process is not None and cluster.process.is_alive():
+                cluster.process.terminate()
+        for cluster in self.clusters:
+            if cluster.process is not None:
+                cluster.process.join(timeout)
+                if cluster.process.is_alive():
+                    cluster.process.kill()
+
+    def health(self) -> Dict:
+        clusters = []
+        with self._lock:
+            for cluster in self.clusters:
+                status = cluster.status
+                alive = cluster.process is not None and cluster.process.is_alive()
+                clusters.append({
+                    "id": cluster.id,
+                    "pid": cluster.process.pid if alive else None,
+                    "alive": alive,
+                    "ready": alive and status.get("ready", False),
+                    "guilds": status.get("guilds", 0),
+                    "shards": status.get("shards", {}),
+                    "restarts": cluster.restarts,
+                    "last_status_age": round(time.time() - status["ts"], 1) if status.get("ts") else None,
+                })
+
+        ready = sum(1 for c in clusters if c["ready"])
+        if ready == len(clusters):
+            state = "healthy"
+        elif ready == 0 and not any(c["restarts"] for c in clusters):
+            state = "starting"
+        else:
+            state = "degraded"
+        return {
+            "status": state,
+            "clusters_ready": f"{ready}/{len(clusters)}",
+            "shard_count": self.shard_count,
+            "guilds": sum(c["guilds"] for c in clusters),
+            "clusters": clusters,
+        }
+
+
+# ────────────────────────────────────────────────
+# Webserver (processo principal)
+# fastapi/uvicorn só são importados aqui: os workers (spawn) reimportam este
+# módulo para achar o run_cluster e não devem pagar o import do webserver.
+def create_app(supervisor: ClusterSupervisor):
+    from fastapi import FastAPI
+    from core.web import CodecJSONResponse
+
+    app = FastAPI(title="Bot Cluster", description="Supervisor dos clusters do bot", default_response_class=CodecJSONResponse)
+
+    @app.api_route("/", methods=["GET", "HEAD"])
+    async def root():
+        return {"status": "okay", "message": "Cluster supervisor is running"}
+
+    @app.get("/health")
+    async def health():
+        return supervisor.health()
+
+    return app
+
+
+def main():
+    if not TOKEN:
+        logger.critical("DISCORD_TOKEN não encontrado no .env")
+        raise SystemExit(1)
+
+    max_concurrency = 1
+    if os.getenv("SHARD_COUNT"):
+        shard_count = int(os.getenv("SHARD_COUNT"))
+    else:
+        info = asyncio.run(fetch_gateway_info(TOKEN))
+        shard_count = info["shards"]
+        max_concurrency = info.get("session_start_limit", {}).get("max_concurrency", 1)
+        logger.info(f"Discord recomenda {shard_count} shard(s) (max_concurrency={max_concurrency})")
+
+    cluster_count = int(os.getenv("CLUSTER_COUNT", os.cpu_count() or 1))
+    cluster_count = max(1, min(cluster_count, shard_count))
+
+    supervisor = ClusterSupervisor(shard_count, cluster_count, max_concurrency)
+    logger.info(f"Iniciando {cluster_count} cluster(s) para {shard_count} shard(s)")
+    supervisor.start()
+    try:
+        import uvicorn
+        uvicorn.run(create_app(supervisor), host="0.0.0.0", port=PORT, log_level="info", log_config=None)
+    finally:
+        logger.info("Encerrando clusters...")
+        supervisor.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -13,7 +13,7 @@ class BalanceCog(commands.Cog):
         guild_id = interaction.guild_id
         user_id = target.id
 
-        user_data = self.bot.db.economy.find_one({"guild_id": guild_id, "user_id": user_id}) or {"coins": 0}
+        user_data = await self.bot.db.economy.find_one({"guild_id": guild_id, "user_id": user_id}) or {"coins": 0}
         coins = user_data["coins"]
 
         embed = discord.Embed(title="Saldo", color=discord.Color.gold())
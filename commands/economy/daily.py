@@ -3,17 +3,26 @@ from discord import app_commands
 from discord.ext import commands
 import datetime
 
+from core.keyed import KeyedQueueFull
+
 class DailyCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
     @app_commands.command(name="daily", description="Coletar sua recompensa diária")
     async def daily(self, interaction: discord.Interaction):
+        # Em fila por (servidor, usuário): dois /daily simultâneos não pagam duas vezes
+        try:
+            await self.bot.keyed.run((interaction.guild_id, interaction.user.id), lambda: self._collect_daily(interaction))
+        except KeyedQueueFull:
+            await interaction.response.send_message("⏳ Aguarde o comando anterior terminar.", ephemeral=True)
+
+    async def _collect_daily(self, interaction: discord.Interaction):
         guild_id = interaction.guild_id
         user_id = interaction.user.id
         now = datetime.datetime.utcnow()
 
-        user_data = self.bot.db.economy.find_one({"guild_id": guild_id, "user_id": user_id}) or {"coins": 0, "last_daily": None}
+        user_data = await self.bot.db.economy.find_one({"guild_id": guild_id, "user_id": user_id}) or {"guild_id": guild_id, "user_id": user_id, "coins": 0, "last_daily": None}
         
         if user_data.get("last_daily"):
             last = datetime.datetime.fromisoformat(user_data["last_daily"])
@@ -28,7 +37,7 @@ class DailyCog(commands.Cog):
         user_data["coins"] = user_data.get("coins", 0) + reward
         user_data["last_daily"] = now.isoformat()
 
-        self.bot.db.economy.replace_one(
+        await self.bot.db.economy.replace_one(
             {"guild_id": guild_id, "user_id": user_id},
             user_data,
             upsert=True
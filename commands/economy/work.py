@@ -4,17 +4,26 @@ from discord.ext import commands
 import random
 import datetime
 
+from core.keyed import KeyedQueueFull
+
 class WorkCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
     @app_commands.command(name="work", description="Trabalhe e ganhe moedas")
     async def work(self, interaction: discord.Interaction):
+        # Em fila por (servidor, usuário): dois /work simultâneos não pagam duas vezes
+        try:
+            await self.bot.keyed.run((interaction.guild_id, interaction.user.id), lambda: self._do_work(interaction))
+        except KeyedQueueFull:
+            await interaction.response.send_message("⏳ Aguarde o comando anterior terminar.", ephemeral=True)
+
+    async def _do_work(self, interaction: discord.Interaction):
         guild_id = interaction.guild_id
         user_id = interaction.user.id
         now = datetime.datetime.utcnow()
 
-        data = self.bot.db.economy.find_one({"guild_id": guild_id, "user_id": user_id}) or {"coins": 0, "last_work": None}
+        data = await self.bot.db.economy.find_one({"guild_id": guild_id, "user_id": user_id}) or {"guild_id": guild_id, "user_id": user_id, "coins": 0, "last_work": None}
 
         if data.get("last_work"):
             last = datetime.datetime.fromisoformat(data["last_work"])
@@ -27,7 +36,7 @@ class WorkCog(commands.Cog):
         data["coins"] = data.get("coins", 0) + reward
         data["last_work"] = now.isoformat()
 
-        self.bot.db.economy.replace_one(
+        await self.bot.db.economy.replace_one(
             {"guild_id": guild_id, "user_id": user_id},
             data,
             upsert=True
@@ -2,12 +2,19 @@ import discord
 from discord import app_commands
 from discord.ext import commands, tasks
 import random
-import asyncio
+import datetime
 
 class SorteioCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
+    async def cog_load(self):
+        # O fim do sorteio fica na agenda persistente (core/jobs.py): sobrevive a restarts
+        self.bot.jobs.register("sorteio_fim", self.finish_sorteio)
+
+    async def cog_unload(self):
+        self.bot.jobs.unregister("sorteio_fim")
+
     @app_commands.command(name="sorteio", description="Criar um sorteio simples")
     @app_commands.describe(premio="O prêmio", duracao_min="Duração em minutos")
     async def sorteio(self, interaction: discord.Interaction, premio: str, duracao_min: int):
@@ -18,20 +25,35 @@ class SorteioCog(commands.Cog):
 
         await interaction.response.send_message("Sorteio criado! Boa sorte a todos.", ephemeral=True)
 
-        await asyncio.sleep(duracao_min * 60)
-
-        msg = await interaction.channel.fetch_message(msg.id)
+        await self.bot.jobs.schedule(
+            "sorteio_fim",
+            datetime.datetime.utcnow() + datetime.timedelta(minutes=duracao_min),
+            {"channel_id": interaction.channel_id, "message_id": msg.id, "premio": premio},
+            guild_id=interaction.guild_id,
+            job_id=f"sorteio:{msg.id}",
+        )
+
+    async def finish_sorteio(self, payload: dict):
+        channel = self.bot.get_channel(payload["channel_id"])
+        if channel is None:
+            return  # canal apagado
+
+        try:
+            msg = await channel.fetch_message(payload["message_id"])
+        except discord.NotFound:
+            return  # mensagem do sorteio apagada
         users = []
-        async for user in msg.reactions[0].users():
-            if not user.bot:
-                users.append(user)
+        if msg.reactions:
+            async for user in msg.reactions[0].users():
+                if not user.bot:
+                    users.append(user)
 
         if len(users) == 0:
-            await interaction.channel.send("Ninguém participou do sorteio... 😢")
+            await channel.send("Ninguém participou do sorteio... 😢")
             return
 
         winner = random.choice(users)
-        await interaction.channel.send(f"Parabéns {winner.mention}! Você ganhou: **{premio}**! 🎉")
+        await channel.send(f"Parabéns {winner.mention}! Você ganhou: **{payload['premio']}**! 🎉")
 
 async def setup(bot):
-    await bot.add_cog(SorteioCog(bot))
\ No newline at end of file
+    await bot.add_cog(SorteioCog(bot))
@@ -3,6 +3,12 @@ from discord import app_commands, Interaction, Embed, Colour, SelectOption
 from discord.ext import commands
 from discord.ui import Select, View, Modal, TextInput
 import datetime
+import logging
+
+from core.pipeline import MessageContext
+from core.keyed import KeyedQueueFull
+
+logger = logging.getLogger(__name__)
 
 class LevelRewardModal(Modal, title="Adicionar Recompensa por Nível"):
     def __init__(self, view: 'RewardView'):
@@ -58,10 +64,10 @@ class RewardView(View):
         return interaction.user.id == self.original_interaction.user.id
 
     async def get_config(self):
-        return self.bot.db.guild_configs.find_one({"guild_id": self.guild_id}) or {}
+        return await self.bot.configs.get(self.bot.db.guild_configs, self.guild_id) or {}
 
     async def save_config(self, config):
-        self.bot.db.guild_configs.replace_one({"guild_id": self.guild_id}, config, upsert=True)
+        await self.bot.configs.replace(self.bot.db.guild_configs, self.guild_id, config)
 
     async def update_message(self):
         config = await self.get_config()
@@ -163,16 +169,27 @@ class Levels(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message):
-        if message.author.bot or not message.guild:
-            return
+    async def cog_load(self):
+        self.bot.pipeline.register("xp", self.process_message)
+
+    async def cog_unload(self):
+        self.bot.pipeline.unregister("xp")
+
+    # Etapa "xp" do pipeline de mensagens (core/pipeline.py) — roda por último
+    async def process_message(self, ctx: MessageContext):
+        # Em fila por (servidor, usuário): duas mensagens seguidas não sobrescrevem o XP uma da outra
+        try:
+            await self.bot.keyed.run((ctx.guild_id, ctx.message.author.id), lambda: self.award_xp(ctx))
+        except KeyedQueueFull:
+            logger.debug("XP ignorado: fila cheia para %s na guild %s", ctx.message.author.id, ctx.guild_id)
 
-        guild_id = message.guild.id
+    async def award_xp(self, ctx: MessageContext):
+        message = ctx.message
+        guild_id = ctx.guild_id
         user_id = message.author.id
         now = datetime.datetime.utcnow()
 
-        config = self.bot.db.guild_configs.find_one({"guild_id": guild_id}) or {
+        config = await ctx.guild_config() or {
             "xp_per_msg": 10,
             "xp_cooldown": 45,
             "xp_multiplier": 1.0,
@@ -181,7 +198,7 @@ class Levels(commands.Cog):
         }
 
         user_filter = {"guild_id": guild_id, "user_id": user_id}
-        user_data = self.bot.db.levels.find_one(user_filter)
+        user_data = await self.bot.db.levels.find_one(user_filter)
 
         if user_data is None:
             user_data = {
@@ -192,11 +209,11 @@ class Levels(commands.Cog):
                 "last_xp": now - datetime.timedelta(seconds=config["xp_cooldown"] + 1),
                 "messages": 0
             }
-            self.bot.db.levels.insert_one(user_data)
+            await self.bot.db.levels.insert_one(user_data)
         else:
             if "last_xp" not in user_data:
                 user_data["last_xp"] = now - datetime.timedelta(seconds=config["xp_cooldown"] + 1)
-                self.bot.db.levels.replace_one(user_filter, user_data, upsert=True)
+                await self.bot.db.levels.replace_one(user_filter, user_data, upsert=True)
 
         time_since_last = (now - user_data["last_xp"]).total_seconds()
         if time_since_last < config["xp_cooldown"]:
@@ -240,9 +257,9 @@ class Levels(commands.Cog):
                             )
                             await message.channel.send(embed=reward_embed)
                     except Exception as e:
-                        print(f"Erro ao dar recompensa: {e}")
+                        logger.warning("Erro ao dar recompensa: %s", e)
 
-        self.bot.db.levels.replace_one(user_filter, user_data, upsert=True)
+        await self.bot.db.levels.replace_one(user_filter, user_data, upsert=True)
 
     # Comando principal renomeado para /reward
     @app_commands.command(name="reward", description="Gerenciar recompensas por nível (Admin)")
@@ -266,8 +283,8 @@ class Levels(commands.Cog):
         guild_id = interaction.guild_id
         user_id = target.id
 
-        data = self.bot.db.levels.find_one({"guild_id": guild_id, "user_id": user_id}) or {"xp": 0, "level": 0}
-        config = self.bot.db.guild_configs.find_one({"guild_id": guild_id}) or {"xp_curve": 1.5}
+        data = await self.bot.db.levels.find_one({"guild_id": guild_id, "user_id": user_id}) or {"xp": 0, "level": 0}
+        config = await self.bot.configs.get(self.bot.db.guild_configs, guild_id, copy_doc=False) or {"xp_curve": 1.5}
 
         xp = data["xp"]
         curve = config["xp_curve"]
@@ -21,9 +21,9 @@ class RankView(ui.View):
                 {"$sort": {"total_xp": -1}},
                 {"$limit": 100}
             ]
-            return list(self.bot.db.levels.aggregate(pipeline))
+            return await self.bot.db.levels.aggregate(pipeline).to_list(length=100)
         else:
-            return list(self.bot.db.levels.find({"guild_id": self.guild_id}).sort("xp", -1).limit(100))
+            return await self.bot.db.levels.find({"guild_id": self.guild_id}).sort("xp", -1).limit(100).to_list(length=100)
 
     async def generate_embed(self):
         data = await self.get_data()
@@ -2,50 +2,37 @@ import discord
 from discord import app_commands, Interaction, Embed, Colour, SelectOption, Message
 from discord.ext import commands, tasks
 from discord.ui import Select, View, Modal, TextInput
-import os
-from pymongo import MongoClient
-from pymongo.errors import ConnectionFailure
 from collections import defaultdict, deque
 import datetime
 import re
 import logging
 
+from core.pipeline import MessageContext
+
 logger = logging.getLogger(__name__)
 
 class AutoModConfig:
-    def __init__(self):
-        self.mongo_uri = os.environ.get("MONGO_URI", "mongodb://localhost:27017/")
-        self.db_name = "discord_bot"
-        self.collection_name = "automod_configs"
-        self.client = None
-        self.collection = None
-        self.connect_mongo()
-
-    def connect_mongo(self):
-        try:
-            self.client = MongoClient(self.mongo_uri)
-            self.collection = self.client[self.db_name][self.collection_name]
-            self.client.admin.command('ping')
-            print("Conectado ao MongoDB para Auto-Mod.")
-        except ConnectionFailure:
-            print("Erro ao conectar ao MongoDB para Auto-Mod. Usando valores padrão.")
-            self.client = None
-            self.collection = None
-
-    def get_guild_config(self, guild_id: int) -> dict:
+    def __init__(self, db, cache):
+        # Coleção do client compartilhado do bot (None = sem banco, usa valores padrão)
+        self.collection = db.automod_configs if db is not None else None
+        # Leituras passam pelo cache de configs do bot (write-through)
+        self.cache = cache
+
+    async def get_guild_config(self, guild_id: int) -> dict:
         str_id = str(guild_id)
         if self.collection is not None:
-            doc = self.collection.find_one({"_id": str_id})
+            doc = await self.cache.get(self.collection, str_id, field="_id")
             if not doc:
-                doc = {
-                    "_id": str_id,
+                # Upsert: duas mensagens de um servidor novo ao mesmo tempo não podem
+                # inserir o mesmo _id duas vezes (DuplicateKeyError)
+                defaults = {
                     'enabled': False,
                     'banned_words': [],
                     'caps_threshold': 70,
                     'repeat_threshold': 3,
                     'action': 'delete'
                 }
-                self.collection.insert_one(doc)
+                doc = await self.cache.update(self.collection, str_id, {"$setOnInsert": defaults}, field="_id")
             return doc
         else:
             return {
@@ -56,9 +43,9 @@ class AutoModConfig:
                 'action': 'delete'
             }
 
-    def save_guild_config(self, guild_id: int, config: dict):
+    async def save_guild_config(self, guild_id: int, config: dict):
         if self.collection is not None:
-            self.collection.replace_one({"_id": str(guild_id)}, {"_id": str(guild_id), **config}, upsert=True)
+            await self.cache.replace(self.collection, str(guild_id), {"_id": str(guild_id), **config}, field="_id")
 
 class AutoModModal(Modal):
     def __init__(self, view: 'AutoModView', config: dict):
@@ -83,7 +70,7 @@ class AutoModModal(Modal):
                 raise ValueError("Ação inválida")
             self.config['action'] = action
 
-            self.view.automod_config.save_guild_config(self.view.original_interaction.guild_id, self.view.guild_config)
+            await self.view.automod_config.save_guild_config(self.view.original_interaction.guild_id, self.view.guild_config)
             await interaction.response.defer()
             await self.view.update_preview()
         except ValueError as e:
@@ -95,7 +82,10 @@ class AutoModView(View):
         self.original_interaction = interaction
         self.preview_message = None
         self.automod_config = automod_config
-        self.guild_config = automod_config.get_guild_config(interaction.guild_id)
+        self.guild_config = None
+
+    async def load_config(self):
+        self.guild_config = await self.automod_config.get_guild_config(self.original_interaction.guild_id)
 
     async def interaction_check(self, interaction: Interaction) -> bool:
         return interaction.user.id == self.original_interaction.user.id
@@ -131,13 +121,13 @@ class AutoModView(View):
             await interaction.response.send_modal(modal)
         elif choice == "toggle":
             self.guild_config['enabled'] = not self.guild_config['enabled']
-            self.automod_config.save_guild_config(self.original_interaction.guild_id, self.guild_config)
+            await self.automod_config.save_guild_config(self.original_interaction.guild_id, self.guild_config)
             await interaction.response.defer()
             await self.update_preview()
 
     @discord.ui.button(label="Salvar e Sair", style=discord.ButtonStyle.green, row=1)
     async def save_exit(self, interaction: Interaction, button):
-        self.automod_config.save_guild_config(self.original_interaction.guild_id, self.guild_config)
+        await self.automod_config.save_guild_config(self.original_interaction.guild_id, self.guild_config)
         await interaction.response.send_message("Configurações salvas!", ephemeral=True)
         self.stop()
 
@@ -149,39 +139,45 @@ class AutoModView(View):
 class AutoModCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.automod_config = AutoModConfig()
+        self.automod_config = AutoModConfig(bot.cogs_db, bot.configs)
         self.repeat_tracker = defaultdict(lambda: defaultdict(deque))  # guild -> user -> deque de (timestamp, message)
         self.warn_tracker = defaultdict(lambda: defaultdict(int))  # guild -> user -> count de warns
 
     @tasks.loop(hours=24)  # Resetar warns a cada 24h
     async def reset_warns(self):
         self.warn_tracker.clear()
-        logger.info("[DEBUG] Warns resetados globalmente.")
+        logger.debug("Warns resetados globalmente.")
 
     @app_commands.command(name="automod", description="Configura o sistema de auto-moderação do servidor")
     @app_commands.checks.has_permissions(administrator=True)
     async def automod(self, interaction: Interaction):
         view = AutoModView(interaction, self.automod_config)
+        await view.load_config()
         await interaction.response.send_message("Iniciando configuração de auto-mod...", ephemeral=True)
         await view.update_preview()
 
-    @commands.Cog.listener()
-    async def on_message(self, message: Message):
-        if message.author.bot or not message.guild:
-            return
-        guild_id = message.guild.id
-        config = self.automod_config.get_guild_config(guild_id)
+    async def cog_load(self):
+        self.bot.pipeline.register("automod", self.process_message)
+
+    async def cog_unload(self):
+        self.bot.pipeline.unregister("automod")
+
+    # Etapa "automod" do pipeline de mensagens (core/pipeline.py)
+    async def process_message(self, ctx: MessageContext):
+        message = ctx.message
+        guild_id = ctx.guild_id
+        config = await ctx.config("automod", self.automod_config.get_guild_config)
         if not config['enabled']:
             return
 
-        content = message.content.lower()
+        content = ctx.content_lower
         user_id = message.author.id
         now = datetime.datetime.utcnow()
 
         # Filtro de Palavras Proibidas
         if config['banned_words']:
             if any(word in content for word in config['banned_words']):
-                await self.apply_action(message, config['action'], "Palavra proibida detectada")
+                await self.apply_action(ctx, config['action'], "Palavra proibida detectada")
                 return
 
         # Filtro de Caps
@@ -189,7 +185,7 @@ class AutoModCog(commands.Cog):
         if letters:
             caps_ratio = sum(1 for c in letters if c.isupper()) / len(letters) * 100
             if caps_ratio > config['caps_threshold']:
-                await self.apply_action(message, config['action'], "Caps excessivo detectado")
+                await self.apply_action(ctx, config['action'], "Caps excessivo detectado")
                 return
 
         # Filtro de Repetição
@@ -201,16 +197,17 @@ class AutoModCog(commands.Cog):
         if len(self.repeat_tracker[guild_id][user_id]) >= config['repeat_threshold']:
             recent_messages = [msg for _, msg in self.repeat_tracker[guild_id][user_id]]
             if all(msg == recent_messages[0] for msg in recent_messages):
-                await self.apply_action(message, config['action'], "Repetição detectada")
+                await self.apply_action(ctx, config['action'], "Repetição detectada")
                 return
 
-    async def apply_action(self, message: Message, action: str, reason: str):
+    async def apply_action(self, ctx: MessageContext, action: str, reason: str):
+        message = ctx.message
         user = message.author
         guild = message.guild
         try:
             if action == 'delete':
-                await message.delete()
-                logger.info(f"[DEBUG] Mensagem deletada por {reason} em {guild.name}.")
+                await ctx.delete()
+                logger.debug("Mensagem deletada por %s em %s.", reason, guild.name)
             elif action == 'warn':
                 warn_count = self.warn_tracker[guild.id][user.id]
                 if warn_count >= 2:
@@ -219,33 +216,33 @@ class AutoModCog(commands.Cog):
                         await user.timeout(datetime.timedelta(hours=1), reason=f"Auto-Mod: {reason} - Warns excedidos")
                         await message.channel.send(f"{user.mention}, você foi mutado por 1 hora devido a warns excedidos!", delete_after=10)
                         self.warn_tracker[guild.id][user.id] = 0  # Resetar warns após mute
-                        logger.info(f"[DEBUG] Usuário {user} mutado por 1h (warns excedidos) em {guild.name}.")
+                        logger.info("Usuário %s mutado por 1h (warns excedidos) em %s.", user, guild.name)
                     except discord.Forbidden:
                         mute_role = discord.utils.get(guild.roles, name="Muted")
                         if mute_role:
                             await user.add_roles(mute_role, reason=f"Auto-Mod: {reason} - Warns excedidos")
                             await message.channel.send(f"{user.mention}, você foi mutado devido a warns excedidos!", delete_after=10)
                             self.warn_tracker[guild.id][user.id] = 0
-                            logger.info(f"[DEBUG] Usuário {user} mutado via role (warns excedidos) em {guild.name}.")
+                            logger.info("Usuário %s mutado via role (warns excedidos) em %s.", user, guild.name)
                         else:
                             await message.channel.send(f"{user.mention}, erro: não foi possível mutar!", delete_after=5)
                 else:
                     self.warn_tracker[guild.id][user.id] += 1
                     await message.channel.send(f"{user.mention}, aviso ({self.warn_tracker[guild.id][user.id]}/2): {reason}!", delete_after=10)
-                    logger.info(f"[DEBUG] Warn {self.warn_tracker[guild.id][user.id]}/2 enviado para {user} em {guild.name}.")
+                    logger.debug("Warn %s/2 enviado para %s em %s.", self.warn_tracker[guild.id][user.id], user, guild.name)
             elif action == 'mute':
                 try:
                     await user.timeout(datetime.timedelta(hours=1), reason=f"Auto-Mod: {reason}")
-                    logger.info(f"[DEBUG] Usuário {user} mutado por 1h em {guild.name}.")
+                    logger.info("Usuário %s mutado por 1h em %s.", user, guild.name)
                 except discord.Forbidden:
                     mute_role = discord.utils.get(guild.roles, name="Muted")
                     if mute_role:
                         await user.add_roles(mute_role, reason=f"Auto-Mod: {reason}")
-                        logger.info(f"[DEBUG] Usuário {user} mutado via role em {guild.name}.")
+                        logger.info("Usuário %s mutado via role em %s.", user, guild.name)
                     else:
                         await message.channel.send(f"{user.mention}, erro: não foi possível mutar!", delete_after=5)
         except discord.Forbidden:
-            logger.warning(f"[DEBUG] Sem permissão para aplicar ação em {guild.name}.")
+            logger.warning("Sem permissão para aplicar ação em %s.", guild.name)
 
 async def setup(bot: commands.Bot):
     await bot.add_cog(AutoModCog(bot))
\ No newline at end of file
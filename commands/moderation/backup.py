@@ -1,10 +1,11 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
-import json
 import datetime
 from io import BytesIO
 
+from core.offload import PayloadTooLarge
+
 class BackupCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
@@ -130,10 +131,16 @@ class ConfirmationView(discord.ui.View):
             ],
         }
 
-        backup_json = json.dumps(backup_data, indent=4, ensure_ascii=False)
+        # Serialização (orjson, core/jsoncodec.py) num processo à parte: não segura o loop (core/offload.py)
+        try:
+            backup_json = await self.bot.offload.json_dumps(backup_data, pretty=True, task="backup")
+        except PayloadTooLarge as e:
+            await interaction.followup.send(f"Backup grande demais para enviar: {e}", ephemeral=True)
+            self.stop()
+            return
 
         file = discord.File(
-            BytesIO(backup_json.encode('utf-8')),
+            BytesIO(backup_json),
             filename=f"backup_{guild.id}_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
         )
 
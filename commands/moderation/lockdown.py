@@ -3,38 +3,53 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 import datetime
+import asyncio
+import functools
+
+from core.rest import Priority, routes
 
 class Lockdown(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
-    def get_config(self, guild_id: int):
-        return self.bot.db.lockdown_configs.find_one({"guild_id": guild_id}) or {
+    async def get_config(self, guild_id: int):
+        return await self.bot.configs.get(self.bot.db.lockdown_configs, guild_id) or {
             "guild_id": guild_id,
             "whitelist_channels": [],
             "allowed_roles": [],
             "lockdown_active": False  # Novo: status do lockdown
         }
 
-    def save_config(self, config):
-        self.bot.db.lockdown_configs.replace_one(
-            {"guild_id": config["guild_id"]},
-            config,
-            upsert=True
-        )
+    async def save_config(self, config):
+        await self.bot.configs.replace(self.bot.db.lockdown_configs, config["guild_id"], config)
+
+    async def apply_overwrites(self, guild: discord.Guild, changes, priority: Priority):
+        """
+        Aplica (canal, alvo, overwrite) em paralelo pelo agendador REST (core/rest.py),
+        respeitando o bucket de cada canal. Retorna os resultados na mesma ordem
+        (exceções no lugar das chamadas que falharam).
+        """
+        return await asyncio.gather(*(
+            self.bot.rest.run(
+                functools.partial(channel.set_permissions, target, overwrite=overwrite),
+                guild_id=guild.id, route=routes.EDIT_CHANNEL_PERMISSIONS,
+                major_id=channel.id, priority=priority,
+            )
+            for channel, target, overwrite in changes
+        ), return_exceptions=True)
 
     @app_commands.command(name="lockdown", description="Ativa o lockdown no servidor (bloqueia mensagens em canais públicos)")
     @app_commands.default_permissions(manage_guild=True)
     async def lockdown(self, interaction: discord.Interaction):
         guild = interaction.guild
-        config = self.get_config(guild.id)
+        config = await self.get_config(guild.id)
 
         if config["lockdown_active"]:
             await interaction.response.send_message("Lockdown já está ativo.", ephemeral=True)
             return
 
         config["lockdown_active"] = True
-        self.save_config(config)
+        await self.save_config(config)
 
         embed = discord.Embed(
             title="🔒 Lockdown Ativado",
@@ -51,7 +66,7 @@ class Lockdown(commands.Cog):
 
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
-        changed_channels = 0
+        changes = []
         for channel in guild.text_channels:
             if channel.id in config["whitelist_channels"]:
                 continue
@@ -59,19 +74,27 @@ class Lockdown(commands.Cog):
             overwrite = channel.overwrites_for(guild.default_role)
             if overwrite.send_messages is not False:
                 overwrite.send_messages = False
-                await channel.set_permissions(guild.default_role, overwrite=overwrite)
-                changed_channels += 1
+                changes.append((channel, guild.default_role, overwrite))
 
             for role_id in config["allowed_roles"]:
                 role = guild.get_role(role_id)
                 if role:
                     role_overwrite = channel.overwrites_for(role)
                     role_overwrite.send_messages = True
-                    await channel.set_permissions(role, overwrite=role_overwrite)
+                    changes.append((channel, role, role_overwrite))
+
+        # Lockdown é ação de moderação: passa na frente de restores/edições em massa
+        results = await self.apply_overwrites(guild, changes, Priority.MODERATION)
+        changed_channels = sum(
+            1 for (_, target, _), result in zip(changes, results)
+            if target == guild.default_role and not isinstance(result, Exception)
+        )
+        failed = sum(1 for result in results if isinstance(result, Exception))
 
         followup_embed = discord.Embed(
             title="Lockdown Concluído",
-            description=f"**{changed_channels} canais** foram bloqueados.\nUse `/unlockdown` para reverter.",
+            description=f"**{changed_channels} canais** foram bloqueados.\nUse `/unlockdown` para reverter."
+                        + (f"\n⚠️ {failed} alteração(ões) falharam (permissões do bot?)." if failed else ""),
             color=discord.Color.dark_red()
         )
         await interaction.followup.send(embed=followup_embed, ephemeral=True)
@@ -80,14 +103,14 @@ class Lockdown(commands.Cog):
     @app_commands.default_permissions(manage_guild=True)
     async def unlockdown(self, interaction: discord.Interaction):
         guild = interaction.guild
-        config = self.get_config(guild.id)
+        config = await self.get_config(guild.id)
 
         if not config["lockdown_active"]:
             await interaction.response.send_message("Lockdown já está desativado.", ephemeral=True)
             return
 
         config["lockdown_active"] = False
-        self.save_config(config)
+        await self.save_config(config)
 
         embed = discord.Embed(
             title="🔓 Lockdown Removido",
@@ -99,17 +122,21 @@ class Lockdown(commands.Cog):
 
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
-        changed_channels = 0
+        changes = []
         for channel in guild.text_channels:
             overwrite = channel.overwrites_for(guild.default_role)
             if overwrite.send_messages is False:
                 overwrite.send_messages = None
-                await channel.set_permissions(guild.default_role, overwrite=overwrite)
-                changed_channels += 1
+                changes.append((channel, guild.default_role, overwrite))
+
+        results = await self.apply_overwrites(guild, changes, Priority.NORMAL)
+        changed_channels = sum(1 for result in results if not isinstance(result, Exception))
+        failed = len(results) - changed_channels
 
         followup_embed = discord.Embed(
             title="Unlockdown Concluído",
-            description=f"**{changed_channels} canais** foram liberados.",
+            description=f"**{changed_channels} canais** foram liberados."
+                        + (f"\n⚠️ {failed} canal(is) falharam (permissões do bot?)." if failed else ""),
             color=discord.Color.dark_green()
         )
         await interaction.followup.send(embed=followup_embed, ephemeral=True)
@@ -118,10 +145,10 @@ class Lockdown(commands.Cog):
     @app_commands.command(name="lockdown_channel_add", description="Adiciona um canal à whitelist do lockdown")
     @app_commands.default_permissions(manage_guild=True)
     async def lockdown_channel_add(self, interaction: discord.Interaction, canal: discord.TextChannel):
-        config = self.get_config(interaction.guild.id)
+        config = await self.get_config(interaction.guild.id)
         if canal.id not in config["whitelist_channels"]:
             config["whitelist_channels"].append(canal.id)
-            self.save_config(config)
+            await self.save_config(config)
             await interaction.response.send_message(f"Canal {canal.mention} adicionado à whitelist do lockdown.", ephemeral=True)
         else:
             await interaction.response.send_message(f"O canal {canal.mention} já está na whitelist.", ephemeral=True)
@@ -129,10 +156,10 @@ class Lockdown(commands.Cog):
     @app_commands.command(name="lockdown_channel_remove", description="Remove um canal da whitelist do lockdown")
     @app_commands.default_permissions(manage_guild=True)
     async def lockdown_channel_remove(self, interaction: discord.Interaction, canal: discord.TextChannel):
-        config = self.get_config(interaction.guild.id)
+        config = await self.get_config(interaction.guild.id)
         if canal.id in config["whitelist_channels"]:
             config["whitelist_channels"].remove(canal.id)
-            self.save_config(config)
+            await self.save_config(config)
             await interaction.response.send_message(f"Canal {canal.mention} removido da whitelist do lockdown.", ephemeral=True)
         else:
             await interaction.response.send_message(f"O canal {canal.mention} não está na whitelist.", ephemeral=True)
@@ -141,10 +168,10 @@ class Lockdown(commands.Cog):
     @app_commands.command(name="lockdown_role_add", description="Adiciona um cargo que pode continuar falando durante o lockdown")
     @app_commands.default_permissions(manage_guild=True)
     async def lockdown_role_add(self, interaction: discord.Interaction, cargo: discord.Role):
-        config = self.get_config(interaction.guild.id)
+        config = await self.get_config(interaction.guild.id)
         if cargo.id not in config["allowed_roles"]:
             config["allowed_roles"].append(cargo.id)
-            self.save_config(config)
+            await self.save_config(config)
             await interaction.response.send_message(f"Cargo {cargo.mention} agora pode falar durante o lockdown.", ephemeral=True)
         else:
             await interaction.response.send_message(f"O cargo {cargo.mention} já está permitido.", ephemeral=True)
@@ -152,10 +179,10 @@ class Lockdown(commands.Cog):
     @app_commands.command(name="lockdown_role_remove", description="Remove um cargo da permissão de falar durante o lockdown")
     @app_commands.default_permissions(manage_guild=True)
     async def lockdown_role_remove(self, interaction: discord.Interaction, cargo: discord.Role):
-        config = self.get_config(interaction.guild.id)
+        config = await self.get_config(interaction.guild.id)
         if cargo.id in config["allowed_roles"]:
             config["allowed_roles"].remove(cargo.id)
-            self.save_config(config)
+            await self.save_config(config)
             await interaction.response.send_message(f"Cargo {cargo.mention} removido da permissão de falar no lockdown.", ephemeral=True)
         else:
             await interaction.response.send_message(f"O cargo {cargo.mention} não está na lista de permitidos.", ephemeral=True)
@@ -164,7 +191,7 @@ class Lockdown(commands.Cog):
     @app_commands.command(name="lockdown_status", description="Mostra o status atual do lockdown, whitelist de canais e cargos permitidos")
     @app_commands.default_permissions(manage_guild=True)
     async def lockdown_status(self, interaction: discord.Interaction):
-        config = self.get_config(interaction.guild.id)
+        config = await self.get_config(interaction.guild.id)
 
         status = "Ativado 🔒" if config.get("lockdown_active", False) else "Desativado 🔓"
         channels = [f"<#{cid}>" for cid in config["whitelist_channels"]]
@@ -5,6 +5,9 @@ import datetime
 import asyncio
 from typing import Optional, Dict, Any
 
+from core.members import get_or_fetch_member
+from core.rest import Priority, routes
+
 # ================================================
 # MODAIS (mantidos iguais)
 # ================================================
@@ -46,7 +49,7 @@ class SimpleEditModal(ui.Modal):
         else:
             config[self.field] = value if value else None
 
-        self.view.save()
+        await self.view.save()
         await self.view.update_preview()
         await interaction.response.send_message(f"{self.field.capitalize()} atualizado para {self.view.current_type.upper()}.", ephemeral=True)
 
@@ -77,7 +80,7 @@ class FieldEditModal(ui.Modal, title="Editar Campo Extra"):
         if not f["name"] or not f["value"]:
             fields.pop(self.index, None)
 
-        self.view.save()
+        await self.view.save()
         await self.view.update_preview()
         await interaction.response.send_message(f"Campo {self.index+1} atualizado para {self.view.current_type.upper()}.", ephemeral=True)
 
@@ -93,8 +96,15 @@ class ModEmbedConfigView(ui.View):
         self.interaction = interaction
         self.guild_id = interaction.guild_id
         self.current_type = "default"  # tipo inicial
+        self.config: Dict[str, Any] = {}
+
+        self.preview_msg: Optional[discord.Message] = None
+
+        # Adiciona o select menu
+        self.add_item(self.PunishmentTypeSelect(self))
 
-        db_data = bot.db.moderation_embed_configs.find_one({"guild_id": self.guild_id}) or {}
+    async def load_config(self):
+        db_data = await self.bot.configs.get(self.bot.db.moderation_embed_configs, self.guild_id) or {}
 
         self.config = {
             "default": db_data.get("default", {
@@ -114,10 +124,12 @@ class ModEmbedConfigView(ui.View):
             "unmute": db_data.get("unmute", {})
         }
 
-        self.preview_msg: Optional[discord.Message] = None
-
-        # Adiciona o select menu
-        self.add_item(self.PunishmentTypeSelect(self))
+    async def save(self):
+        await self.bot.configs.replace(
+            self.bot.db.moderation_embed_configs,
+            self.guild_id,
+            {"guild_id": self.guild_id, **self.config}
+        )
 
     class PunishmentTypeSelect(ui.Select):
         def __init__(self, view: 'ModEmbedConfigView'):
@@ -276,7 +288,7 @@ class ModEmbedConfigView(ui.View):
     async def reset_type(self, inter: discord.Interaction, _):
         if self.current_type in self.config and self.current_type != "default":
             del self.config[self.current_type]
-        self.save()
+        await self.save()
         await self.update_preview()
         await inter.response.send_message(f"Configuração de {self.current_type.upper()} resetada.", ephemeral=True)
 
@@ -296,11 +308,35 @@ class Moderation(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
-    def get_embed_config(self, guild_id: int, action_type: str = "default") -> dict:
-        db_data = self.bot.db.moderation_embed_configs.find_one({"guild_id": guild_id}) or {}
+    async def cog_load(self):
+        # Unmutes agendados sobrevivem a restarts (core/jobs.py)
+        self.bot.jobs.register("unmute", self.run_unmute)
+
+    async def cog_unload(self):
+        self.bot.jobs.unregister("unmute")
+
+    @staticmethod
+    def unmute_job_id(guild_id: int, user_id: int) -> str:
+        return f"unmute:{guild_id}:{user_id}"
+
+    async def run_unmute(self, payload: dict):
+        guild = self.bot.get_guild(payload["guild_id"])
+        if guild is None:
+            return
+        role = guild.get_role(payload["role_id"])
+        member = await get_or_fetch_member(guild, payload["user_id"])
+        if role is None or member is None or role not in member.roles:
+            return
+        await self.bot.rest.run(
+            lambda: member.remove_roles(role, reason="Fim do mute temporário"),
+            guild_id=guild.id, route=routes.REMOVE_ROLE, priority=Priority.MODERATION,
+        )
+
+    async def get_embed_config(self, guild_id: int, action_type: str = "default") -> dict:
+        db_data = await self.bot.configs.get(self.bot.db.moderation_embed_configs, guild_id) or {}
         return db_data.get(action_type, db_data.get("default", {}))
 
-    def get_mod_config(self, guild_id: int) -> dict:
+    async def get_mod_config(self, guild_id: int) -> dict:
         default = {
             "guild_id": guild_id,
             "log_channel_id": None,
@@ -308,21 +344,17 @@ class Moderation(commands.Cog):
             "warnings": {},
             "mutes": {}
         }
-        cfg = self.bot.db.moderation_configs.find_one({"guild_id": guild_id}) or default
+        cfg = await self.bot.configs.get(self.bot.db.moderation_configs, guild_id) or default
         cfg.setdefault("warnings", {})
         cfg.setdefault("mutes", {})
         return cfg
 
-    def save_mod_config(self, config: dict):
-        self.bot.db.moderation_configs.replace_one(
-            {"guild_id": config["guild_id"]},
-            config,
-            upsert=True
-        )
+    async def save_mod_config(self, config: dict):
+        await self.bot.configs.replace(self.bot.db.moderation_configs, config["guild_id"], config)
 
     async def send_punishment_log(self, guild: discord.Guild, action_type: str, **kwargs):
-        embed_cfg = self.get_embed_config(guild.id, action_type)
-        mod_cfg = self.get_mod_config(guild.id)
+        embed_cfg = await self.get_embed_config(guild.id, action_type)
+        mod_cfg = await self.get_mod_config(guild.id)
         log_channel_id = mod_cfg.get("log_channel_id")
         if not log_channel_id:
             return
@@ -380,22 +412,23 @@ class Moderation(commands.Cog):
     async def mod_embed_config(self, interaction: discord.Interaction):
         view = ModEmbedConfigView(self.bot, interaction)
         await interaction.response.defer(ephemeral=True)
+        await view.load_config()
         await view.update_preview()
 
     @app_commands.command(name="log_channel", description="Define o canal de logs de punições")
     @app_commands.default_permissions(administrator=True)
     async def log_channel(self, interaction: discord.Interaction, canal: discord.TextChannel):
-        cfg = self.get_mod_config(interaction.guild_id)
+        cfg = await self.get_mod_config(interaction.guild_id)
         cfg["log_channel_id"] = canal.id
-        self.save_mod_config(cfg)
+        await self.save_mod_config(cfg)
         await interaction.response.send_message(f"Canal de logs definido: {canal.mention}", ephemeral=True)
 
     @app_commands.command(name="mod_role", description="Cargo que recebe alertas (ex: 3 warns)")
     @app_commands.default_permissions(administrator=True)
     async def mod_role(self, interaction: discord.Interaction, cargo: discord.Role):
-        cfg = self.get_mod_config(interaction.guild_id)
+        cfg = await self.get_mod_config(interaction.guild_id)
         cfg["moderator_role_id"] = cargo.id
-        self.save_mod_config(cfg)
+        await self.save_mod_config(cfg)
         await interaction.response.send_message(f"Cargo de moderador definido: {cargo.mention}", ephemeral=True)
 
     # WARN
@@ -406,11 +439,11 @@ class Moderation(commands.Cog):
         if interaction.user.top_role <= membro.top_role and not interaction.user.guild_permissions.administrator:
             return await interaction.response.send_message("Você não pode punir este usuário.", ephemeral=True)
 
-        cfg = self.get_mod_config(interaction.guild_id)
+        cfg = await self.get_mod_config(interaction.guild_id)
         uid = str(membro.id)
         warns = cfg["warnings"].get(uid, 0) + 1
         cfg["warnings"][uid] = warns
-        self.save_mod_config(cfg)
+        await self.save_mod_config(cfg)
 
         avatar_url = membro.avatar.url if membro.avatar else "https://cdn.discordapp.com/embed/avatars/0.png"
 
@@ -456,7 +489,7 @@ class Moderation(commands.Cog):
     @app_commands.command(name="unwarn", description="Remover 1 advertência de um usuário")
     @app_commands.default_permissions(manage_messages=True)
     async def unwarn(self, interaction: discord.Interaction, membro: discord.Member, motivo: str = "Motivo não informado"):
-        cfg = self.get_mod_config(interaction.guild_id)
+        cfg = await self.get_mod_config(interaction.guild_id)
         uid = str(membro.id)
         warns = cfg["warnings"].get(uid, 0)
 
@@ -464,7 +497,7 @@ class Moderation(commands.Cog):
             return await interaction.response.send_message(f"{membro.mention} não tem advertências.", ephemeral=True)
 
         cfg["warnings"][uid] = warns - 1
-        self.save_mod_config(cfg)
+        await self.save_mod_config(cfg)
 
         avatar_url = membro.avatar.url if membro.avatar else "https://cdn.discordapp.com/embed/avatars/0.png"
 
@@ -597,11 +630,11 @@ class Moderation(commands.Cog):
 
         await membro.add_roles(muted_role, reason=motivo)
 
-        cfg = self.get_mod_config(interaction.guild_id)
+        cfg = await self.get_mod_config(interaction.guild_id)
         uid = str(membro.id)
         mutes = cfg["mutes"].get(uid, 0) + 1
         cfg["mutes"][uid] = mutes
-        self.save_mod_config(cfg)
+        await self.save_mod_config(cfg)
 
         avatar_url = membro.avatar.url if membro.avatar else "https://cdn.discordapp.com/embed/avatars/0.png"
 
@@ -620,11 +653,14 @@ class Moderation(commands.Cog):
 
         await interaction.response.send_message(f"{membro.mention} mutado por {tempo_minutos} min.", ephemeral=True)
 
-        await asyncio.sleep(tempo_minutos * 60)
-        try:
-            await membro.remove_roles(muted_role)
-        except:
-            pass
+        # Persistido: um restart no meio do mute não deixa o membro mutado para sempre
+        await self.bot.jobs.schedule(
+            "unmute",
+            datetime.datetime.utcnow() + datetime.timedelta(minutes=tempo_minutos),
+            {"guild_id": interaction.guild_id, "user_id": membro.id, "role_id": muted_role.id},
+            guild_id=interaction.guild_id,
+            job_id=self.unmute_job_id(interaction.guild_id, membro.id),
+        )
 
     # UNMUTE
 
@@ -636,6 +672,7 @@ class Moderation(commands.Cog):
             return await interaction.response.send_message("Usuário não está mutado ou cargo Muted não existe.", ephemeral=True)
 
         await membro.remove_roles(muted_role, reason=motivo)
+        await self.bot.jobs.cancel(self.unmute_job_id(interaction.guild_id, membro.id))
 
         avatar_url = membro.avatar.url if membro.avatar else "https://cdn.discordapp.com/embed/avatars/0.png"
 
@@ -659,7 +696,7 @@ class Moderation(commands.Cog):
     @app_commands.command(name="infractions", description="Ver warns e mutes de um membro (ephemeral)")
     @app_commands.default_permissions(manage_messages=True)
     async def infractions(self, interaction: discord.Interaction, membro: discord.Member):
-        cfg = self.get_mod_config(interaction.guild_id)
+        cfg = await self.get_mod_config(interaction.guild_id)
         uid = str(membro.id)
 
         warns = cfg.get("warnings", {}).get(uid, 0)
@@ -1,10 +1,13 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
-import json
 import asyncio
 from io import BytesIO
 
+from core.rest import Priority, routes
+from core.offload import OFFLOAD_MAX_BYTES, PayloadTooLarge
+from core.jsoncodec import JSONDecodeError, snowflake
+
 class RestoreCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
@@ -23,9 +26,14 @@ class RestoreCog(commands.Cog):
         await interaction.response.defer(ephemeral=True)
 
         try:
+            if arquivo.size > OFFLOAD_MAX_BYTES:
+                raise PayloadTooLarge(arquivo.size)
             conteudo_bytes = await arquivo.read()
-            backup_data = json.loads(conteudo_bytes.decode('utf-8'))
-        except json.JSONDecodeError:
+            backup_data = await self.bot.offload.json_loads(conteudo_bytes, task="restore")
+        except PayloadTooLarge as e:
+            await interaction.followup.send(f"Arquivo grande demais: {e}", ephemeral=True)
+            return
+        except JSONDecodeError:
             await interaction.followup.send("JSON inválido ou corrompido.", ephemeral=True)
             return
         except Exception as e:
@@ -62,27 +70,37 @@ class RestoreConfirmView(discord.ui.View):
         if interaction.user != self.owner:
             return await interaction.response.send_message("Apenas o dono pode confirmar.", ephemeral=True)
 
+        # Botão não passa pelo check dos slash commands: marca a restauração como trabalho
+        # em andamento para um redeploy esperar ela terminar (core/shutdown.py)
+        if not self.bot.shutdown.track():
+            return await interaction.response.send_message(
+                "🔄 O bot está reiniciando. Tente de novo em alguns segundos.", ephemeral=True
+            )
+
         await interaction.response.defer(ephemeral=True)
         msg = await interaction.followup.send("Iniciando restauração... (pode demorar alguns segundos)", ephemeral=True)
 
+        # Tudo passa pelo agendador REST com prioridade BULK: o ritmo segue os
+        # buckets do Discord e ações de moderação (de qualquer servidor) vão na frente.
+        rest = self.bot.rest
+        guild_id = self.guild.id
+
+        def run(factory, route, major_id=None):
+            return rest.run(factory, guild_id=guild_id, route=route, major_id=major_id, priority=Priority.BULK)
+
         try:
-            # 1. Deletar canais existentes
-            for ch in list(self.guild.channels):
-                try:
-                    await ch.delete(reason="Restauração de backup")
-                    await asyncio.sleep(0.35)
-                except:
-                    pass
+            # 1. Deletar canais existentes (em paralelo; cada canal tem o próprio bucket)
+            await asyncio.gather(*(
+                run(lambda ch=ch: ch.delete(reason="Restauração de backup"), routes.DELETE_CHANNEL, ch.id)
+                for ch in list(self.guild.channels)
+            ), return_exceptions=True)
 
             # 2. Deletar cargos (exceto @everyone e managed)
-            for role in list(self.guild.roles):
-                if role.is_default() or role.managed:
-                    continue
-                try:
-                    await role.delete(reason="Restauração de backup")
-                    await asyncio.sleep(0.35)
-                except:
-                    pass
+            await asyncio.gather(*(
+                run(lambda role=role: role.delete(reason="Restauração de backup"), routes.DELETE_ROLE)
+                for role in list(self.guild.roles)
+                if not role.is_default() and not role.managed
+            ), return_exceptions=True)
 
             await msg.edit(content="Estrutura antiga removida. Recriando cargos...")
 
@@ -93,25 +111,25 @@ class RestoreConfirmView(discord.ui.View):
             for r in roles_sorted:
                 if r["name"] == "@everyone":
                     everyone = self.guild.default_role
-                    await everyone.edit(
+                    await run(lambda: everyone.edit(
                         permissions=discord.Permissions(r["permissions"]),
                         color=discord.Color(r["color"]),
                         hoist=r["hoist"],
                         mentionable=r["mentionable"]
-                    )
-                    old_id_to_new[r["id"]] = everyone
+                    ), routes.EDIT_ROLE)
+                    old_id_to_new[snowflake(r["id"])] = everyone
                     continue
 
-                new_role = await self.guild.create_role(
+                # Em sequência: a ordem de criação define a hierarquia dos cargos
+                new_role = await run(lambda: self.guild.create_role(
                     name=r["name"],
                     color=discord.Color(r["color"]),
                     permissions=discord.Permissions(r["permissions"]),
                     hoist=r["hoist"],
                     mentionable=r["mentionable"],
                     reason="Restauração de backup"
-                )
-                old_id_to_new[r["id"]] = new_role
-                await asyncio.sleep(0.35)
+                ), routes.CREATE_ROLE)
+                old_id_to_new[snowflake(r["id"])] = new_role
 
             await msg.edit(content="Cargos recriados. Recriando categorias e canais...")
 
@@ -122,7 +140,7 @@ class RestoreConfirmView(discord.ui.View):
                     if ow["target_type"] != "role":
                         continue  # Ignora member overwrites
 
-                    old_role_id = ow["target_id"]
+                    old_role_id = snowflake(ow["target_id"])
                     new_role = old_id_to_new.get(old_role_id)
                     if not new_role:
                         continue
@@ -150,12 +168,14 @@ class RestoreConfirmView(discord.ui.View):
 
                 ch_type = ch_data["type"]
                 if ch_type == "text":
-                    return await self.guild.create_text_channel(**kwargs)
+                    create = self.guild.create_text_channel
                 elif ch_type == "voice":
-                    return await self.guild.create_voice_channel(**kwargs)
+                    create = self.guild.create_voice_channel
                 elif ch_type == "stage_voice":
-                    return await self.guild.create_stage_channel(**kwargs)
-                return None
+                    create = self.guild.create_stage_channel
+                else:
+                    return None
+                return await run(lambda: create(**kwargs), routes.CREATE_CHANNEL)
 
             # 5. Categorias + canais dentro delas
             for cat_data in self.backup.get("categories", []):
@@ -163,33 +183,29 @@ class RestoreConfirmView(discord.ui.View):
                 for ow in cat_data.get("overwrites", []):
                     if ow["target_type"] != "role":
                         continue
-                    old_id = ow["target_id"]
+                    old_id = snowflake(ow["target_id"])
                     new_role = old_id_to_new.get(old_id)
                     if new_role:
                         allow = discord.Permissions(ow["allow"])
                         deny = discord.Permissions(ow["deny"])
                         cat_overwrites[new_role] = discord.PermissionOverwrite.from_pair(allow=allow, deny=deny)
 
-                category = await self.guild.create_category(
+                category = await run(lambda: self.guild.create_category(
                     name=cat_data["name"],
                     position=cat_data["position"],
                     overwrites=cat_overwrites,
                     reason="Restauração de backup"
-                )
-                await asyncio.sleep(0.4)
+                ), routes.CREATE_CHANNEL)
 
                 for ch_data in cat_data.get("channels", []):
                     await create_channel_with_overwrites(ch_data, category)
-                    await asyncio.sleep(0.4)
 
             # 6. Canais sem categoria
             for ch_data in self.backup.get("text_channels", []):
                 await create_channel_with_overwrites(ch_data)
-                await asyncio.sleep(0.4)
 
             for ch_data in self.backup.get("voice_channels", []):
                 await create_channel_with_overwrites(ch_data)
-                await asyncio.sleep(0.4)
 
             await msg.edit(
                 content="**Restauração concluída!**\n"
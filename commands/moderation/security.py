@@ -3,49 +3,38 @@ from discord import app_commands, Interaction, Embed, Colour, SelectOption, Mess
 from discord.ext import commands, tasks
 from discord.ui import Select, View, Modal, TextInput
 import asyncio
-import os
-from pymongo import MongoClient
-from pymongo.errors import ConnectionFailure
 from collections import defaultdict, deque
 import datetime
 import re
-import logging  # Adicionado para logs de debug
+import logging
+
+from core.pipeline import MessageContext
+from core.rest import Priority, routes
+from core.logging_setup import bind_log_context
 
 logger = logging.getLogger(__name__)  # Para logs
 
 class SecurityConfig:
-    def __init__(self):
-        self.mongo_uri = os.environ.get("MONGO_URI", "mongodb://localhost:27017/")
-        self.db_name = "discord_bot"
-        self.collection_name = "security_configs"
-        self.client = None
-        self.collection = None
-        self.connect_mongo()
-
-    def connect_mongo(self):
-        try:
-            self.client = MongoClient(self.mongo_uri)
-            self.collection = self.client[self.db_name][self.collection_name]
-            self.client.admin.command('ping')
-            print("Conectado ao MongoDB com sucesso.")
-        except ConnectionFailure:
-            print("Erro ao conectar ao MongoDB. Usando valores padrão.")
-            self.client = None
-            self.collection = None
-
-    def get_guild_config(self, guild_id: int) -> dict:
+    def __init__(self, db, cache):
+        # Coleção do client compartilhado do bot (None = sem banco, usa valores padrão)
+        self.collection = db.security_configs if db is not None else None
+        # Leituras passam pelo cache de configs do bot (write-through)
+        self.cache = cache
+
+    async def get_guild_config(self, guild_id: int) -> dict:
         str_id = str(guild_id)
         if self.collection is not None:
-            doc = self.collection.find_one({"_id": str_id})
+            doc = await self.cache.get(self.collection, str_id, field="_id")
             if not doc:
-                doc = {
-                    "_id": str_id,
+                # Upsert: duas mensagens de um servidor novo ao mesmo tempo não podem
+                # inserir o mesmo _id duas vezes (DuplicateKeyError)
+                defaults = {
                     'anti_raid': {'enabled': False, 'join_threshold': 5, 'time_window': 60, 'action': 'ban'},
                     'anti_links': {'enabled': False, 'allowed_domains': [], 'action': 'delete'},
                     'anti_spam': {'enabled': False, 'message_threshold': 5, 'time_window': 10, 'action': 'mute'},
                     'anti_nuke': {'enabled': False, 'change_threshold': 3, 'time_window': 60, 'action': 'ban'}
                 }
-                self.collection.insert_one(doc)
+                doc = await self.cache.update(self.collection, str_id, {"$setOnInsert": defaults}, field="_id")
             return doc
         else:
             return {
@@ -55,9 +44,9 @@ class SecurityConfig:
                 'anti_nuke': {'enabled': False, 'change_threshold': 3, 'time_window': 60, 'action': 'ban'}
             }
 
-    def save_guild_config(self, guild_id: int, config: dict):
+    async def save_guild_config(self, guild_id: int, config: dict):
         if self.collection is not None:
-            self.collection.replace_one({"_id": str(guild_id)}, {"_id": str(guild_id), **config}, upsert=True)
+            await self.cache.replace(self.collection, str(guild_id), {"_id": str(guild_id), **config}, field="_id")
 
 class SecurityModal(Modal):
     def __init__(self, view: 'SecurityView', feature: str, config: dict):
@@ -114,7 +103,7 @@ class SecurityModal(Modal):
                     raise ValueError("Ação inválida")
                 self.config['action'] = action
 
-            self.view.security_config.save_guild_config(self.view.original_interaction.guild_id, self.view.guild_config)
+            await self.view.security_config.save_guild_config(self.view.original_interaction.guild_id, self.view.guild_config)
             await interaction.response.defer()
             await self.view.update_preview()
         except ValueError as e:
@@ -126,7 +115,10 @@ class SecurityView(View):
         self.original_interaction = interaction
         self.preview_message = None
         self.security_config = security_config
-        self.guild_config = security_config.get_guild_config(interaction.guild_id)
+        self.guild_config = None
+
+    async def load_config(self):
+        self.guild_config = await self.security_config.get_guild_config(self.original_interaction.guild_id)
 
     async def interaction_check(self, interaction: Interaction) -> bool:
         return interaction.user.id == self.original_interaction.user.id
@@ -181,13 +173,13 @@ class SecurityView(View):
     async def toggle_select(self, interaction: Interaction, select: Select):
         feat = select.values[0]
         self.guild_config[feat]['enabled'] = not self.guild_config[feat]['enabled']
-        self.security_config.save_guild_config(self.original_interaction.guild_id, self.guild_config)
+        await self.security_config.save_guild_config(self.original_interaction.guild_id, self.guild_config)
         await interaction.response.defer()
         await self.update_preview()
 
     @discord.ui.button(label="Salvar e Sair", style=discord.ButtonStyle.green, row=2)
     async def save_exit(self, interaction: Interaction, button):
-        self.security_config.save_guild_config(self.original_interaction.guild_id, self.guild_config)
+        await self.security_config.save_guild_config(self.original_interaction.guild_id, self.guild_config)
         await interaction.response.send_message("Configurações salvas!", ephemeral=True)
         self.stop()
 
@@ -199,7 +191,7 @@ class SecurityView(View):
 class SecurityCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.security_config = SecurityConfig()
+        self.security_config = SecurityConfig(bot.cogs_db, bot.configs)
         self.join_tracker = defaultdict(deque)  # Para anti-raid: deque de timestamps
         self.message_tracker = defaultdict(lambda: defaultdict(deque))  # Para anti-spam: guild -> user -> deque de timestamps
         self.nuke_tracker = defaultdict(lambda: defaultdict(deque))  # Para anti-nuke: guild -> user -> deque de (timestamp, action)
@@ -237,12 +229,14 @@ class SecurityCog(commands.Cog):
     @app_commands.checks.has_permissions(administrator=True)
     async def security(self, interaction: Interaction):
         view = SecurityView(interaction, self.security_config)
+        await view.load_config()
         await interaction.response.send_message("Iniciando configuração de segurança...", ephemeral=True)
         await view.update_preview()
 
     @commands.Cog.listener()
     async def on_member_join(self, member: discord.Member):
-        config = self.security_config.get_guild_config(member.guild.id)['anti_raid']
+        bind_log_context(guild_id=member.guild.id, user_id=member.id, cog="security")
+        config = (await self.security_config.get_guild_config(member.guild.id))['anti_raid']
         if not config['enabled']:
             return
 
@@ -256,37 +250,52 @@ class SecurityCog(commands.Cog):
 
         if recent_joins >= config['join_threshold']:
             # Ação: banir/kick/mute os membros recentes
-            recent_members = [m for m in member.guild.members if m.joined_at and (now - m.joined_at) < datetime.timedelta(seconds=config['time_window'])]
-            for m in recent_members[-config['join_threshold']:]:
-                try:
-                    if config['action'] == 'ban':
-                        await m.ban(reason="Anti-Raid: Join em massa detectado")
-                    elif config['action'] == 'kick':
-                        await m.kick(reason="Anti-Raid: Join em massa detectado")
-                    elif config['action'] == 'mute':
-                        mute_role = discord.utils.get(member.guild.roles, name="Muted")
-                        if mute_role:
-                            await m.add_roles(mute_role, reason="Anti-Raid: Join em massa detectado")
-                except discord.Forbidden:
-                    pass  # Bot sem permissões
+            # joined_at vem com fuso (UTC); o rastreador usa utcnow() sem fuso
+            # Sem chunk: quem acabou de entrar veio pelo GUILD_MEMBER_ADD e já está no cache
+            joined_after = discord.utils.utcnow() - datetime.timedelta(seconds=config['time_window'])
+            recent_members = [m for m in member.guild.members if m.joined_at and m.joined_at > joined_after]
+            reason = "Anti-Raid: Join em massa detectado"
+            if config['action'] == 'ban':
+                action, route = (lambda m: m.ban(reason=reason)), routes.BAN
+            elif config['action'] == 'kick':
+                action, route = (lambda m: m.kick(reason=reason)), routes.KICK
+            elif config['action'] == 'mute':
+                mute_role = discord.utils.get(member.guild.roles, name="Muted")
+                if not mute_role:
+                    return
+                action, route = (lambda m: m.add_roles(mute_role, reason=reason)), routes.ADD_ROLE
+            else:
+                return
 
-    @commands.Cog.listener()
-    async def on_message(self, message: Message):
-        if message.author.bot or not message.guild:
-            return
-        guild_id = message.guild.id
-        config = self.security_config.get_guild_config(guild_id)
+            # Em paralelo pelo agendador REST, com prioridade de moderação
+            # (Forbidden = bot sem permissões; fica só no resultado)
+            await asyncio.gather(*(
+                self.bot.rest.run(lambda m=m: action(m), guild_id=guild_id, route=route, priority=Priority.MODERATION)
+                for m in recent_members[-config['join_threshold']:]
+            ), return_exceptions=True)
+
+    async def cog_load(self):
+        self.bot.pipeline.register("security", self.process_message)
+
+    async def cog_unload(self):
+        self.bot.pipeline.unregister("security")
+        self.clean_trackers.cancel()
+
+    # Etapa "security" do pipeline de mensagens (core/pipeline.py)
+    async def process_message(self, ctx: MessageContext):
+        message = ctx.message
+        guild_id = ctx.guild_id
+        config = await ctx.config("security", self.security_config.get_guild_config)
 
         # Anti-Links
         if config['anti_links']['enabled']:
-            url_pattern = re.compile(r'https?://[^\s]+')
-            urls = url_pattern.findall(message.content)
+            urls = ctx.urls
             if urls:
                 allowed = config['anti_links']['allowed_domains']
                 if not any(any(domain in url for domain in allowed) for url in urls):
                     try:
                         if config['anti_links']['action'] == 'delete':
-                            await message.delete()
+                            await ctx.delete()
                             await message.channel.send(f"{message.author.mention}, links não permitidos aqui!", delete_after=5)
                         elif config['anti_links']['action'] == 'warn':
                             await message.channel.send(f"{message.author.mention}, aviso: links não permitidos!")
@@ -310,7 +319,7 @@ class SecurityCog(commands.Cog):
                         if mute_role:
                             await message.author.add_roles(mute_role, reason="Anti-Spam: Spam detectado")
                     elif config['anti_spam']['action'] == 'delete':
-                        await message.delete()
+                        await ctx.delete()
                 except discord.Forbidden:
                     pass
 
@@ -326,26 +335,27 @@ class SecurityCog(commands.Cog):
     # Adicione mais listeners para roles, bans, etc., se necessário
 
     async def check_nuke(self, guild: discord.Guild, event_type: str, target=None):
-        config = self.security_config.get_guild_config(guild.id)['anti_nuke']
+        bind_log_context(guild_id=guild.id, cog="security")
+        config = (await self.security_config.get_guild_config(guild.id))['anti_nuke']
         if not config['enabled']:
             return
 
         # Obter o usuário responsável via audit log
         action = getattr(discord.AuditLogAction, event_type, None)
         if action is None:
-            logger.warning(f"[DEBUG] Ação de audit log inválida para event_type: {event_type}. Pulando verificação.")
+            logger.debug("Ação de audit log inválida para event_type: %s. Pulando verificação.", event_type)
             return  # Pula para eventos sem ação válida (ex.: member_remove natural)
 
         try:
             async for entry in guild.audit_logs(limit=1, action=action):
                 user = entry.user
-                logger.info(f"[DEBUG] Entrada de audit log encontrada para {event_type}: usuário {user} (ID: {user.id})")
+                logger.debug("Entrada de audit log encontrada para %s: usuário %s (ID: %s)", event_type, user, user.id)
                 break
             else:
-                logger.info(f"[DEBUG] Nenhuma entrada de audit log encontrada para {event_type}.")
+                logger.debug("Nenhuma entrada de audit log encontrada para %s.", event_type)
                 return  # Não encontrou entry
         except discord.Forbidden:
-            logger.warning(f"[DEBUG] Sem permissão para acessar audit logs em {guild.name}.")
+            logger.warning("Sem permissão para acessar audit logs em %s.", guild.name)
             return
 
         now = datetime.datetime.utcnow()
@@ -359,14 +369,21 @@ class SecurityCog(commands.Cog):
 
         if recent_changes >= config['change_threshold']:
             try:
+                # `entry.user` pode ser um User (sem .ban/.kick) → a ação sai pelo servidor
                 if config['action'] == 'ban':
-                    await user.ban(reason="Anti-Nuke: Mudanças em massa detectadas")
-                    logger.info(f"[DEBUG] Usuário {user} banido por anti-nuke em {guild.name}.")
+                    await self.bot.rest.run(
+                        lambda: guild.ban(user, reason="Anti-Nuke: Mudanças em massa detectadas"),
+                        guild_id=guild_id, route=routes.BAN, priority=Priority.MODERATION,
+                    )
+                    logger.info("Usuário %s banido por anti-nuke em %s.", user, guild.name)
                 elif config['action'] == 'kick':
-                    await user.kick(reason="Anti-Nuke: Mudanças em massa detectadas")
-                    logger.info(f"[DEBUG] Usuário {user} kickado por anti-nuke em {guild.name}.")
+                    await self.bot.rest.run(
+                        lambda: guild.kick(user, reason="Anti-Nuke: Mudanças em massa detectadas"),
+                        guild_id=guild_id, route=routes.KICK, priority=Priority.MODERATION,
+                    )
+                    logger.info("Usuário %s kickado por anti-nuke em %s.", user, guild.name)
             except discord.Forbidden:
-                logger.warning(f"[DEBUG] Sem permissão para punir {user} em {guild.name}.")
+                logger.warning("Sem permissão para punir %s em %s.", user, guild.name)
 
 async def setup(bot: commands.Bot):
     await bot.add_cog(SecurityCog(bot))
\ No newline at end of file
@@ -2,7 +2,6 @@ import discord
 from discord import app_commands, Interaction, Embed, Colour, SelectOption
 from discord.ext import commands
 from discord.ui import Select, View, Modal, TextInput
-import aiohttp
 import asyncio
 
 
@@ -82,12 +81,12 @@ class BotUpdateView(View):
                 await interaction.followup.send("Envie uma imagem válida (PNG, JPG, GIF, WEBP).", ephemeral=True)
                 return
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(attachment.url) as resp:
-                    if resp.status != 200:
-                        await interaction.followup.send("Falha ao baixar a imagem.", ephemeral=True)
-                        return
-                    image_data = await resp.read()
+            # Usa a sessão HTTP do próprio discord.py (sem abrir outra só para isso)
+            try:
+                image_data = await attachment.read()
+            except discord.HTTPException:
+                await interaction.followup.send("Falha ao baixar a imagem.", ephemeral=True)
+                return
 
             if is_banner:
                 await self.bot.user.edit(banner=image_data)
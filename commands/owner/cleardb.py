@@ -31,7 +31,7 @@ class ClearDB(commands.Cog):
             await self.bot.wait_for('message', check=check, timeout=10.0)
 
             # Deleta apenas o documento desse servidor
-            result = self.bot.db.guild_configs.delete_one({"guild_id": guild_id})
+            result = await self.bot.configs.delete(self.bot.db.guild_configs, guild_id)
 
             if result.deleted_count > 0:
                 await interaction.followup.send(
@@ -0,0 +1,87 @@
+import io
+
+import discord
+from discord import app_commands, Interaction, Embed
+from discord.ext import commands
+
+from core import dbprofile
+
+
+# Check local (definido aqui mesmo para evitar import de utils)
+async def is_bot_owner(interaction: discord.Interaction) -> bool:
+    return await interaction.client.is_owner(interaction.user)
+
+
+def _line(q: dict) -> str:
+    return (
+        f"`{q['total_ms']:>8.0f}ms` `{q['count']:>6}x` p95 `{q['p95_ms']:.1f}ms` "
+        f"**{q['collection']}.{q['op']}** ({q['cog']})"
+    )
+
+
+class DBProfile(commands.Cog):
+    """Perfil das consultas ao banco (core/dbprofile.py)."""
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    @app_commands.command(name="dbprofile", description="Consultas ao banco mais pesadas, por formato e por cog (apenas dono)")
+    @app_commands.describe(
+        top="Quantos formatos listar (padrão: 10)",
+        ordenar="Critério de ordenação",
+        zerar="Zera as estatísticas depois de mostrar"
+    )
+    @app_commands.choices(ordenar=[
+        app_commands.Choice(name="Tempo total", value="total"),
+        app_commands.Choice(name="Latência p95", value="p95"),
+        app_commands.Choice(name="Quantidade", value="count"),
+    ])
+    @app_commands.check(is_bot_owner)
+    async def dbprofile_cmd(self, interaction: Interaction, top: app_commands.Range[int, 3, 25] = 10,
+                            ordenar: str = "total", zerar: bool = False):
+        profiler = dbprofile.PROFILER
+        if profiler is None:
+            await interaction.response.send_message("Profiler desligado (DB_PROFILE=0).", ephemeral=True)
+            return
+
+        shapes = profiler.top(top, by=ordenar)
+        cogs = profiler.by_cog(top)
+        embed = Embed(
+            title="🗄️ Perfil do banco",
+            description=(
+                f"**Backend:** {self.bot.db.backend if self.bot.db is not None else 'nenhum'}\n"
+                f"**Formatos distintos:** {len(profiler.shapes)} | "
+                f"**Lentas (≥{profiler.slow_ms:.0f}ms):** {profiler.slow_queries}"
+            ),
+            color=discord.Color.blurple()
+        )
+        embed.add_field(
+            name="Formatos mais pesados",
+            value="\n".join(_line(q) for q in shapes)[:1024] or "Nenhuma consulta registrada ainda.",
+            inline=False
+        )
+        embed.add_field(
+            name="Por cog",
+            value="\n".join(
+                f"`{c['total_ms']:>8.0f}ms` `{c['count']:>6}x` p95 `{c['p95_ms']:.1f}ms` {c['cog']}" for c in cogs
+            )[:1024] or "—",
+            inline=False
+        )
+
+        # Relatório completo (com o formato de cada consulta) em anexo
+        report = "\n\n".join(
+            f"{q['collection']}.{q['op']}  cog={q['cog']}\n"
+            f"  count={q['count']} total={q['total_ms']}ms p50={q['p50_ms']}ms p95={q['p95_ms']}ms "
+            f"p99={q['p99_ms']}ms avg_bytes={q['avg_bytes']} errors={q['errors']}\n"
+            f"  formato={q['shape']}"
+            for q in profiler.top(len(profiler.shapes), by=ordenar)
+        )
+        file = discord.File(io.BytesIO(report.encode()), filename="dbprofile.txt")
+
+        if zerar:
+            profiler.reset()
+        await interaction.response.send_message(embed=embed, file=file, ephemeral=True)
+
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(DBProfile(bot))
@@ -0,0 +1,78 @@
+import io
+import asyncio
+
+import discord
+from discord import app_commands, Interaction, Embed
+from discord.ext import commands
+
+from core.importtime import profile_startup
+
+
+# Check local (definido aqui mesmo para evitar import de utils)
+async def is_bot_owner(interaction: discord.Interaction) -> bool:
+    return await interaction.client.is_owner(interaction.user)
+
+
+def _ms(us: int) -> str:
+    return f"{us / 1000:.0f}ms"
+
+
+class ImportTime(commands.Cog):
+    """Diagnóstico do tempo de inicialização (imports + carga dos cogs)."""
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    @app_commands.command(name="importtime", description="Perfil do tempo de import da inicialização do bot (apenas dono)")
+    @app_commands.describe(top="Quantos módulos listar (padrão: 10)")
+    @app_commands.check(is_bot_owner)
+    async def importtime(self, interaction: Interaction, top: app_commands.Range[int, 3, 25] = 10):
+        await interaction.response.defer(ephemeral=True, thinking=True)
+
+        try:
+            profile = await profile_startup()
+        except asyncio.TimeoutError:
+            await interaction.followup.send("O perfil demorou demais (timeout).", ephemeral=True)
+            return
+        except RuntimeError as e:
+            await interaction.followup.send(f"Falha ao importar o caminho de inicialização:\n```{str(e)[:1800]}```", ephemeral=True)
+            return
+
+        embed = Embed(
+            title="⏱️ Tempo de import da inicialização",
+            description=(
+                f"**Imports:** {_ms(profile.total_us)} em {len(profile.entries)} módulos\n"
+                f"**Subprocesso:** {profile.wall_seconds:.2f}s (inclui o interpretador)\n"
+                + (f"**Último boot:** pronto em {self.bot.boot_seconds:.2f}s" if getattr(self.bot, "boot_seconds", None) else "")
+            ),
+            color=discord.Color.blurple()
+        )
+        embed.add_field(
+            name="Mais lentos (cumulativo)",
+            value="\n".join(f"`{_ms(e.cumulative_us):>7}` {e.module}" for e in profile.slowest(top))[:1024],
+            inline=False
+        )
+        embed.add_field(
+            name="Por pacote (tempo próprio)",
+            value="\n".join(f"`{_ms(us):>7}` {name}" for name, us in profile.packages(top))[:1024],
+            inline=False
+        )
+
+        report = getattr(self.bot, "cog_load_report", None)
+        if report:
+            slow_cogs = sorted(
+                ((cog, (r["deps"] or 0) + (r["load"] or 0)) for cog, r in report.items()),
+                key=lambda item: item[1], reverse=True
+            )[:5]
+            embed.add_field(
+                name="Cogs mais lentos (deps + carga)",
+                value="\n".join(f"`{seconds * 1000:>5.0f}ms` {cog}" for cog, seconds in slow_cogs),
+                inline=False
+            )
+
+        raw = discord.File(io.BytesIO(profile.raw.encode()), filename="importtime.txt")
+        await interaction.followup.send(embed=embed, file=raw, ephemeral=True)
+
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(ImportTime(bot))
@@ -8,6 +8,33 @@ import pathlib
 from discord.utils import format_dt
 import asyncio
 
+# ──────────────────────────────────────────────────────────────
+#  TRANSCRIPT (rodam fora do event loop — ver core/offload.py)
+# ──────────────────────────────────────────────────────────────
+
+def render_transcript(channel_name: str, opened_by: str, rows: list) -> str:
+    messages = []
+    for author, timestamp, content in rows:
+        content = content.replace("\n", "<br>")
+        messages.append(f"<div><strong>{author} ({timestamp})</strong><br>{content}</div><hr>")
+
+    return f"""
+        <html>
+        <head><title>Transcript - {channel_name}</title></head>
+        <body style="font-family:Arial;background:#2f3136;color:#dcddde;padding:20px;">
+        <h1>Transcript do ticket {channel_name}</h1>
+        <p>Aberto por: {opened_by}</p>
+        {''.join(messages)}
+        </body>
+        </html>
+        """
+
+
+def write_transcript(path: str, html: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    pathlib.Path(path).write_text(html, encoding="utf-8")
+
+
 # ──────────────────────────────────────────────────────────────
 #  CLASSES AUXILIARES
 # ──────────────────────────────────────────────────────────────
@@ -21,7 +48,7 @@ class TicketView(ui.View):
     @ui.button(label="Abrir Ticket", style=discord.ButtonStyle.green, emoji="🎫", custom_id="ticket:create")
     async def create_ticket(self, interaction: discord.Interaction, button: ui.Button):
         guild_id = interaction.guild_id
-        config = self.bot.db.ticket_configs.find_one({"guild_id": guild_id}) or {}
+        config = await self.bot.configs.get(self.bot.db.ticket_configs, guild_id) or {}
         if not config.get("enabled", True):
             return await interaction.response.send_message("Sistema de tickets desativado.", ephemeral=True)
 
@@ -48,7 +75,7 @@ class TicketModal(ui.Modal, title="Criar novo ticket"):
 
     async def on_submit(self, interaction: discord.Interaction):
         guild_id = interaction.guild_id
-        config = self.bot.db.ticket_configs.find_one({"guild_id": guild_id}) or {}
+        config = await self.bot.configs.get(self.bot.db.ticket_configs, guild_id) or {}
 
         category = interaction.guild.get_channel(config.get("category_id"))
         overwrites = {
@@ -94,7 +121,7 @@ class TicketControlView(ui.View):
 
     @ui.button(label="Claim", style=discord.ButtonStyle.blurple, emoji="🔒")
     async def claim(self, interaction: discord.Interaction, button: ui.Button):
-        config = self.bot.db.ticket_configs.find_one({"guild_id": interaction.guild_id})
+        config = await self.bot.configs.get(self.bot.db.ticket_configs, interaction.guild_id)
         staff_role_id = config.get("staff_role")
         if not staff_role_id or staff_role_id not in [r.id for r in interaction.user.roles]:
             return await interaction.response.send_message("Apenas staff pode claimar tickets.", ephemeral=True)
@@ -112,7 +139,7 @@ class TicketControlView(ui.View):
 
     @ui.button(label="Fechar Ticket", style=discord.ButtonStyle.red, emoji="🗑️")
     async def close(self, interaction: discord.Interaction, button: ui.Button):
-        config = self.bot.db.ticket_configs.find_one({"guild_id": interaction.guild_id})
+        config = await self.bot.configs.get(self.bot.db.ticket_configs, interaction.guild_id)
         staff_role_id = config.get("staff_role")
         is_staff = staff_role_id and staff_role_id in [r.id for r in interaction.user.roles]
         is_owner_or_admin = interaction.user == self.owner or interaction.user.guild_permissions.administrator
@@ -136,26 +163,15 @@ class TicketControlView(ui.View):
         await interaction.channel.delete()
 
     async def generate_transcript(self, channel):
-        messages = []
+        rows = []
         async for msg in channel.history(limit=None, oldest_first=True):
-            timestamp = format_dt(msg.created_at, "f")
-            content = msg.content.replace("\n", "<br>")
-            messages.append(f"<div><strong>{msg.author} ({timestamp})</strong><br>{content}</div><hr>")
-
-        html = f"""
-        <html>
-        <head><title>Transcript - {channel.name}</title></head>
-        <body style="font-family:Arial;background:#2f3136;color:#dcddde;padding:20px;">
-        <h1>Transcript do ticket {channel.name}</h1>
-        <p>Aberto por: {channel.topic.split('|')[0].strip()}</p>
-        {''.join(messages)}
-        </body>
-        </html>
-        """
+            rows.append((str(msg.author), format_dt(msg.created_at, "f"), msg.content))
 
+        # Montagem do HTML num processo e escrita numa thread (core/offload.py)
+        opened_by = channel.topic.split('|')[0].strip()
+        html = await self.bot.offload.run_cpu(render_transcript, channel.name, opened_by, rows, task="transcript")
         path = f"transcripts/{channel.id}.html"
-        os.makedirs("transcripts", exist_ok=True)
-        pathlib.Path(path).write_text(html, encoding="utf-8")
+        await self.bot.offload.run_io(write_transcript, path, html, task="transcript_write")
         return path
 
 
@@ -214,10 +230,10 @@ class FieldEditModal(ui.Modal, title="Adicionar/Editar Campo"):
             fields.append(field_data)
             msg = "Campo adicionado com sucesso!"
 
-        self.view.bot.db.ticket_configs.update_one(
-            {"guild_id": self.view.guild_id},
-            {"$set": {"embed.fields": fields}},
-            upsert=True
+        await self.view.bot.configs.update(
+            self.view.bot.db.ticket_configs,
+            self.view.guild_id,
+            {"$set": {"embed.fields": fields}}
         )
 
         await self.view.update_preview()
@@ -230,7 +246,11 @@ class TicketConfigView(ui.View):
         self.bot = bot
         self.interaction = interaction
         self.guild_id = interaction.guild_id
-        self.config = self.bot.db.ticket_configs.find_one({"guild_id": self.guild_id}) or {
+        self.config = None
+        self.preview_message = None
+
+    async def load_config(self):
+        self.config = await self.bot.configs.get(self.bot.db.ticket_configs, self.guild_id) or {
             "staff_role": None,
             "category_id": None,
             "log_channel_id": None,
@@ -243,7 +263,6 @@ class TicketConfigView(ui.View):
                 "fields": []
             }
         }
-        self.preview_message = None
 
     async def update_preview(self):
         embed = discord.Embed(
@@ -351,10 +370,10 @@ class TicketConfigView(ui.View):
                 fields = self.config["embed"].setdefault("fields", [])
                 if 0 <= idx < len(fields):
                     del fields[idx]
-                    self.bot.db.ticket_configs.update_one(
-                        {"guild_id": self.guild_id},
-                        {"$set": {"embed.fields": fields}},
-                        upsert=True
+                    await self.bot.configs.update(
+                        self.bot.db.ticket_configs,
+                        self.guild_id,
+                        {"$set": {"embed.fields": fields}}
                     )
                     await self.update_preview()
                     await inter.response.send_message(f"Campo {idx+1} removido!", ephemeral=True)
@@ -369,17 +388,17 @@ class TicketConfigView(ui.View):
     @ui.button(label="Limpar Campos", style=discord.ButtonStyle.danger, row=4)
     async def clear_fields(self, interaction: discord.Interaction, _):
         self.config["embed"]["fields"] = []
-        self.bot.db.ticket_configs.update_one(
-            {"guild_id": self.guild_id},
-            {"$set": {"embed.fields": []}},
-            upsert=True
+        await self.bot.configs.update(
+            self.bot.db.ticket_configs,
+            self.guild_id,
+            {"$set": {"embed.fields": []}}
         )
         await self.update_preview()
         await interaction.response.send_message("Todos os campos foram removidos.", ephemeral=True)
 
     @ui.button(label="Resetar Tudo", style=discord.ButtonStyle.danger, row=4)
     async def reset(self, interaction: discord.Interaction, _):
-        self.bot.db.ticket_configs.delete_one({"guild_id": self.guild_id})
+        await self.bot.configs.delete(self.bot.db.ticket_configs, self.guild_id)
         self.config = {
             "staff_role": None,
             "category_id": None,
@@ -424,10 +443,10 @@ class SimpleEditModal(ui.Modal):
         if self.field in ["title", "description", "thumbnail", "image"]:
             embed_data = self.view.config.setdefault("embed", {})
             embed_data[self.field] = value if value else None
-            self.view.bot.db.ticket_configs.update_one(
-                {"guild_id": self.view.guild_id},
-                {"$set": {"embed": embed_data}},
-                upsert=True
+            await self.view.bot.configs.update(
+                self.view.bot.db.ticket_configs,
+                self.view.guild_id,
+                {"$set": {"embed": embed_data}}
             )
         elif self.field == "color":
             if value:
@@ -440,10 +459,10 @@ class SimpleEditModal(ui.Modal):
                 value = 0x00ff00
             embed_data = self.view.config.setdefault("embed", {})
             embed_data[self.field] = value
-            self.view.bot.db.ticket_configs.update_one(
-                {"guild_id": self.view.guild_id},
-                {"$set": {"embed": embed_data}},
-                upsert=True
+            await self.view.bot.configs.update(
+                self.view.bot.db.ticket_configs,
+                self.view.guild_id,
+                {"$set": {"embed": embed_data}}
             )
         else:
             try:
@@ -451,10 +470,10 @@ class SimpleEditModal(ui.Modal):
             except ValueError:
                 value = None
             self.view.config[self.field] = value
-            self.view.bot.db.ticket_configs.update_one(
-                {"guild_id": self.view.guild_id},
-                {"$set": {self.field: value}},
-                upsert=True
+            await self.view.bot.configs.update(
+                self.view.bot.db.ticket_configs,
+                self.view.guild_id,
+                {"$set": {self.field: value}}
             )
 
         await self.view.update_preview()
@@ -471,12 +490,13 @@ class Tickets(commands.Cog):
     async def ticketconfig(self, interaction: discord.Interaction):
         view = TicketConfigView(self.bot, interaction)
         await interaction.response.defer(ephemeral=True)
+        await view.load_config()
         await view.update_preview()
 
     @app_commands.command(name="ticketsetup", description="Envia o painel de tickets atual")
     @app_commands.default_permissions(administrator=True)
     async def ticketsetup(self, interaction: discord.Interaction):
-        config = self.bot.db.ticket_configs.find_one({"guild_id": interaction.guild_id}) or {}
+        config = await self.bot.configs.get(self.bot.db.ticket_configs, interaction.guild_id) or {}
         embed_config = config.get("embed", {
             "title": "Sistema de Tickets",
             "description": "Clique no botão abaixo para abrir um ticket!",
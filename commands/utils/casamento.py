@@ -2,10 +2,8 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 from discord.ui import Button, View
-import os
-from pymongo import MongoClient
-from pymongo.errors import ConnectionFailure
 import asyncio
+from core.members import get_or_fetch_member
 
 class ProposeView(View):
     def __init__(self, proposer, target, cog, message):
@@ -22,7 +20,7 @@ class ProposeView(View):
             return
         
         # Adiciona casamento
-        self.cog.add_marriage(self.proposer.id, self.target.id)
+        await self.cog.add_marriage(self.proposer.id, self.target.id)
         
         # Embed de anúncio
         embed = discord.Embed(
@@ -75,41 +73,25 @@ class ProposeView(View):
 class Casamento(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.mongo_uri = os.environ.get("MONGO_URI", "mongodb://localhost:27017/")
-        self.db_name = "discord_bot"  # Nome do banco
-        self.collection_name = "marriages"
-        self.client = None
-        self.collection = None
-        self.connect_mongo()
+        # Coleção do client compartilhado do bot (None = sem banco)
+        self.collection = bot.cogs_db.marriages if bot.cogs_db is not None else None
 
-    def connect_mongo(self):
-        try:
-            self.client = MongoClient(self.mongo_uri)
-            self.collection = self.client[self.db_name][self.collection_name]
-            # Testa conexão
-            self.client.admin.command('ping')
-            print("Conectado ao MongoDB com sucesso.")
-        except ConnectionFailure:
-            print("Erro ao conectar ao MongoDB. Usando valores padrão.")
-            self.client = None
-            self.collection = None
-
-    def get_marriage(self, user_id):
+    async def get_marriage(self, user_id):
         if self.collection is not None:
-            return self.collection.find_one({"$or": [{"user1": user_id}, {"user2": user_id}]})
+            return await self.collection.find_one({"$or": [{"user1": user_id}, {"user2": user_id}]})
         return None
 
-    def add_marriage(self, user1, user2):
+    async def add_marriage(self, user1, user2):
         if self.collection is not None:
-            self.collection.insert_one({"user1": user1, "user2": user2})
+            await self.collection.insert_one({"user1": user1, "user2": user2})
 
-    def remove_marriage(self, user_id):
+    async def remove_marriage(self, user_id):
         if self.collection is not None:
-            self.collection.delete_one({"$or": [{"user1": user_id}, {"user2": user_id}]})
+            await self.collection.delete_one({"$or": [{"user1": user_id}, {"user2": user_id}]})
 
-    def get_all_marriages(self):
+    async def get_all_marriages(self):
         if self.collection is not None:
-            return list(self.collection.find())
+            return await self.collection.find().to_list(length=None)
         return []
 
     @app_commands.command(name="casar", description="Casa-se com um usuário")
@@ -119,11 +101,11 @@ class Casamento(commands.Cog):
             await interaction.response.send_message("Você não pode se casar consigo mesmo.", ephemeral=True)
             return
         
-        if self.get_marriage(interaction.user.id):
+        if await self.get_marriage(interaction.user.id):
             await interaction.response.send_message("Você já está casado.", ephemeral=True)
             return
         
-        if self.get_marriage(user.id):
+        if await self.get_marriage(user.id):
             embed = discord.Embed(
                 title="Casamento Impossível 💔",
                 description=f"{user.mention} já é casado!",
@@ -146,16 +128,16 @@ class Casamento(commands.Cog):
 
     @app_commands.command(name="divorciar", description="Divorcia-se do parceiro atual")
     async def divorciar(self, interaction: discord.Interaction):
-        marriage = self.get_marriage(interaction.user.id)
+        marriage = await self.get_marriage(interaction.user.id)
         if not marriage:
             await interaction.response.send_message("Você não está casado.", ephemeral=True)
             return
         
         partner_id = marriage["user2"] if marriage["user1"] == interaction.user.id else marriage["user1"]
-        partner = interaction.guild.get_member(partner_id)
+        partner = await get_or_fetch_member(interaction.guild, partner_id)
         
         # Remove casamento
-        self.remove_marriage(interaction.user.id)
+        await self.remove_marriage(interaction.user.id)
         
         # Embed de anúncio
         embed = discord.Embed(
@@ -167,7 +149,7 @@ class Casamento(commands.Cog):
 
     @app_commands.command(name="casamentos", description="Lista todos os casamentos atuais")
     async def casamentos(self, interaction: discord.Interaction):
-        marriages = self.get_all_marriages()
+        marriages = await self.get_all_marriages()
         if not marriages:
             embed = discord.Embed(
                 title="Casamentos Atuais",
@@ -176,7 +158,7 @@ class Casamento(commands.Cog):
             )
         else:
             description = "\n".join(
-                f"{interaction.guild.get_member(m['user1']).mention if interaction.guild.get_member(m['user1']) else f'<@{m["user1"]}>'} 💕 {interaction.guild.get_member(m['user2']).mention if interaction.guild.get_member(m['user2']) else f'<@{m["user2"]}>'}"
+                f"<@{m['user1']}> 💕 <@{m['user2']}>"
                 for m in marriages
             )
             embed = discord.Embed(
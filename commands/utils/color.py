@@ -2,9 +2,6 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 from discord.ui import Select, Button, View, Modal, TextInput
-import os
-from pymongo import MongoClient
-from pymongo.errors import ConnectionFailure
 
 # Classes auxiliares movidas para fora da cog para persistência
 class CorSelect(Select):
@@ -59,31 +56,18 @@ class PainelCores(View):
 class Color(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.mongo_uri = os.environ.get("MONGO_URI", "mongodb://localhost:27017/")
-        self.db_name = "discord_bot"  # Nome do banco
-        self.collection_name = "color_config"
-        self.client = None
-        self.collection = None
-        self.connect_mongo()
-        self.load_config()  # Carrega configurações do MongoDB
+        # Coleção do client compartilhado do bot (None = sem banco, usa valores padrão)
+        self.collection = bot.cogs_db.color_config if bot.cogs_db is not None else None
+        self.set_defaults()
+
+    async def cog_load(self):
+        await self.load_config()  # Carrega configurações do MongoDB
         # Adiciona views persistentes para sobreviver a reinicializações
         self.bot.add_view(PainelCores(self))
 
-    def connect_mongo(self):
-        try:
-            self.client = MongoClient(self.mongo_uri)
-            self.collection = self.client[self.db_name][self.collection_name]
-            # Testa conexão
-            self.client.admin.command('ping')
-            print("Conectado ao MongoDB com sucesso.")
-        except ConnectionFailure:
-            print("Erro ao conectar ao MongoDB. Usando valores padrão.")
-            self.client = None
-            self.collection = None
-
-    def load_config(self):
+    async def load_config(self):
         if self.collection is not None:
-            doc = self.collection.find_one({"_id": "config"})
+            doc = await self.collection.find_one({"_id": "config"})
             if doc:
                 self.tipo_cores = doc.get("tipo_cores", 'all')
                 self.embed_title = doc.get("embed_title", "Painel de Cores")
@@ -106,7 +90,7 @@ class Color(commands.Cog):
         self.embed_thumbnail = None
         self.embed_image = None
 
-    def save_config(self):
+    async def save_config(self):
         if self.collection is not None:
             data = {
                 "_id": "config",
@@ -118,7 +102,7 @@ class Color(commands.Cog):
                 "embed_thumbnail": self.embed_thumbnail,
                 "embed_image": self.embed_image
             }
-            self.collection.replace_one({"_id": "config"}, data, upsert=True)
+            await self.collection.replace_one({"_id": "config"}, data, upsert=True)
 
     # Dicionários de cores: nome -> cor hex
     cores_normais = {
@@ -217,7 +201,7 @@ class Color(commands.Cog):
             else:
                 setattr(self.cog, f"embed_{self.field}", value)
             
-            self.cog.save_config()  # Salva configurações no MongoDB após alteração
+            await self.cog.save_config()  # Salva configurações no MongoDB após alteração
             
             # Tenta atualizar o embed preview na resposta original ephemeral
             try:
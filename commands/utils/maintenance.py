@@ -9,8 +9,11 @@ OWNER_ID = 123456789012345678  # ← COLOQUE SEU ID AQUI
 class Maintenance(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.maintenance_mode = False
+
+    async def cog_load(self):
         # Carrega o estado do banco (ou False se não existir)
-        doc = self.bot.db.configs.find_one({"key": "maintenance_mode"})
+        doc = await self.bot.db.configs.find_one({"key": "maintenance_mode"})
         self.maintenance_mode = doc["value"] if doc else False
 
     async def cog_check(self, interaction: discord.Interaction) -> bool:
@@ -22,7 +25,7 @@ class Maintenance(commands.Cog):
         self.maintenance_mode = ativar
 
         # Salva no banco
-        self.bot.db.configs.update_one(
+        await self.bot.db.configs.update_one(
             {"key": "maintenance_mode"},
             {"$set": {"value": ativar}},
             upsert=True
@@ -1,23 +1,26 @@
 import discord
 from discord.ext import commands
 
+from core.pipeline import MessageContext
+
 class AutoResponseCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
-    @commands.Cog.listener()
-    async def on_message(self, message):
-        if message.author.bot or not message.guild:
-            return
+    async def cog_load(self):
+        self.bot.pipeline.register("autoresponse", self.process_message)
+
+    async def cog_unload(self):
+        self.bot.pipeline.unregister("autoresponse")
 
-        guild_id = message.guild.id
-        config = self.bot.db.guild_configs.find_one({"guild_id": guild_id}) or {}
+    # Etapa "autoresponse" do pipeline de mensagens (core/pipeline.py)
+    async def process_message(self, ctx: MessageContext):
+        config = await ctx.guild_config() or {}
         responses = config.get("auto_responses", {})  # ex: {"oi": "Olá!", "tchau": "Até mais!"}
 
-        content_lower = message.content.lower()
         for trigger, reply in responses.items():
-            if trigger in content_lower:
-                await message.channel.send(reply)
+            if trigger in ctx.content_lower:
+                await ctx.message.channel.send(reply)
                 break  # responde só uma vez por mensagem
 
 async def setup(bot):
@@ -11,7 +11,7 @@ class GoodbyeView(ui.View):
 
     async def send_goodbye(self, member: discord.Member):
         guild_id = member.guild.id
-        config = self.bot.db.goodbye_configs.find_one({"guild_id": guild_id})
+        config = await self.bot.configs.get(self.bot.db.goodbye_configs, guild_id)
         if not config or not config.get("enabled", True):
             return
 
@@ -84,7 +84,11 @@ class GoodbyeConfigView(ui.View):
         self.bot = bot
         self.interaction = interaction
         self.guild_id = interaction.guild_id
-        self.config = self.bot.db.goodbye_configs.find_one({"guild_id": self.guild_id}) or {
+        self.config = None
+        self.preview_message = None
+
+    async def load_config(self):
+        self.config = await self.bot.configs.get(self.bot.db.goodbye_configs, self.guild_id) or {
             "enabled": True,
             "channel_id": None,
             "embed": {
@@ -97,7 +101,6 @@ class GoodbyeConfigView(ui.View):
                 "fields": []
             }
         }
-        self.preview_message = None
 
     def replace_vars(self, text: str, user: discord.User, guild: discord.Guild) -> str:
         if not text:
@@ -227,17 +230,17 @@ class GoodbyeConfigView(ui.View):
     @ui.button(label="Ativar/Desativar", style=discord.ButtonStyle.secondary, row=4)
     async def toggle_enabled(self, interaction: discord.Interaction, _):
         self.config["enabled"] = not self.config.get("enabled", True)
-        self.bot.db.goodbye_configs.update_one(
-            {"guild_id": self.guild_id},
-            {"$set": {"enabled": self.config["enabled"]}},
-            upsert=True
+        await self.bot.configs.update(
+            self.bot.db.goodbye_configs,
+            self.guild_id,
+            {"$set": {"enabled": self.config["enabled"]}}
         )
         await self.update_preview()
         await interaction.response.send_message(f"Sistema de goodbye agora está **{'ativado' if self.config['enabled'] else 'desativado'}**.", ephemeral=True)
 
     @ui.button(label="Resetar Tudo", style=discord.ButtonStyle.danger, row=4)
     async def reset(self, interaction: discord.Interaction, _):
-        self.bot.db.goodbye_configs.delete_one({"guild_id": self.guild_id})
+        await self.bot.configs.delete(self.bot.db.goodbye_configs, self.guild_id)
         self.config = {
             "enabled": True,
             "channel_id": None,
@@ -282,10 +285,10 @@ class SimpleEditModal(ui.Modal):
         if self.field in ["title", "description", "thumbnail", "image", "footer"]:
             embed_data = self.view.config.setdefault("embed", {})
             embed_data[self.field] = value if value else None
-            self.view.bot.db.goodbye_configs.update_one(
-                {"guild_id": self.view.guild_id},
-                {"$set": {"embed": embed_data}},
-                upsert=True
+            await self.view.bot.configs.update(
+                self.view.bot.db.goodbye_configs,
+                self.view.guild_id,
+                {"$set": {"embed": embed_data}}
             )
         elif self.field == "color":
             if value:
@@ -298,10 +301,10 @@ class SimpleEditModal(ui.Modal):
                 value = 0xff5555
             embed_data = self.view.config.setdefault("embed", {})
             embed_data[self.field] = value
-            self.view.bot.db.goodbye_configs.update_one(
-                {"guild_id": self.view.guild_id},
-                {"$set": {"embed": embed_data}},
-                upsert=True
+            await self.view.bot.configs.update(
+                self.view.bot.db.goodbye_configs,
+                self.view.guild_id,
+                {"$set": {"embed": embed_data}}
             )
         else:
             try:
@@ -309,10 +312,10 @@ class SimpleEditModal(ui.Modal):
             except ValueError:
                 value = None
             self.view.config[self.field] = value
-            self.view.bot.db.goodbye_configs.update_one(
-                {"guild_id": self.view.guild_id},
-                {"$set": {self.field: value}},
-                upsert=True
+            await self.view.bot.configs.update(
+                self.view.bot.db.goodbye_configs,
+                self.view.guild_id,
+                {"$set": {self.field: value}}
             )
 
         await self.view.update_preview()
@@ -343,10 +346,10 @@ class FieldEditModal(ui.Modal, title="Editar Campo Extra"):
         field["value"] = self.value.value
         field["inline"] = self.inline.value.lower() in ["sim", "s", "yes", "y", "true"]
 
-        self.view.bot.db.goodbye_configs.update_one(
-            {"guild_id": self.view.guild_id},
-            {"$set": {"embed.fields": fields}},
-            upsert=True
+        await self.view.bot.configs.update(
+            self.view.bot.db.goodbye_configs,
+            self.view.guild_id,
+            {"$set": {"embed.fields": fields}}
         )
 
         await self.view.update_preview()
@@ -366,12 +369,13 @@ class Goodbye(commands.Cog):
     async def goodbyeconfig(self, interaction: discord.Interaction):
         view = GoodbyeConfigView(self.bot, interaction)
         await interaction.response.defer(ephemeral=True)
+        await view.load_config()
         await view.update_preview()
 
     @app_commands.command(name="goodbyesendtest", description="[Admin] Envia um teste da mensagem de despedida atual")
     @app_commands.default_permissions(administrator=True)
     async def goodbyesendtest(self, interaction: discord.Interaction):
-        config = self.bot.db.goodbye_configs.find_one({"guild_id": interaction.guild_id})
+        config = await self.bot.configs.get(self.bot.db.goodbye_configs, interaction.guild_id)
         if not config:
             return await interaction.response.send_message("Configure primeiro com /goodbyeconfig", ephemeral=True)
 
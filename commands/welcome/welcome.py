@@ -4,6 +4,8 @@ from discord.ext import commands
 import datetime
 import logging
 
+from core.logging_setup import bind_log_context
+
 logger = logging.getLogger(__name__)
 
 class WelcomeView(ui.View):
@@ -12,23 +14,23 @@ class WelcomeView(ui.View):
         self.bot = bot
 
     async def send_welcome(self, member: discord.Member):
-        logger.info(f"[DEBUG] Iniciando send_welcome para {member}...")
-        config = self.bot.db.welcome_configs.find_one({"guild_id": member.guild.id})
+        logger.debug("Iniciando send_welcome para %s...", member)
+        config = await self.bot.configs.get(self.bot.db.welcome_configs, member.guild.id)
         if not config:
-            logger.info("[DEBUG] Nenhuma configuração encontrada no DB.")
+            logger.debug("Nenhuma configuração de welcome para o servidor %s.", member.guild.id)
             return
         if not config.get("enabled", True):
-            logger.info("[DEBUG] Sistema de welcome desativado.")
+            logger.debug("Sistema de welcome desativado.")
             return
         channel_id = config.get("channel_id")
         if not channel_id:
-            logger.info("[DEBUG] Canal não definido na configuração.")
+            logger.debug("Canal não definido na configuração.")
             return
         channel = member.guild.get_channel(channel_id)
         if not channel:
-            logger.info("[DEBUG] Canal não encontrado (ID inválido ou bot sem acesso).")
+            logger.debug("Canal não encontrado (ID inválido ou bot sem acesso).")
             return
-        logger.info(f"[DEBUG] Canal encontrado: {channel} (ID: {channel.id}). Tentando enviar embed...")
+        logger.debug("Canal encontrado: %s (ID: %s). Tentando enviar embed...", channel, channel.id)
 
         embed_config = config.get("embed", {
             "title": "Bem-vindo(a) ao {server}!",
@@ -90,9 +92,9 @@ class WelcomeView(ui.View):
 
         try:
             await channel.send(embed=embed)
-            logger.info("[DEBUG] Mensagem de welcome enviada com sucesso!")
+            logger.debug("Mensagem de welcome enviada com sucesso!")
         except Exception as e:
-            logger.error(f"[DEBUG] Erro ao enviar mensagem: {e}")
+            logger.warning("Erro ao enviar mensagem de welcome: %s", e)
 
 
 class WelcomeConfigView(ui.View):
@@ -101,7 +103,11 @@ class WelcomeConfigView(ui.View):
         self.bot = bot
         self.interaction = interaction
         self.guild_id = interaction.guild_id
-        self.config = self.bot.db.welcome_configs.find_one({"guild_id": self.guild_id}) or {
+        self.config = None
+        self.preview_message = None
+
+    async def load_config(self):
+        self.config = await self.bot.configs.get(self.bot.db.welcome_configs, self.guild_id) or {
             "enabled": True,
             "channel_id": None,
             "embed": {
@@ -114,7 +120,6 @@ class WelcomeConfigView(ui.View):
                 "fields": []
             }
         }
-        self.preview_message = None
 
     async def update_preview(self):
         embed = discord.Embed(
@@ -258,17 +263,17 @@ class WelcomeConfigView(ui.View):
     @ui.button(label="Ativar/Desativar", style=discord.ButtonStyle.secondary, row=4)
     async def toggle_enabled(self, interaction: discord.Interaction, _):
         self.config["enabled"] = not self.config.get("enabled", True)
-        self.bot.db.welcome_configs.update_one(
-            {"guild_id": self.guild_id},
-            {"$set": {"enabled": self.config["enabled"]}},
-            upsert=True
+        await self.bot.configs.update(
+            self.bot.db.welcome_configs,
+            self.guild_id,
+            {"$set": {"enabled": self.config["enabled"]}}
         )
         await self.update_preview()
         await interaction.response.send_message(f"Sistema de welcome agora está **{'ativado' if self.config['enabled'] else 'desativado'}**.", ephemeral=True)
 
     @ui.button(label="Resetar Tudo", style=discord.ButtonStyle.danger, row=4)
     async def reset(self, interaction: discord.Interaction, _):
-        self.bot.db.welcome_configs.delete_one({"guild_id": self.guild_id})
+        await self.bot.configs.delete(self.bot.db.welcome_configs, self.guild_id)
         self.config = {
             "enabled": True,
             "channel_id": None,
@@ -313,10 +318,10 @@ class SimpleEditModal(ui.Modal):
         if self.field in ["title", "description", "thumbnail", "image", "footer"]:
             embed_data = self.view.config.setdefault("embed", {})
             embed_data[self.field] = value if value else None
-            self.view.bot.db.welcome_configs.update_one(
-                {"guild_id": self.view.guild_id},
-                {"$set": {"embed": embed_data}},
-                upsert=True
+            await self.view.bot.configs.update(
+                self.view.bot.db.welcome_configs,
+                self.view.guild_id,
+                {"$set": {"embed": embed_data}}
             )
         elif self.field == "color":
             if value:
@@ -329,10 +334,10 @@ class SimpleEditModal(ui.Modal):
                 value = 0x00ff88
             embed_data = self.view.config.setdefault("embed", {})
             embed_data[self.field] = value
-            self.view.bot.db.welcome_configs.update_one(
-                {"guild_id": self.view.guild_id},
-                {"$set": {"embed": embed_data}},
-                upsert=True
+            await self.view.bot.configs.update(
+                self.view.bot.db.welcome_configs,
+                self.view.guild_id,
+                {"$set": {"embed": embed_data}}
             )
         else:
             try:
@@ -340,10 +345,10 @@ class SimpleEditModal(ui.Modal):
             except ValueError:
                 value = None
             self.view.config[self.field] = value
-            self.view.bot.db.welcome_configs.update_one(
-                {"guild_id": self.view.guild_id},
-                {"$set": {self.field: value}},
-                upsert=True
+            await self.view.bot.configs.update(
+                self.view.bot.db.welcome_configs,
+                self.view.guild_id,
+                {"$set": {self.field: value}}
             )
 
         await self.view.update_preview()
@@ -374,10 +379,10 @@ class FieldEditModal(ui.Modal, title="Editar Campo Extra"):
         field["value"] = self.value.value
         field["inline"] = self.inline.value.lower() in ["sim", "s", "yes", "y", "true"]
 
-        self.view.bot.db.welcome_configs.update_one(
-            {"guild_id": self.view.guild_id},
-            {"$set": {"embed.fields": fields}},
-            upsert=True
+        await self.view.bot.configs.update(
+            self.view.bot.db.welcome_configs,
+            self.view.guild_id,
+            {"$set": {"embed.fields": fields}}
         )
 
         await self.view.update_preview()
@@ -389,7 +394,8 @@ class Welcome(commands.Cog):
 
     @commands.Cog.listener()
     async def on_member_join(self, member: discord.Member):
-        logger.info(f"[DEBUG] on_member_join disparado para {member} (ID: {member.id}) em {member.guild.name} (Guild ID: {member.guild.id})")
+        bind_log_context(guild_id=member.guild.id, user_id=member.id, cog="welcome")
+        logger.debug("on_member_join disparado para %s (ID: %s) em %s", member, member.id, member.guild.name)
         await WelcomeView(self.bot).send_welcome(member)
 
     @app_commands.command(name="welcomeconfig", description="[Admin] Configura a mensagem de boas-vindas com preview ao vivo")
@@ -397,12 +403,13 @@ class Welcome(commands.Cog):
     async def welcomeconfig(self, interaction: discord.Interaction):
         view = WelcomeConfigView(self.bot, interaction)
         await interaction.response.defer(ephemeral=True)
+        await view.load_config()
         await view.update_preview()
 
     @app_commands.command(name="welcomesendtest", description="[Admin] Envia um teste da mensagem de boas-vindas atual")
     @app_commands.default_permissions(administrator=True)
     async def welcomesendtest(self, interaction: discord.Interaction):
-        config = self.bot.db.welcome_configs.find_one({"guild_id": interaction.guild_id})
+        config = await self.bot.configs.get(self.bot.db.welcome_configs, interaction.guild_id)
         if not config:
             return await interaction.response.send_message("Configure primeiro com /welcomeconfig", ephemeral=True)
 
@@ -0,0 +1,208 @@
+# core/cache.py
+"""
+Cache em memória das configurações por servidor.
+
+As coleções de config (guild_configs, automod_configs, welcome_configs...)
+são lidas a cada mensagem/entrada de membro, mas quase nunca mudam. Aqui
+elas ficam em um cache LRU com TTL:
+
+- leitura: `await bot.configs.get(bot.db.guild_configs, guild_id)`
+- escrita (write-through): `replace` / `update` / `insert` / `delete`
+  gravam no Mongo e já atualizam o cache
+- outra instância gravou? o change stream do Mongo invalida a entrada
+
+Documentos inexistentes também ficam em cache (como None), porque a
+maioria dos servidores nunca configura nada.
+"""
+import os
+import copy
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CACHE_TTL = float(os.getenv("CONFIG_CACHE_TTL", 300))
+CACHE_SIZE = int(os.getenv("CONFIG_CACHE_SIZE", 5000))
+
+# Coleções observadas pelo change stream
+CACHED_COLLECTIONS = {
+    "guild_configs",
+    "automod_configs",
+    "security_configs",
+    "welcome_configs",
+    "goodbye_configs",
+    "ticket_configs",
+    "moderation_configs",
+    "moderation_embed_configs",
+    "lockdown_configs",
+}
+
+_MISSING = object()
+
+
+class ConfigCache:
+    def __init__(self, max_entries: int = CACHE_SIZE, ttl: float = CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # (banco, coleção, chave) → (expira_em, documento ou None)
+        self._entries: "OrderedDict[Tuple[str, str, Any], Tuple[float, Optional[dict]]]" = OrderedDict()
+        # (banco, coleção, _id) → chave, para invalidar a partir do change stream
+        self._ids: Dict[Tuple[str, str, Any], Any] = {}
+        self._watchers = []
+        self.hits = 0
+        self.misses = 0
+
+    # ────────────────────────────────────────────────
+    # Infra interna (LRU + TTL)
+    # ────────────────────────────────────────────────
+
+    @staticmethod
+    def _ns(collection) -> Tuple[str, str]:
+        return collection.database.name, collection.name
+
+    def _lookup(self, entry_key):
+        entry = self._entries.get(entry_key)
+        if entry is None:
+            return _MISSING
+        expires_at, doc = entry
+        if expires_at < time.monotonic():
+            self._drop(entry_key)
+            return _MISSING
+        self._entries.move_to_end(entry_key)
+        return doc
+
+    def _store(self, entry_key, doc: Optional[dict]):
+        self._drop(entry_key)
+        self._entries[entry_key] = (time.monotonic() + self.ttl, doc)
+        self._entries.move_to_end(entry_key)
+        if doc is not None and "_id" in doc:
+            self._ids[(entry_key[0], entry_key[1], doc["_id"])] = entry_key[2]
+        while len(self._entries) > self.max_entries:
+            oldest, _ = next(iter(self._entries.items()))
+            self._drop(oldest)
+
+    def _drop(self, entry_key):
+        entry = self._entries.pop(entry_key, None)
+        if entry and entry[1] is not None and "_id" in entry[1]:
+            self._ids.pop((entry_key[0], entry_key[1], entry[1]["_id"]), None)
+
+    # ────────────────────────────────────────────────
+    # API usada pelos cogs
+    # ────────────────────────────────────────────────
+
+    async def get(self, collection, key, field: str = "guild_id", copy_doc: bool = True) -> Optional[dict]:
+        """
+        Retorna o documento `{field: key}` (ou None).
+        Por padrão devolve uma cópia, para que o chamador possa alterar à vontade;
+        leituras no caminho quente podem passar `copy_doc=False` e não mexer no dict.
+        """
+        entry_key = (*self._ns(collection), key)
+        doc = self._lookup(entry_key)
+        if doc is _MISSING:
+            self.misses += 1
+            doc = await collection.find_one({field: key})
+            self._store(entry_key, doc)
+        else:
+            self.hits += 1
+        return copy.deepcopy(doc) if copy_doc and doc is not None else doc
+
+    async def replace(self, collection, key, doc: dict, field: str = "guild_id"):
+        result = await collection.replace_one({field: key}, doc, upsert=True)
+        if "_id" not in doc and result.upserted_id is not None:
+            doc = {**doc, "_id": result.upserted_id}
+        self._store((*self._ns(collection), key), copy.deepcopy(doc))
+        return result
+
+    async def insert(self, collection, key, doc: dict):
+        result = await collection.insert_one(doc)
+        self._store((*self._ns(collection), key), copy.deepcopy(doc))
+        return result
+
+    async def update(self, collection, key, update: dict, field: str = "guild_id") -> Optional[dict]:
+        # return_document=True é o ReturnDocument.AFTER (sem importar o pymongo — vale para o SQLite também)
+        doc = await collection.find_one_and_update({field: key}, update, upsert=True, return_document=True)
+        self._store((*self._ns(collection), key), doc)
+        return copy.deepcopy(doc)
+
+    async def delete(self, collection, key, field: str = "guild_id"):
+        result = await collection.delete_one({field: key})
+        self._store((*self._ns(collection), key), None)
+        return result
+
+    def invalidate(self, collection, key):
+        self._drop((*self._ns(collection), key))
+
+    def clear(self):
+        self._entries.clear()
+        self._ids.clear()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / total) if total else 0.0,
+        }
+
+    # ────────────────────────────────────────────────
+    # Invalidação via change stream
+    # ────────────────────────────────────────────────
+
+    def start_watching(self, *databases):
+        """Inicia um change stream por banco (precisa de replica set, ex: Atlas)."""
+        for database in databases:
+            if database is None:
+                continue
+            self._watchers.append(asyncio.create_task(self._watch(database)))
+
+    def stop_watching(self):
+        for task in self._watchers:
+            task.cancel()
+        self._watchers.clear()
+
+    async def _watch(self, database):
+        # Só roda com banco configurado; o import fica aqui para não carregar o pymongo sem ele
+        from pymongo.errors import OperationFailure, PyMongoError
+
+        pipeline = [{"$match": {"ns.coll": {"$in": sorted(CACHED_COLLECTIONS)}}}]
+        retry = 1
+        while True:
+            try:
+                async with database.watch(pipeline) as stream:
+                    logger.info(f"Cache de configs: change stream ativo em '{database.name}'")
+                    retry = 1
+                    async for change in stream:
+                        self._apply_change(change)
+            except asyncio.CancelledError:
+                raise
+            except OperationFailure as e:
+                # Servidor standalone não suporta change streams → fica só com o TTL
+                logger.warning(f"Cache de configs: change stream indisponível em '{database.name}' ({e}). Usando só o TTL.")
+                return
+            except PyMongoError as e:
+                logger.warning(f"Cache de configs: change stream caiu em '{database.name}' ({e}). Reconectando em {retry}s...")
+
+            # Eventos podem ter sido perdidos enquanto o stream estava fora
+            self.clear()
+            await asyncio.sleep(retry)
+            retry = min(retry * 2, 60)
+
+    def _apply_change(self, change: dict):
+        ns = change.get("ns", {})
+        db_name, coll_name = ns.get("db"), ns.get("coll")
+        doc_id = change.get("documentKey", {}).get("_id")
+
+        key = self._ids.get((db_name, coll_name, doc_id))
+        if key is not None:
+            self._drop((db_name, coll_name, key))
+
+        # Inserts/replaces trazem o documento: invalida também entradas "None" em cache
+        full = change.get("fullDocument")
+        if full:
+            for field in ("guild_id", "_id"):
+                if field in full:
+                    self._drop((db_name, coll_name, full[field]))
@@ -0,0 +1,98 @@
+# core/commandsync.py
+"""
+Sincronização dos slash commands só quando algo mudou.
+
+`tree.sync()` global é lento e tem rate limit apertado; rodar a cada boot
+(crash loop, restart de deploy) só gasta esse limite. Aqui a árvore de
+comandos é serializada exatamente como seria enviada ao Discord, vira um
+sha256 e fica salva em `configs` ({"key": "command_tree_hash"}). Se o hash
+do boot atual for igual ao salvo, o sync é pulado.
+
+Variáveis (.env):
+    FORCE_SYNC=1          → sincroniza mesmo sem mudanças
+    DEV_GUILD_IDS=1,2     → copia os comandos para esses servidores e sincroniza
+                            só neles (instantâneo, para desenvolvimento)
+"""
+import os
+import json
+import hashlib
+import logging
+import datetime
+from typing import List, Optional
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+HASH_KEY = "command_tree_hash"
+
+
+def _flag(name: str) -> bool:
+    return os.getenv(name, "").strip().lower() in ("1", "true", "yes", "sim")
+
+
+def dev_guild_ids() -> List[int]:
+    return [int(g) for g in os.getenv("DEV_GUILD_IDS", "").replace(" ", "").split(",") if g]
+
+
+def tree_fingerprint(tree: discord.app_commands.CommandTree, guild: Optional[discord.abc.Snowflake] = None) -> str:
+    """sha256 do payload que o `tree.sync()` enviaria (ordem estável)."""
+    payload = sorted(
+        (command.to_dict(tree) for command in tree.get_commands(guild=guild)),
+        key=lambda c: (c.get("type", 1), c["name"]),
+    )
+    raw = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+async def _stored_hash(bot, scope: str) -> Optional[str]:
+    doc = await bot.db.configs.find_one({"key": HASH_KEY, "application_id": bot.application_id, "scope": scope})
+    return doc["value"] if doc else None
+
+
+async def _save_hash(bot, scope: str, value: str):
+    await bot.db.configs.update_one(
+        {"key": HASH_KEY, "application_id": bot.application_id, "scope": scope},
+        {"$set": {"value": value, "synced_at": datetime.datetime.utcnow()}},
+        upsert=True,
+    )
+
+
+async def _sync_scope(bot, scope: str, guild: Optional[discord.Object], force: bool):
+    fingerprint = tree_fingerprint(bot.tree, guild=guild)
+    label = "global" if guild is None else f"servidor {guild.id}"
+
+    stored = None
+    if bot.db is not None and not force:
+        try:
+            stored = await _stored_hash(bot, scope)
+        except Exception as e:
+            logger.warning(f"Não foi possível ler o hash dos comandos ({e}) — sincronizando")
+
+    if stored == fingerprint:
+        logger.info(f"Comandos slash ({label}) sem mudanças (hash {fingerprint[:12]}) — sync pulado")
+        return
+
+    synced = await bot.tree.sync(guild=guild)
+    logger.info(f"Comandos slash sincronizados ({label}): {len(synced)} comandos (hash {fingerprint[:12]})")
+
+    if bot.db is not None:
+        try:
+            await _save_hash(bot, scope, fingerprint)
+        except Exception as e:
+            logger.warning(f"Não foi possível salvar o hash dos comandos: {e}")
+
+
+async def sync_commands(bot):
+    force = _flag("FORCE_SYNC")
+    guild_ids = dev_guild_ids()
+
+    if guild_ids:
+        # Modo desenvolvimento: só nos servidores de teste (o global fica como está)
+        for guild_id in guild_ids:
+            guild = discord.Object(id=guild_id)
+            bot.tree.copy_global_to(guild=guild)
+            await _sync_scope(bot, f"guild:{guild_id}", guild, force)
+        return
+
+    await _sync_scope(bot, "global", None, force)
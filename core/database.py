@@ -0,0 +1,254 @@
+# core/database.py
+"""
+Camada de acesso assíncrona ao banco: MongoDB (motor) ou SQLite local.
+
+Os cogs usam `self.bot.db.<coleção>` exatamente como antes, mas todas as
+operações agora são corrotinas e precisam de `await` — nenhuma chamada
+fica bloqueando o event loop esperando a resposta do banco.
+
+Existe um único client por processo, criado pelo `MyBot`. Os bancos
+(`bot.db` e `bot.cogs_db`) são só visões sobre esse client, então todos
+os cogs compartilham o mesmo pool de conexões.
+
+Backend (STORAGE_BACKEND):
+    mongo  → AsyncIOMotorClient(MONGO_URI) — padrão quando MONGO_URI existe
+    sqlite → core/sqlite_store.py, arquivo SQLITE_PATH (padrão data/bot.db) —
+             padrão sem MONGO_URI; mesma interface, sem rede
+"""
+import os
+import time
+import logging
+
+from typing import TYPE_CHECKING, Optional
+
+from core import metrics
+from core.dbprofile import PROFILER, calling_module, document_size
+
+if TYPE_CHECKING:
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+logger = logging.getLogger(__name__)
+
+# ────────────────────────────────────────────────
+# Configuração do pool (todas opcionais, via .env)
+# ────────────────────────────────────────────────
+# DATABASE_NAME       → banco principal (levels, economy, configs por servidor...)
+# COGS_DATABASE_NAME  → banco usado historicamente pelos painéis, automod e segurança
+DB_NAME = os.getenv("DATABASE_NAME", "discordbot")
+COGS_DB_NAME = os.getenv("COGS_DATABASE_NAME", "discord_bot")
+SQLITE_PATH = os.getenv("SQLITE_PATH", os.path.join("data", "bot.db"))
+
+POOL_OPTIONS = {
+    "maxPoolSize": int(os.getenv("MONGO_MAX_POOL_SIZE", 20)),
+    "minPoolSize": int(os.getenv("MONGO_MIN_POOL_SIZE", 0)),
+    "maxIdleTimeMS": int(os.getenv("MONGO_MAX_IDLE_MS", 60_000)),
+    "serverSelectionTimeoutMS": int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", 5_000)),
+    "connectTimeoutMS": int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", 5_000)),
+    "socketTimeoutMS": int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", 10_000)),
+    "appname": os.getenv("MONGO_APP_NAME", "discord-bot"),
+}
+
+
+def create_client(uri: str) -> "AsyncIOMotorClient":
+    """Cria o client compartilhado. O motor só abre conexões na primeira operação."""
+    logger.info(
+        f"MongoDB: pool max={POOL_OPTIONS['maxPoolSize']} min={POOL_OPTIONS['minPoolSize']} "
+        f"timeout={POOL_OPTIONS['serverSelectionTimeoutMS']}ms"
+    )
+    # Import tardio: sem MONGO_URI o processo nem carrega motor/pymongo (~0,1s de import)
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    return AsyncIOMotorClient(uri, **POOL_OPTIONS)
+
+
+def storage_backend(mongo_uri: Optional[str]) -> str:
+    backend = os.getenv("STORAGE_BACKEND", "").strip().lower()
+    if backend in ("mongo", "sqlite"):
+        return backend
+    return "mongo" if mongo_uri else "sqlite"
+
+
+def create_storage_client(mongo_uri: Optional[str]):
+    """Client do backend configurado (ver docstring do módulo)."""
+    if storage_backend(mongo_uri) == "mongo":
+        if not mongo_uri:
+            raise RuntimeError("STORAGE_BACKEND=mongo exige MONGO_URI")
+        return create_client(mongo_uri)
+    from core.sqlite_store import SQLiteClient
+
+    logger.info(f"Banco local SQLite: {SQLITE_PATH}")
+    return SQLiteClient(SQLITE_PATH)
+
+
+# ────────────────────────────────────────────────
+# Coleções instrumentadas (métricas por coleção/operação)
+# ────────────────────────────────────────────────
+_ASYNC_OPS = {
+    "find_one", "insert_one", "insert_many", "replace_one", "update_one", "update_many",
+    "delete_one", "delete_many", "find_one_and_update", "find_one_and_replace",
+    "find_one_and_delete", "count_documents", "estimated_document_count", "distinct",
+    "bulk_write", "create_index", "drop",
+}
+_CURSOR_OPS = {"find", "aggregate"}
+
+
+def _record(collection: str, op: str, elapsed: float, failed: bool = False):
+    metrics.MONGO_OPS.inc(collection=collection, op=op)
+    metrics.MONGO_LATENCY.observe(elapsed, collection=collection, op=op)
+    if failed:
+        metrics.MONGO_ERRORS.inc(collection=collection, op=op)
+
+
+def _op_size(op: str, args: tuple, kwargs: dict, result) -> int:
+    """Bytes gravados (insert/replace/update) ou lidos (find_one*)."""
+    if op in ("insert_one", "insert_many"):
+        return document_size(args[0] if args else kwargs.get("document", kwargs.get("documents")))
+    if op in ("replace_one", "update_one", "update_many"):
+        return document_size(args[1] if len(args) > 1 else kwargs.get("replacement", kwargs.get("update")))
+    if op.startswith("find_one"):
+        return document_size(result)
+    return 0
+
+
+class Cursor:
+    """Cursor do motor; mede o tempo gasto buscando resultados (`to_list` / `async for`)."""
+
+    def __init__(self, cursor, collection: str, op: str, query=None, cog: str = None):
+        self._cursor = cursor
+        self._collection = collection
+        self._op = op
+        self._query = query
+        self._cog = cog
+
+    def _done(self, elapsed: float, failed: bool, size: int):
+        _record(self._collection, self._op, elapsed, failed)
+        if PROFILER is not None:
+            PROFILER.record(self._collection, self._op, self._query, self._cog, elapsed, size, failed)
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._cursor, name)
+        if not callable(attr):
+            return attr
+
+        def chain(*args, **kwargs):
+            # sort/limit/skip devolvem o próprio cursor → mantém o wrapper
+            result = attr(*args, **kwargs)
+            return self if result is self._cursor else result
+        return chain
+
+    async def to_list(self, length=None):
+        start = time.perf_counter()
+        failed = False
+        docs = None
+        try:
+            docs = await self._cursor.to_list(length=length)
+            return docs
+        except Exception:
+            failed = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            self._done(elapsed, failed, document_size(docs) if PROFILER is not None else 0)
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        iterator = self._cursor.__aiter__()
+        elapsed = 0.0
+        failed = False
+        size = 0
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    doc = await iterator.__anext__()
+                except StopAsyncIteration:
+                    break
+                except Exception:
+                    failed = True
+                    raise
+                finally:
+                    elapsed += time.perf_counter() - start
+                if PROFILER is not None:
+                    size += document_size(doc)
+                yield doc
+        finally:
+            self._done(elapsed, failed, size)
+
+
+class Collection:
+    """Coleção do motor com métricas; a API é a mesma (`await col.find_one(...)`)."""
+
+    def __init__(self, collection):
+        self._collection = collection
+        self.name = collection.name
+        self.database = collection.database
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._collection, name)
+        if name in _ASYNC_OPS:
+            return self._timed(name, attr)
+        if name in _CURSOR_OPS:
+            def cursor(*args, **kwargs):
+                query = args[0] if args else kwargs.get("filter", kwargs.get("pipeline"))
+                cog = calling_module() if PROFILER is not None else None
+                return Cursor(attr(*args, **kwargs), self.name, name, query, cog)
+            return cursor
+        return attr
+
+    def _timed(self, op: str, method):
+        async def call(*args, **kwargs):
+            cog = calling_module() if PROFILER is not None else None
+            start = time.perf_counter()
+            failed = False
+            result = None
+            try:
+                result = await method(*args, **kwargs)
+                return result
+            except Exception:
+                failed = True
+                raise
+            finally:
+                elapsed = time.perf_counter() - start
+                _record(self.name, op, elapsed, failed)
+                if PROFILER is not None:
+                    query = args[0] if args else kwargs.get("filter")
+                    PROFILER.record(self.name, op, query, cog, elapsed, _op_size(op, args, kwargs, result), failed)
+        return call
+
+
+class Database:
+    """Acesso às coleções de um banco: `db.levels` ou `db["levels"]`."""
+
+    def __init__(self, client: "AsyncIOMotorClient", name: str):
+        self.client = client
+        self.name = name
+        self.backend = getattr(client, "backend", "mongo")
+        self._db = client[name]
+        self._collections = {}
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+    def __getitem__(self, name: str):
+        collection = self._collections.get(name)
+        if collection is None:
+            collection = self._collections[name] = Collection(self._db[name])
+        return collection
+
+    def sibling(self, name: str) -> "Database":
+        """Outro banco no mesmo client (mesmo pool de conexões)."""
+        return Database(self.client, name)
+
+    def watch(self, pipeline=None, **kwargs):
+        """Change stream do banco inteiro (usado para invalidar o cache de configs; só no Mongo)."""
+        return self._db.watch(pipeline, **kwargs)
+
+    async def ping(self):
+        await self.client.admin.command("ping")
+
+    def close(self):
+        self.client.close()
@@ -0,0 +1,204 @@
+# core/dbprofile.py
+"""
+Perfil das consultas ao banco, por cog e por "formato" de consulta.
+
+Cada operação que passa pelo `Collection` de core/database.py é registrada
+com: operação, coleção, cog que chamou, duração e tamanho do documento
+(BSON, ou JSON no SQLite). O formato é o filtro sem os valores:
+
+    {"guild_id": 123, "user_id": 456}      →  {"guild_id":"?","user_id":"?"}
+    [{"$group": {...}}, {"$sort": {...}}]  →  [{"$group":"…"},{"$sort":"…"}]
+
+Para cada formato e cada cog guarda contagem, tempo total e uma janela das
+últimas DB_PROFILE_WINDOW durações (percentis p50/p95/p99). Consultas
+acima de DB_SLOW_MS vão para o log com o formato. O top-N está no
+/dbprofile (dono) e no /metrics.
+
+Variáveis (.env):
+    DB_PROFILE=1          → 0 desliga (sobram só as métricas por coleção)
+    DB_SLOW_MS=100
+    DB_PROFILE_WINDOW=512
+"""
+import os
+import sys
+import json
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from core import metrics
+from core.monitor import PROJECT_ROOT
+
+logger = logging.getLogger(__name__)
+
+DB_PROFILE = os.getenv("DB_PROFILE", "1").strip().lower() not in ("0", "false", "no")
+DB_SLOW_MS = float(os.getenv("DB_SLOW_MS", 100))
+DB_PROFILE_WINDOW = int(os.getenv("DB_PROFILE_WINDOW", 512))
+MAX_SHAPES = 500
+
+_OWN_FILES = {os.path.join(PROJECT_ROOT, "core", name) for name in ("database.py", "dbprofile.py")}
+
+
+# ────────────────────────────────────────────────
+# Quem chamou / formato / tamanho
+# ────────────────────────────────────────────────
+
+def calling_module(depth: int = 2) -> str:
+    """
+    Módulo do projeto que originou a operação. Prefere o cog
+    (`commands.levels.rank`) a um intermediário do core (`core.cache`).
+    """
+    frame = sys._getframe(depth)
+    core_module = None
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(PROJECT_ROOT + os.sep) and filename not in _OWN_FILES:
+            module = os.path.splitext(os.path.relpath(filename, PROJECT_ROOT))[0].replace(os.sep, ".")
+            if not module.startswith("core."):
+                return module
+            core_module = core_module or module
+        frame = frame.f_back
+    return core_module or "externo"
+
+
+def _shape(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _shape(v) if k.startswith("$") or isinstance(v, dict) else "?" for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        shapes = [_shape(v) for v in value]
+        return shapes if any(isinstance(s, (dict, list)) for s in shapes) else "?"
+    return "?"
+
+
+def query_shape(query: Any) -> str:
+    """Filtro/pipeline sem os valores (estágios de aggregate só com o nome)."""
+    if query is None:
+        return "{}"
+    if isinstance(query, (list, tuple)):
+        stages = []
+        for stage in query:
+            if isinstance(stage, dict):
+                stages.append({k: _shape(v) if k == "$match" else "…" for k, v in stage.items()})
+        return json.dumps(stages, separators=(",", ":"), sort_keys=True, ensure_ascii=False)
+    return json.dumps(_shape(query), separators=(",", ":"), sort_keys=True, ensure_ascii=False)
+
+
+_encode = None
+
+
+def document_size(doc: Any) -> int:
+    """Tamanho em BSON (mesma medida do Mongo); sem o pymongo instalado, em JSON."""
+    global _encode
+    if doc is None:
+        return 0
+    if _encode is None:
+        try:
+            from bson import encode as bson_encode
+            _encode = bson_encode
+        except ImportError:
+            from core.jsoncodec import dumps
+            _encode = dumps
+    try:
+        if isinstance(doc, list):
+            return sum(len(_encode(d)) for d in doc if isinstance(d, dict))
+        return len(_encode(doc)) if isinstance(doc, dict) else 0
+    except Exception:
+        return 0
+
+
+# ────────────────────────────────────────────────
+# Estatísticas
+# ────────────────────────────────────────────────
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    total: float = 0.0
+    bytes: int = 0
+    errors: int = 0
+    window: Deque[float] = field(default_factory=lambda: deque(maxlen=DB_PROFILE_WINDOW))
+    cogs: Dict[str, int] = field(default_factory=dict)
+
+    def add(self, elapsed: float, size: int, cog: str, failed: bool):
+        self.count += 1
+        self.total += elapsed
+        self.bytes += size
+        self.errors += failed
+        self.window.append(elapsed)
+        self.cogs[cog] = self.cogs.get(cog, 0) + 1
+
+    def percentiles(self) -> Tuple[float, float, float]:
+        values = sorted(self.window)
+        if not values:
+            return 0.0, 0.0, 0.0
+
+        def pick(q: float) -> float:
+            return values[min(len(values) - 1, int(q * len(values)))]
+        return pick(0.5), pick(0.95), pick(0.99)
+
+    def summary(self) -> dict:
+        p50, p95, p99 = self.percentiles()
+        return {
+            "count": self.count,
+            "total_ms": round(self.total * 1000, 1),
+            "p50_ms": round(p50 * 1000, 2),
+            "p95_ms": round(p95 * 1000, 2),
+            "p99_ms": round(p99 * 1000, 2),
+            "avg_bytes": self.bytes // self.count if self.count else 0,
+            "errors": self.errors,
+        }
+
+
+class QueryProfiler:
+    def __init__(self, slow_ms: float = DB_SLOW_MS):
+        self.slow_ms = slow_ms
+        self.shapes: Dict[Tuple[str, str, str], QueryStats] = {}
+        self.cogs: Dict[str, QueryStats] = {}
+        self.slow_queries = 0
+
+    def record(self, collection: str, op: str, query: Any, cog: str, elapsed: float,
+               size: int = 0, failed: bool = False):
+        shape = query_shape(query)
+        key = (collection, op, shape)
+        stats = self.shapes.get(key)
+        if stats is None:
+            if len(self.shapes) >= MAX_SHAPES:
+                # Formatos gerados dinamicamente não podem crescer sem limite: descarta o mais leve
+                lightest = min(self.shapes, key=lambda k: self.shapes[k].total)
+                del self.shapes[lightest]
+            stats = self.shapes[key] = QueryStats()
+        stats.add(elapsed, size, cog, failed)
+        self.cogs.setdefault(cog, QueryStats()).add(elapsed, size, cog, failed)
+
+        if elapsed * 1000 >= self.slow_ms:
+            self.slow_queries += 1
+            logger.warning(
+                "Consulta lenta: %s.%s %.0fms (%s, %d bytes) formato=%s",
+                collection, op, elapsed * 1000, cog, size, shape
+            )
+
+    def top(self, n: int = 10, by: str = "total") -> List[dict]:
+        def weight(item):
+            stats = item[1]
+            return stats.total if by == "total" else stats.percentiles()[1] if by == "p95" else stats.count
+
+        result = []
+        for (collection, op, shape), stats in sorted(self.shapes.items(), key=weight, reverse=True)[:n]:
+            top_cog = max(stats.cogs.items(), key=lambda item: item[1])[0] if stats.cogs else "?"
+            result.append({"collection": collection, "op": op, "shape": shape, "cog": top_cog, **stats.summary()})
+        return result
+
+    def by_cog(self, n: int = 10) -> List[dict]:
+        ranked = sorted(self.cogs.items(), key=lambda item: item[1].total, reverse=True)[:n]
+        return [{"cog": cog, **stats.summary()} for cog, stats in ranked]
+
+    def reset(self):
+        self.shapes.clear()
+        self.cogs.clear()
+        self.slow_queries = 0
+
+
+PROFILER: Optional[QueryProfiler] = QueryProfiler() if DB_PROFILE else None
+if PROFILER is not None:
+    metrics.register_db_profiler(PROFILER)
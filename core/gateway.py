@@ -0,0 +1,93 @@
+# core/gateway.py
+"""
+IDENTIFY mais rápido e sem estourar a cota diária.
+
+Sobre RESUME entre processos: o Discord aceita retomar uma sessão de outro
+processo, mas o RESUME só reenvia os eventos perdidos — não reenvia o
+READY nem os GUILD_CREATE. Um processo novo começa com o cache vazio
+(servidores, canais, cargos), e o discord.py depende desse cache para
+tudo. Retomar sem persistir o cache inteiro deixaria o bot "conectado"
+sem enxergar nenhum servidor. Por isso o RESUME continua só dentro do
+mesmo processo (o discord.py já faz isso nas quedas de conexão). Para reduzir o tempo de
+restart, o que está ao nosso alcance é:
+
+    - `max_concurrency`: o discord.py espera 5s entre TODOS os IDENTIFYs,
+      mas o Discord permite `max_concurrency` IDENTIFYs simultâneos a cada
+      5s (um por bucket `shard_id % max_concurrency`);
+    - cota diária (`session_start_limit`): se o restart for gastar mais
+      IDENTIFYs do que restam, espera o reset em vez de ter o token resetado
+      pelo Discord;
+    - chunk de membros sob demanda e presences desligado (core/members.py).
+"""
+import time
+import asyncio
+import logging
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+IDENTIFY_WINDOW = 5.0
+
+
+class IdentifyLimiter:
+    """Um IDENTIFY por bucket (`shard_id % max_concurrency`) a cada 5s."""
+
+    def __init__(self, max_concurrency: int = 1):
+        self.max_concurrency = max(1, max_concurrency)
+        self._last: Dict[int, float] = {}
+        self._locks: Dict[int, asyncio.Lock] = {}
+        self.session_start_limit: Optional[dict] = None
+        self.identifies = 0
+
+    async def wait(self, shard_id: Optional[int]):
+        key = (shard_id or 0) % self.max_concurrency
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            last = self._last.get(key)
+            if last is not None:
+                delay = last + IDENTIFY_WINDOW - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            self._last[key] = time.monotonic()
+        self.identifies += 1
+
+    def stats(self) -> dict:
+        limit = self.session_start_limit or {}
+        return {
+            "max_concurrency": self.max_concurrency,
+            "identifies": self.identifies,
+            "identify_remaining": limit.get("remaining"),
+            "identify_total": limit.get("total"),
+        }
+
+
+async def check_session_budget(bot) -> dict:
+    """
+    Consulta /gateway/bot, ajusta o `max_concurrency` do limitador e, se a cota
+    diária de IDENTIFY não cobrir este boot, espera o reset.
+    """
+    recommended, _, limit = await bot.http.get_bot_gateway()
+    if bot.shard_ids is not None:
+        shards_to_start = len(bot.shard_ids)
+    else:
+        shards_to_start = bot.shard_count or recommended
+    remaining = limit.get("remaining", 0)
+    total = limit.get("total", 0)
+    reset_after = limit.get("reset_after", 0) / 1000
+    bot.identify_limiter.max_concurrency = max(1, limit.get("max_concurrency", 1))
+    bot.identify_limiter.session_start_limit = limit
+
+    logger.info(
+        f"Gateway: {remaining}/{total} IDENTIFYs restantes hoje "
+        f"(reset em {reset_after / 3600:.1f}h), max_concurrency={bot.identify_limiter.max_concurrency}"
+    )
+    if remaining < shards_to_start:
+        # Estourar a cota faz o Discord derrubar as sessões e resetar o token
+        logger.critical(
+            f"Cota de IDENTIFY insuficiente ({remaining} < {shards_to_start} shards). "
+            f"Aguardando o reset em {reset_after:.0f}s antes de conectar."
+        )
+        await asyncio.sleep(reset_after)
+    elif remaining < max(shards_to_start * 3, total * 0.1):
+        logger.warning(f"Cota de IDENTIFY baixa: {remaining} restantes — evite restarts em sequência")
+    return limit
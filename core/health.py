@@ -0,0 +1,208 @@
+# core/health.py
+"""
+Health check detalhado.
+
+Um sampler roda em background (a cada HEALTH_INTERVAL segundos) e guarda
+o último retrato do processo em memória; o `/health` só devolve esse
+retrato, então pode ser consultado à vontade pelo monitor de uptime.
+
+Estados:
+    starting → bot ainda não ficou pronto
+    healthy  → tudo dentro dos limites
+    degraded → vivo, mas algo fora do normal (ver "reasons")
+"""
+import os
+import math
+import time
+import asyncio
+import logging
+import resource
+from typing import Optional
+
+from core import metrics
+from core.members import cache_report
+
+logger = logging.getLogger(__name__)
+
+HEALTH_INTERVAL = float(os.getenv("HEALTH_INTERVAL", 10))
+# Limites para considerar "degraded"
+MAX_GATEWAY_LATENCY_MS = float(os.getenv("HEALTH_MAX_GATEWAY_LATENCY_MS", 1000))
+MAX_DB_PING_MS = float(os.getenv("HEALTH_MAX_DB_PING_MS", 500))
+MAX_LOOP_LAG_MS = float(os.getenv("HEALTH_MAX_LOOP_LAG_MS", 250))
+DB_PING_TIMEOUT = float(os.getenv("HEALTH_DB_PING_TIMEOUT", 3))
+
+def _process_start_time() -> float:
+    """Instante em que o processo foi criado (Linux: /proc), não o do import deste módulo."""
+    try:
+        with open("/proc/self/stat") as f:
+            # o campo 2 (comm) pode ter espaços → corta no último ")"
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            system_uptime = float(f.read().split()[0])
+        return time.time() - (system_uptime - start_ticks / os.sysconf("SC_CLK_TCK"))
+    except (OSError, ValueError, IndexError):
+        return time.time()
+
+
+PROCESS_STARTED_AT = _process_start_time()
+
+
+def latency_ms(latency: float) -> Optional[float]:
+    # Antes do primeiro heartbeat o discord.py reporta latência infinita
+    return round(latency * 1000, 1) if math.isfinite(latency) else None
+
+
+def rss_bytes() -> Optional[int]:
+    """Memória residente atual (Linux: /proc; fallback: pico via getrusage)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    except (ValueError, OSError):
+        return None
+
+
+def format_uptime(seconds: float) -> str:
+    days, rem = divmod(int(seconds), 86400)
+    hours, rem = divmod(rem, 3600)
+    minutes, secs = divmod(rem, 60)
+    return f"{days}d {hours:02d}:{minutes:02d}:{secs:02d}"
+
+
+class HealthSampler:
+    def __init__(self, bot, interval: float = HEALTH_INTERVAL):
+        self.bot = bot
+        self.interval = interval
+        self.snapshot: dict = {"status": "starting", "reasons": ["ainda sem amostras"]}
+        self._task = None
+        self._last_429_total = 0.0
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="health-sampler")
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                self.snapshot = await self.sample()
+            except Exception as e:
+                logger.error(f"Erro ao amostrar health: {e}", exc_info=e)
+            await asyncio.sleep(self.interval)
+
+    # ────────────────────────────────────────────────
+    # Amostras
+    # ────────────────────────────────────────────────
+
+    def _shards(self) -> dict:
+        return {
+            shard_id: {"latency_ms": latency_ms(shard.latency), "closed": shard.is_closed()}
+            for shard_id, shard in self.bot.shards.items()
+        }
+
+    async def _database(self) -> dict:
+        if self.bot.db is None:
+            return {"connected": False, "ping_ms": None, "error": "sem banco configurado"}
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(self.bot.db.ping(), timeout=DB_PING_TIMEOUT)
+        except Exception as e:
+            return {"connected": False, "backend": self.bot.db.backend, "ping_ms": None, "error": type(e).__name__}
+        return {"connected": True, "backend": self.bot.db.backend, "ping_ms": round((time.perf_counter() - start) * 1000, 1)}
+
+    def _rest(self) -> dict:
+        http = self.bot.http
+        global_over = getattr(http, "_global_over", None)
+        buckets = getattr(http, "_buckets", {})
+        # Ratelimit.expires usa o relógio do loop (monotônico), não time.time()
+        now = asyncio.get_running_loop().time()
+        exhausted = sum(
+            1 for b in buckets.values()
+            if b.remaining <= 0 and b.expires is not None and b.expires > now
+        )
+        pending = sum(len(getattr(b, "_pending_requests", ())) for b in buckets.values())
+
+        total_429 = metrics.REST_RATELIMITS.total()
+        recent_429 = total_429 - self._last_429_total
+        self._last_429_total = total_429
+        return {
+            "global_ratelimited": isinstance(global_over, asyncio.Event) and not global_over.is_set(),
+            "buckets": len(buckets),
+            "exhausted_buckets": exhausted,
+            "pending_requests": pending,
+            "recent_429": int(recent_429),
+        }
+
+    async def sample(self) -> dict:
+        bot = self.bot
+        shards = self._shards()
+        database = await self._database()
+        rest = self._rest()
+        loop_lag_ms = round(bot.loop_monitor.lag * 1000, 1)
+        uptime = time.time() - PROCESS_STARTED_AT
+        rss = rss_bytes()
+
+        reasons = []
+        if not bot.is_ready():
+            status = "starting"
+            reasons.append("bot ainda não está pronto")
+        else:
+            for shard_id, shard in shards.items():
+                if shard["closed"]:
+                    reasons.append(f"shard {shard_id} desconectado")
+                elif shard["latency_ms"] is not None and shard["latency_ms"] > MAX_GATEWAY_LATENCY_MS:
+                    reasons.append(f"shard {shard_id} com latência alta ({shard['latency_ms']}ms)")
+            if bot.db is not None and not database["connected"]:
+                reasons.append(f"banco sem resposta ({database.get('error')})")
+            elif database.get("ping_ms") and database["ping_ms"] > MAX_DB_PING_MS:
+                reasons.append(f"banco lento ({database['ping_ms']}ms)")
+            if loop_lag_ms > MAX_LOOP_LAG_MS:
+                reasons.append(f"event loop atrasado ({loop_lag_ms}ms)")
+            if rest["global_ratelimited"]:
+                reasons.append("rate limit global da API do Discord")
+            status = "degraded" if reasons else "healthy"
+
+        return {
+            "status": status,
+            "reasons": reasons,
+            "bot_online": bot.is_ready(),
+            "guilds": len(bot.guilds),
+            "shards": shards,
+            "database": database,
+            "event_loop": {
+                "lag_ms": loop_lag_ms,
+                "max_lag_ms": round(bot.loop_monitor.max_lag * 1000, 1),
+                "pending_tasks": len(asyncio.all_tasks()),
+                "blocks": bot.loop_monitor.blocks,
+                "last_block": {
+                    k: v for k, v in (bot.loop_monitor.last_block or {}).items() if k != "stack"
+                } or None,
+            },
+            "rest": rest,
+            "config_cache": bot.configs.stats(),
+            "discord_cache": cache_report(bot),
+            "ratelimit": bot.ratelimiter.stats(),
+            "rest_scheduler": bot.rest.stats(),
+            "jobs": bot.jobs.stats(),
+            "pipeline": bot.pipeline.stats(),
+            "keyed_queue": bot.keyed.stats(),
+            "offload": bot.offload.stats(),
+            "in_flight": bot.shutdown.in_flight,
+            "gateway": bot.identify_limiter.stats(),
+            "process": {
+                "pid": os.getpid(),
+                "uptime_seconds": int(uptime),
+                "uptime": format_uptime(uptime),
+                "rss_mb": round(rss / 1024 / 1024, 1) if rss else None,
+            },
+            "sampled_at": time.time(),
+        }
@@ -0,0 +1,94 @@
+# core/importtime.py
+"""
+Perfil do tempo de import do caminho de inicialização (`python -X importtime`).
+
+Roda em um subprocesso novo (o processo atual já tem tudo importado) que
+importa o main.py, todos os cogs habilitados e o webserver — exatamente o
+que um restart precisa carregar antes do `on_ready`.
+"""
+import os
+import sys
+import asyncio
+from dataclasses import dataclass
+from typing import List
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STARTUP_SCRIPT = (
+    "import importlib, main, handler\n"
+    "for modules in handler.COGS_ENABLED.values():\n"
+    "    for name in modules:\n"
+    "        importlib.import_module(name)\n"
+    "import core.web\n"
+)
+
+
+@dataclass
+class ImportEntry:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass
+class ImportProfile:
+    entries: List[ImportEntry]
+    wall_seconds: float
+    raw: str
+
+    @property
+    def total_us(self) -> int:
+        # Soma dos imports de nível mais alto (os aninhados já estão no cumulativo deles)
+        return sum(e.cumulative_us for e in self.entries if e.depth == 0)
+
+    def slowest(self, n: int = 15, cumulative: bool = True) -> List[ImportEntry]:
+        key = (lambda e: e.cumulative_us) if cumulative else (lambda e: e.self_us)
+        return sorted(self.entries, key=key, reverse=True)[:n]
+
+    def packages(self, n: int = 15) -> List[tuple]:
+        """Tempo próprio somado por pacote raiz (discord, fastapi, pymongo...)."""
+        totals = {}
+        for e in self.entries:
+            root = e.module.split(".", 1)[0]
+            totals[root] = totals.get(root, 0) + e.self_us
+        return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:n]
+
+
+def parse_importtime(text: str) -> List[ImportEntry]:
+    """Lê a saída de `-X importtime` (linhas "import time: self | cumulative | módulo")."""
+    entries = []
+    for line in text.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # cabeçalho
+        name = parts[2].rstrip()
+        stripped = name.lstrip()
+        depth = (len(name) - len(stripped) - 1) // 2
+        entries.append(ImportEntry(stripped, int(parts[0]), int(parts[1]), max(0, depth)))
+    return entries
+
+
+async def profile_startup(timeout: float = 120) -> ImportProfile:
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable, "-X", "importtime", "-c", STARTUP_SCRIPT,
+        cwd=PROJECT_ROOT,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        _, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise
+    raw = stderr.decode(errors="replace")
+    if proc.returncode != 0:
+        # O traceback vem depois das linhas do importtime
+        errors = [line for line in raw.splitlines() if not line.startswith("import time:")]
+        raise RuntimeError("\n".join(errors[-5:]) or f"código {proc.returncode}")
+    return ImportProfile(parse_importtime(raw), loop.time() - started, raw)
@@ -0,0 +1,226 @@
+# core/jobs.py
+"""
+Agenda persistente de tarefas (unmute, fim de sorteio...).
+
+Antes era `await asyncio.sleep(minutos * 60)` dentro do comando: um
+restart no meio do caminho perdia o unmute/sorteio para sempre. Agora a
+tarefa vira um documento em `scheduled_jobs` e qualquer processo (o mesmo
+depois do restart, ou o cluster dono do servidor) a executa na hora.
+
+    bot.jobs.register("unmute", self.run_unmute)                # no cog_load
+    await bot.jobs.schedule("unmute", run_at, {...}, guild_id=guild.id,
+                            job_id=f"unmute:{guild.id}:{member.id}")
+
+Documento:
+    {_id, kind, guild_id, run_at, payload, status: pending|running, claimed_at, attempts}
+
+A execução é "reivindicada" com find_one_and_update (pending → running), então
+dois clusters nunca rodam a mesma tarefa. Tarefa presa em running por mais de
+STALE_AFTER (processo morreu no meio) volta a ser executada. Sem banco, a
+agenda fica só em memória (e se perde no restart, como antes).
+"""
+import os
+import uuid
+import asyncio
+import logging
+import datetime
+from typing import Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL = float(os.getenv("JOBS_POLL_INTERVAL", 30))
+STALE_AFTER = datetime.timedelta(seconds=float(os.getenv("JOBS_STALE_AFTER", 600)))
+MAX_ATTEMPTS = int(os.getenv("JOBS_MAX_ATTEMPTS", 3))
+BATCH = 100
+
+Handler = Callable[[dict], Awaitable[None]]
+
+
+class JobScheduler:
+    def __init__(self, bot):
+        self.bot = bot
+        self.handlers: Dict[str, Handler] = {}
+        self._memory: Dict[str, dict] = {}  # sem banco
+        self._claimed: Dict[str, asyncio.Task] = {}
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def collection(self):
+        # Resolvido na hora: o setup_hook zera bot.db se o ping falhar
+        return self.bot.db.scheduled_jobs if self.bot.db is not None else None
+
+    def register(self, kind: str, handler: Handler):
+        self.handlers[kind] = handler
+        self._wakeup.set()
+
+    def unregister(self, kind: str):
+        self.handlers.pop(kind, None)
+
+    # ────────────────────────────────────────────────
+    # Agendar / cancelar
+    # ────────────────────────────────────────────────
+
+    async def schedule(self, kind: str, run_at: datetime.datetime, payload: dict,
+                       guild_id: Optional[int] = None, job_id: Optional[str] = None) -> str:
+        """Agenda (ou reagenda, se `job_id` já existir) uma tarefa. `run_at` em UTC (naive)."""
+        job_id = job_id or f"{kind}:{uuid.uuid4().hex}"
+        doc = {
+            "_id": job_id,
+            "kind": kind,
+            "guild_id": guild_id,
+            "run_at": run_at,
+            "payload": payload,
+            "status": "pending",
+            "claimed_at": None,
+            "attempts": 0,
+        }
+        if self.collection is not None:
+            await self.collection.replace_one({"_id": job_id}, doc, upsert=True)
+        else:
+            self._memory[job_id] = doc
+        self._wakeup.set()
+        return job_id
+
+    async def cancel(self, job_id: str) -> bool:
+        task = self._claimed.get(job_id)
+        if task is not None:
+            task.cancel()
+        if self.collection is not None:
+            result = await self.collection.delete_one({"_id": job_id})
+            return result.deleted_count > 0
+        return self._memory.pop(job_id, None) is not None
+
+    # ────────────────────────────────────────────────
+    # Armazenamento (MongoDB ou memória)
+    # ────────────────────────────────────────────────
+
+    async def _due(self, now: datetime.datetime) -> List[dict]:
+        if self.collection is None:
+            return sorted(
+                (dict(d) for d in self._memory.values() if d["status"] == "pending" and d["run_at"] <= now),
+                key=lambda d: d["run_at"]
+            )[:BATCH]
+        cursor = self.collection.find({"$or": [
+            {"status": "pending", "run_at": {"$lte": now}},
+            {"status": "running", "claimed_at": {"$lt": now - STALE_AFTER}},
+        ]}).sort("run_at", 1).limit(BATCH)
+        return await cursor.to_list(length=BATCH)
+
+    async def _next_run_at(self, now: datetime.datetime) -> Optional[datetime.datetime]:
+        if self.collection is None:
+            upcoming = [d["run_at"] for d in self._memory.values() if d["status"] == "pending" and d["run_at"] > now]
+            return min(upcoming, default=None)
+        doc = await self.collection.find_one(
+            {"status": "pending", "run_at": {"$gt": now}}, sort=[("run_at", 1)], projection={"run_at": 1}
+        )
+        return doc["run_at"] if doc else None
+
+    async def _claim(self, doc: dict, now: datetime.datetime) -> bool:
+        if self.collection is None:
+            stored = self._memory.get(doc["_id"])
+            if stored is None or stored["status"] != "pending":
+                return False
+            stored.update(status="running", claimed_at=now, attempts=stored["attempts"] + 1)
+            return True
+        claimed = await self.collection.find_one_and_update(
+            {"_id": doc["_id"], "status": doc["status"], "claimed_at": doc.get("claimed_at")},
+            {"$set": {"status": "running", "claimed_at": now}, "$inc": {"attempts": 1}},
+        )
+        return claimed is not None
+
+    async def _finish(self, job_id: str):
+        if self.collection is None:
+            self._memory.pop(job_id, None)
+        else:
+            await self.collection.delete_one({"_id": job_id})
+
+    async def _release(self, job_id: str, retry_at: Optional[datetime.datetime] = None):
+        """Devolve a tarefa para pending (encerramento ou nova tentativa)."""
+        update = {"status": "pending", "claimed_at": None}
+        if retry_at is not None:
+            update["run_at"] = retry_at
+        if self.collection is None:
+            if job_id in self._memory:
+                self._memory[job_id].update(update)
+        else:
+            await self.collection.update_one({"_id": job_id}, {"$set": update})
+
+    # ────────────────────────────────────────────────
+    # Execução
+    # ────────────────────────────────────────────────
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop(), name="job-scheduler")
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def flush(self):
+        """No encerramento: para o loop e devolve as tarefas em execução para a fila."""
+        self.stop()
+        for job_id, task in list(self._claimed.items()):
+            task.cancel()
+        if self._claimed:
+            await asyncio.wait(list(self._claimed.values()), timeout=2)
+        if self.collection is None and self._memory:
+            logger.warning(f"Agenda sem banco: {len(self._memory)} tarefa(s) pendente(s) serão perdidas no restart")
+
+    def _owns(self, doc: dict) -> bool:
+        # Com vários clusters, cada um executa só as tarefas dos servidores que ele tem
+        guild_id = doc.get("guild_id")
+        return guild_id is None or self.bot.get_guild(guild_id) is not None
+
+    async def _loop(self):
+        await self.bot.wait_until_ready()
+        while True:
+            self._wakeup.clear()
+            now = datetime.datetime.utcnow()
+            try:
+                for doc in await self._due(now):
+                    if doc["kind"] not in self.handlers or doc["_id"] in self._claimed or not self._owns(doc):
+                        continue
+                    if await self._claim(doc, now):
+                        task = asyncio.create_task(self._run(doc), name=f"job-{doc['_id']}")
+                        self._claimed[doc["_id"]] = task
+                        task.add_done_callback(lambda _, job_id=doc["_id"]: self._claimed.pop(job_id, None))
+                        self.bot.shutdown.track(task)
+                next_run = await self._next_run_at(now)
+            except Exception as e:
+                logger.error(f"Agenda: erro ao buscar tarefas: {e}")
+                next_run = None
+
+            timeout = POLL_INTERVAL
+            if next_run is not None:
+                timeout = min(timeout, max(0.5, (next_run - datetime.datetime.utcnow()).total_seconds()))
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _run(self, doc: dict):
+        job_id = doc["_id"]
+        handler = self.handlers.get(doc["kind"])
+        try:
+            await handler(doc["payload"])
+        except asyncio.CancelledError:
+            # Encerramento no meio → outra execução (ou o próximo boot) retoma
+            await asyncio.shield(self._release(job_id))
+            raise
+        except Exception as e:
+            attempts = doc.get("attempts", 0) + 1
+            if attempts >= MAX_ATTEMPTS:
+                logger.error(f"Agenda: tarefa {job_id} falhou {attempts}x, descartando: {e}", exc_info=e)
+                await self._finish(job_id)
+            else:
+                retry_at = datetime.datetime.utcnow() + datetime.timedelta(seconds=30 * attempts)
+                logger.warning(f"Agenda: tarefa {job_id} falhou ({e}); nova tentativa às {retry_at:%H:%M:%S}")
+                await self._release(job_id, retry_at)
+        else:
+            await self._finish(job_id)
+
+    def stats(self) -> dict:
+        return {"running": len(self._claimed), "handlers": sorted(self.handlers), "persistent": self.collection is not None}
@@ -0,0 +1,69 @@
+# core/jsoncodec.py
+"""
+Camada de JSON do bot: orjson quando instalado, `json` da stdlib como reserva.
+
+    data = dumps(backup, pretty=True)     # bytes
+    obj = loads(data)                     # aceita bytes ou str
+
+orjson serializa/parsa bem mais rápido que a stdlib (o `json.dumps` com
+indent usa o encoder em Python puro) e trabalha direto em bytes, sem a
+cópia do `.decode()`. O modo "pretty" usa indentação de 2 espaços (a única
+que o orjson suporta) nas duas implementações, para a saída não mudar
+conforme o ambiente.
+
+Snowflakes: ids do Discord passam de 2^53 e perdem precisão em clientes
+JavaScript. `dumps(..., safe_ints=True)` grava inteiros acima disso como
+string (usado nas respostas HTTP); `snowflake()` aceita os dois formatos
+na leitura (ex.: backup editado por outra ferramenta).
+"""
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende do ambiente
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+JSONDecodeError = json.JSONDecodeError  # orjson.JSONDecodeError é subclasse
+
+MAX_SAFE_INT = 2 ** 53 - 1
+
+
+def _safe_ints(obj: Any) -> Any:
+    if isinstance(obj, bool):
+        return obj
+    if isinstance(obj, int):
+        return str(obj) if abs(obj) > MAX_SAFE_INT else obj
+    if isinstance(obj, dict):
+        return {k: _safe_ints(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_safe_ints(v) for v in obj]
+    return obj
+
+
+def dumps(obj: Any, pretty: bool = False, safe_ints: bool = False) -> bytes:
+    """Serializa para bytes UTF-8. Tipos desconhecidos (datetime, ObjectId...) viram str."""
+    if safe_ints:
+        obj = _safe_ints(obj)
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=str, option=option)
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False, default=str).encode("utf-8")
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8")
+
+
+def loads(data: Union[bytes, bytearray, str]) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, (bytes, bytearray)):
+        data = data.decode("utf-8")
+    return json.loads(data)
+
+
+def snowflake(value: Union[int, str]) -> int:
+    """Id do Discord vindo de JSON (int ou string) → int."""
+    return int(value)
@@ -0,0 +1,102 @@
+# core/keyed.py
+"""
+Fila de trabalho serializada por chave (servidor, usuário).
+
+XP, /daily e /work fazem "lê o documento → altera no Python → grava de
+volta". Duas mensagens (ou dois comandos) do mesmo usuário ao mesmo tempo
+liam o mesmo documento e a segunda gravação apagava a primeira. Aqui o
+trabalho de uma mesma chave roda em fila, um por vez e na ordem de
+chegada; chaves diferentes continuam em paralelo.
+
+    await bot.keyed.run((guild.id, user.id), lambda: self._award_xp(ctx))
+
+Cada chave tem no máximo KEYED_MAX_PENDING trabalhos esperando; acima
+disso `run` levanta `KeyedQueueFull` (o chamador decide: descartar o XP,
+pedir para aguardar...). A fila de uma chave some quando esvazia.
+
+Com vários clusters cada servidor fica em um só processo, então a
+serialização por processo já basta.
+"""
+import os
+import time
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, Tuple
+
+from core import metrics
+
+logger = logging.getLogger(__name__)
+
+KEYED_MAX_PENDING = int(os.getenv("KEYED_MAX_PENDING", 10))
+
+
+class KeyedQueueFull(Exception):
+    """A chave já tem trabalhos demais esperando."""
+
+
+class KeyedQueue:
+    def __init__(self, name: str, max_pending: int = KEYED_MAX_PENDING):
+        self.name = name
+        self.max_pending = max_pending
+        self._queues: Dict[Hashable, Deque[Tuple[Callable[[], Awaitable[Any]], asyncio.Future, float]]] = {}
+        self._workers: Dict[Hashable, asyncio.Task] = {}
+        self.completed = 0
+        self.rejected = 0
+        metrics.register_keyed(self)
+
+    def submit(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> asyncio.Future:
+        """Enfileira `factory` (função que cria a corrotina) na fila da chave."""
+        queue = self._queues.setdefault(key, deque())
+        if len(queue) >= self.max_pending:
+            self.rejected += 1
+            metrics.KEYED_REJECTED.inc(queue=self.name)
+            raise KeyedQueueFull(key)
+        future = asyncio.get_running_loop().create_future()
+        queue.append((factory, future, time.monotonic()))
+        if key not in self._workers:
+            self._workers[key] = asyncio.create_task(self._worker(key), name=f"keyed-{self.name}-{key}")
+        return future
+
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        return await self.submit(key, factory)
+
+    async def _worker(self, key: Hashable):
+        queue = self._queues[key]
+        future = None
+        try:
+            while queue:
+                factory, future, queued_at = queue.popleft()
+                if future.cancelled():
+                    continue
+                metrics.KEYED_WAIT.observe(time.monotonic() - queued_at, queue=self.name)
+                try:
+                    result = await factory()
+                except Exception as e:
+                    if not future.done():
+                        future.set_exception(e)
+                else:
+                    if not future.done():
+                        future.set_result(result)
+                self.completed += 1
+        finally:
+            # Cancelado no meio (encerramento): nem o trabalho em andamento nem
+            # os que esperam na fila deixam o chamador pendurado
+            if future is not None and not future.done():
+                future.cancel()
+            for _, waiting, _ in queue:
+                waiting.cancel()
+            self._queues.pop(key, None)
+            self._workers.pop(key, None)
+
+    def stop(self):
+        for task in list(self._workers.values()):
+            task.cancel()
+
+    def stats(self) -> dict:
+        return {
+            "active_keys": len(self._workers),
+            "queued": sum(len(q) for q in self._queues.values()),
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
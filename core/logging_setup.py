@@ -0,0 +1,210 @@
+# core/logging_setup.py
+"""
+Logging sem bloquear o event loop.
+
+O loop só enfileira o registro (QueueHandler); formatação e escrita no
+stderr ficam numa thread (QueueListener). Além disso:
+
+    - contexto (servidor, comando, usuário, etapa do pipeline) vai junto em
+      cada registro via contextvars — `bind_log_context(guild_id=...)`;
+    - formato texto (padrão, o mesmo de antes) ou JSON, uma linha por registro;
+    - nível por logger;
+    - amostragem: a mesma linha de código logando sem parar (raid, spam)
+      passa no máximo N vezes por janela; o resto é contado e informado.
+
+Variáveis (.env):
+    LOG_FORMAT=text|json
+    LOG_LEVEL=INFO
+    LOG_LEVELS=discord=WARNING,commands.welcome=DEBUG
+    LOG_SAMPLE=20/10         → por linha de código: 20 registros a cada 10s (0 desliga)
+"""
+import os
+import sys
+import json
+import time
+import queue
+import atexit
+import logging
+import logging.handlers
+import contextvars
+from typing import Dict, Optional, Tuple
+
+TEXT_FORMAT = "%(asctime)s | %(levelname)s | %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Campos de contexto que acompanham os registros (None = não definido)
+CONTEXT_FIELDS = ("guild_id", "user_id", "command", "cog")
+_context: Dict[str, contextvars.ContextVar] = {
+    name: contextvars.ContextVar(f"log_{name}", default=None) for name in CONTEXT_FIELDS
+}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_sampler: Optional["SamplingFilter"] = None
+
+
+def bind_log_context(**fields):
+    """
+    Define o contexto de log da task atual (e das que ela criar).
+    Cada evento/interação do discord.py roda na própria task, então não vaza.
+    """
+    for name, value in fields.items():
+        _context[name].set(value)
+
+
+def _parse_rate(value: str) -> Tuple[int, float]:
+    try:
+        count, seconds = value.split("/", 1)
+        return int(count), float(seconds)
+    except ValueError:
+        return 20, 10.0
+
+
+# ────────────────────────────────────────────────
+# Filtros (rodam no event loop — precisam ser baratos)
+# ────────────────────────────────────────────────
+
+class ContextFilter(logging.Filter):
+    """Copia o contexto atual para o registro (a thread do listener não enxerga as contextvars)."""
+
+    def filter(self, record):
+        for name, var in _context.items():
+            if not hasattr(record, name):
+                setattr(record, name, var.get())
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Limita cada linha de código a `limit` registros por `window` segundos.
+    Erros sempre passam. Ao reabrir a janela, o registro seguinte informa
+    quantos foram suprimidos.
+    """
+
+    def __init__(self, limit: int, window: float):
+        super().__init__()
+        self.limit = limit
+        self.window = window
+        self._windows: Dict[Tuple[str, int], list] = {}  # (arquivo, linha) → [início, contagem, suprimidos]
+        self.suppressed_total = 0
+
+    def filter(self, record):
+        if self.limit <= 0 or record.levelno >= logging.ERROR:
+            return True
+        key = (record.pathname, record.lineno)
+        now = time.monotonic()
+        state = self._windows.get(key)
+        if state is None or now - state[0] >= self.window:
+            suppressed = state[2] if state is not None else 0
+            self._windows[key] = [now, 1, 0]
+            if suppressed:
+                record.sampled = suppressed
+            if len(self._windows) > 10_000:
+                self._windows.clear()
+            return True
+        if state[1] < self.limit:
+            state[1] += 1
+            return True
+        state[2] += 1
+        self.suppressed_total += 1
+        return False
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record):
+        # Só o necessário para a outra thread formatar: mensagem pronta e traceback em texto
+        record = logging.makeLogRecord(record.__dict__)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+# ────────────────────────────────────────────────
+# Formatadores (rodam na thread do listener)
+# ────────────────────────────────────────────────
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__(TEXT_FORMAT, DATE_FORMAT)
+
+    def format(self, record):
+        line = super().format(record)
+        sampled = getattr(record, "sampled", 0)
+        if sampled:
+            line += f" (+{sampled} registro(s) iguais suprimidos)"
+        return line
+
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record):
+        data = {
+            "ts": round(record.created, 3),
+            "time": self.formatTime(record, DATE_FORMAT),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for name in CONTEXT_FIELDS:
+            value = getattr(record, name, None)
+            if value is not None:
+                data[name] = value
+        sampled = getattr(record, "sampled", 0)
+        if sampled:
+            data["suppressed"] = sampled
+        if record.exc_text:
+            data["exc"] = record.exc_text
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+# ────────────────────────────────────────────────
+# Configuração
+# ────────────────────────────────────────────────
+
+def setup_logging():
+    """Configura o logging do processo (idempotente). Chamar antes de qualquer log."""
+    global _listener, _sampler
+    if _listener is not None:
+        return
+
+    fmt = os.getenv("LOG_FORMAT", "text").strip().lower()
+    output = logging.StreamHandler(sys.stderr)
+    output.setFormatter(JSONFormatter() if fmt == "json" else TextFormatter())
+
+    handler = _QueueHandler(queue.SimpleQueue())
+    handler.addFilter(ContextFilter())
+    limit, window = _parse_rate(os.getenv("LOG_SAMPLE", "20/10"))
+    _sampler = SamplingFilter(limit, window)
+    handler.addFilter(_sampler)
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO").strip().upper())
+
+    for item in filter(None, (part.strip() for part in os.getenv("LOG_LEVELS", "").split(","))):
+        name, _, level = item.partition("=")
+        try:
+            logging.getLogger(name.strip()).setLevel(level.strip().upper())
+        except ValueError:
+            root.warning(f"Nível de log inválido em LOG_LEVELS: '{item}'")
+
+    _listener = logging.handlers.QueueListener(handler.queue, output, respect_handler_level=False)
+    _listener.start()
+    atexit.register(stop_logging)
+
+
+def suppressed_count() -> int:
+    """Total de registros descartados pela amostragem desde o início."""
+    return _sampler.suppressed_total if _sampler is not None else 0
+
+
+def stop_logging():
+    """Esvazia a fila e para a thread de escrita."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,111 @@
+# core/members.py
+"""
+Intents e cache de membros configuráveis.
+
+A maior parte da memória do bot era presença (status/atividade de cada
+membro), que nenhum cog lê, e a lista completa de membros de todos os
+servidores baixada no login. Agora:
+
+    - `presences` vem desligado por padrão;
+    - os servidores NÃO são "chunkados" no login. Nenhum cog precisa da
+      lista completa: o anti-raid só olha quem entrou agora (chega pelo
+      GUILD_MEMBER_ADD e fica no cache "joined") e o resto usa
+      `get_or_fetch_member`;
+    - o cache de membros segue MEMBER_CACHE.
+
+Variáveis (.env):
+    INTENT_MEMBERS=1            → entradas/saídas (boas-vindas, anti-raid)
+    INTENT_PRESENCES=0          → status/atividade dos membros (caro!)
+    INTENT_MESSAGE_CONTENT=1    → automod, auto-resposta, XP
+    MEMBER_CACHE=joined,voice   → "all", "none" ou lista de flags do MemberCacheFlags
+                                  (joined = quem entrou desde o login, voice = quem está em call)
+"""
+import os
+import logging
+from typing import Optional
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+
+def _flag(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "sim")
+
+
+def build_intents() -> discord.Intents:
+    intents = discord.Intents.default()
+    intents.message_content = _flag("INTENT_MESSAGE_CONTENT", True)
+    intents.members = _flag("INTENT_MEMBERS", True)
+    intents.presences = _flag("INTENT_PRESENCES", False)
+    return intents
+
+
+def build_member_cache_flags(intents: discord.Intents) -> discord.MemberCacheFlags:
+    policy = os.getenv("MEMBER_CACHE", "").replace(" ", "").lower()
+    if not policy:
+        return discord.MemberCacheFlags.from_intents(intents)
+    if policy == "all":
+        flags = discord.MemberCacheFlags.all()
+    elif policy == "none":
+        flags = discord.MemberCacheFlags.none()
+    else:
+        flags = discord.MemberCacheFlags.none()
+        for name in filter(None, policy.split(",")):
+            if name not in discord.MemberCacheFlags.VALID_FLAGS:
+                logger.warning(f"Flag inválida em MEMBER_CACHE: '{name}'")
+                continue
+            setattr(flags, name, True)
+
+    # Sem a intent correspondente o discord.py recusa a flag
+    if flags.joined and not intents.members:
+        logger.warning("MEMBER_CACHE=joined exige INTENT_MEMBERS — desativando")
+        flags.joined = False
+    if flags.voice and not intents.voice_states:
+        flags.voice = False
+    return flags
+
+
+async def get_or_fetch_member(guild: discord.Guild, user_id: int) -> Optional[discord.Member]:
+    """Membro do cache; se não estiver lá (cache enxuto), busca na API."""
+    member = guild.get_member(user_id)
+    if member is not None:
+        return member
+    try:
+        return await guild.fetch_member(user_id)
+    except (discord.NotFound, discord.HTTPException):
+        return None
+
+
+def cache_report(bot) -> dict:
+    guilds = bot.guilds
+    cached_members = sum(len(g.members) for g in guilds)
+    return {
+        "guilds": len(guilds),
+        "chunked_guilds": sum(1 for g in guilds if g.chunked),
+        "member_count": sum(g.member_count or 0 for g in guilds),
+        "cached_members": cached_members,
+        "cached_users": len(bot.users),
+        "intents": {
+            "members": bot.intents.members,
+            "presences": bot.intents.presences,
+            "message_content": bot.intents.message_content,
+        },
+        "member_cache": {
+            "joined": bot._connection.member_cache_flags.joined,
+            "voice": bot._connection.member_cache_flags.voice,
+        },
+    }
+
+
+def log_cache_report(bot):
+    report = cache_report(bot)
+    logger.info(
+        f"Cache: {report['guilds']} servidor(es) ({report['chunked_guilds']} chunkados), "
+        f"{report['cached_members']}/{report['member_count']} membros em cache, "
+        f"{report['cached_users']} usuários | presences={'on' if report['intents']['presences'] else 'off'}, "
+        f"member_cache=" + (",".join(k for k, v in report["member_cache"].items() if v) or "none")
+    )
@@ -0,0 +1,338 @@
+# core/metrics.py
+"""
+Métricas no formato texto do Prometheus, servidas em `/metrics` pelo FastAPI.
+
+Implementação mínima e sem dependências (contadores, gauges e histogramas
+com labels). Tudo roda no mesmo event loop do bot, então não há locks.
+
+    from core import metrics
+    metrics.COMMANDS.inc(command="rank", outcome="ok")
+    metrics.MONGO_LATENCY.observe(0.012, collection="levels", op="find_one")
+"""
+import re
+import time
+import math
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import aiohttp
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt_labels(names: Tuple[str, ...], values: Tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, description: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.description = description
+        self.labels = tuple(labels)
+        REGISTRY.register(self)
+
+    def _key(self, labels: dict) -> Tuple:
+        return tuple(labels.get(n, "") for n in self.labels)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name, description, labels=()):
+        super().__init__(name, description, labels)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def total(self) -> float:
+        return sum(self._values.values())
+
+    def render(self):
+        lines = self.header()
+        for key, value in self._values.items():
+            lines.append(f"{self.name}{_fmt_labels(self.labels, key)} {_fmt_value(value)}")
+        return lines
+
+
+class Gauge(Metric):
+    """Gauge com valor setado ou calculado na hora do scrape (`callback`)."""
+    kind = "gauge"
+
+    def __init__(self, name, description, labels=(), callback: Optional[Callable[[], object]] = None):
+        super().__init__(name, description, labels)
+        self._values: Dict[Tuple, float] = {}
+        self.callback = callback
+
+    def set(self, value: float, **labels):
+        self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def render(self):
+        values = dict(self._values)
+        if self.callback is not None:
+            try:
+                result = self.callback()
+            except Exception:
+                result = None
+            if isinstance(result, dict):
+                # {valor_do_label (ou tupla de valores): número}
+                for key, value in result.items():
+                    values[key if isinstance(key, tuple) else (key,)] = value
+            elif result is not None:
+                values[()] = result
+        lines = self.header()
+        for key, value in values.items():
+            lines.append(f"{self.name}{_fmt_labels(self.labels, key)} {_fmt_value(value)}")
+        return lines
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, description, labels=(), buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, description, labels)
+        self.buckets = tuple(sorted(buckets))
+        # chave → [contagem por bucket..., soma, total]
+        self._values: Dict[Tuple, list] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        data = self._values.get(key)
+        if data is None:
+            data = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                data[i] += 1
+        data[-2] += value
+        data[-1] += 1
+
+    def time(self, **labels):
+        return _Timer(self, labels)
+
+    def render(self):
+        lines = self.header()
+        for key, data in self._values.items():
+            for bound, count in zip(self.buckets, data):
+                le = 'le="%s"' % _fmt_value(bound)
+                lines.append(f"{self.name}_bucket{_fmt_labels(self.labels, key, le)} {count}")
+            le = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{_fmt_labels(self.labels, key, le)} {data[-1]}")
+            lines.append(f"{self.name}_sum{_fmt_labels(self.labels, key)} {_fmt_value(data[-2])}")
+            lines.append(f"{self.name}_count{_fmt_labels(self.labels, key)} {data[-1]}")
+        return lines
+
+
+class _Timer:
+    def __init__(self, histogram: Histogram, labels: dict):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric):
+        self._metrics[metric.name] = metric
+
+    def get(self, name: str) -> Optional[Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def render() -> str:
+    return REGISTRY.render()
+
+
+# ────────────────────────────────────────────────
+# Métricas do bot
+# ────────────────────────────────────────────────
+
+GATEWAY_EVENTS = Counter("discord_gateway_events_total", "Eventos recebidos do gateway, por tipo", ["event"])
+
+COMMANDS = Counter("discord_commands_total", "Slash commands executados, por comando e resultado", ["command", "outcome"])
+COMMAND_LATENCY = Histogram("discord_command_duration_seconds", "Duração dos slash commands", ["command"])
+
+MONGO_OPS = Counter("mongo_operations_total", "Operações no MongoDB, por coleção e operação", ["collection", "op"])
+MONGO_ERRORS = Counter("mongo_errors_total", "Operações no MongoDB que falharam", ["collection", "op"])
+MONGO_LATENCY = Histogram("mongo_operation_duration_seconds", "Latência das operações no MongoDB", ["collection", "op"])
+
+REST_REQUESTS = Counter("discord_rest_requests_total", "Requisições à API REST do Discord, por rota e status", ["method", "route", "status"])
+REST_LATENCY = Histogram("discord_rest_duration_seconds", "Latência das requisições REST ao Discord", ["method", "route"])
+REST_RATELIMITS = Counter("discord_rest_ratelimited_total", "Respostas 429 da API do Discord, por rota e escopo", ["method", "route", "scope"])
+REST_QUEUE = Gauge("rest_scheduler_queued", "Chamadas REST esperando no agendador (core/rest.py), por prioridade", ["priority"])
+REST_QUEUE_WAIT = Histogram(
+    "rest_scheduler_wait_seconds", "Tempo na fila do agendador REST até a chamada começar", ["priority"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+
+LOOP_LAG = Gauge("event_loop_lag_seconds", "Último atraso medido do event loop")
+LOOP_LAG_HIST = Histogram(
+    "event_loop_lag_distribution_seconds", "Distribuição do atraso do event loop",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+LOOP_BLOCKS = Counter("event_loop_blocks_total", "Bloqueios do event loop detectados pelo watchdog, por origem", ["source"])
+LOOP_BLOCK_DURATION = Histogram(
+    "event_loop_block_duration_seconds", "Duração dos bloqueios do event loop, por origem", ["source"],
+    buckets=(0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+PIPELINE_SHED = Counter(
+    "pipeline_stages_shed_total", "Etapas do pipeline de mensagens adiadas/descartadas por sobrecarga", ["stage", "action"]
+)
+
+KEYED_WAIT = Histogram(
+    "keyed_queue_wait_seconds", "Tempo na fila por (servidor, usuário) até o trabalho começar (core/keyed.py)", ["queue"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+KEYED_REJECTED = Counter("keyed_queue_rejected_total", "Trabalhos recusados por fila cheia na mesma chave", ["queue"])
+
+OFFLOAD_DURATION = Histogram(
+    "offload_duration_seconds", "Duração das tarefas enviadas aos pools de CPU/I/O (core/offload.py)", ["pool", "task"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+OFFLOAD_REJECTED = Counter("offload_rejected_total", "Payloads recusados por exceder OFFLOAD_MAX_BYTES", ["task"])
+
+
+def register_db_profiler(profiler, top: int = 20):
+    """Top-N formatos de consulta (por tempo total) e tempo por cog — ver core/dbprofile.py."""
+    def shapes(field):
+        return lambda: {(q["collection"], q["op"], q["shape"]): q[field] for q in profiler.top(top)}
+
+    def cogs(field, scale=1000):
+        return lambda: {c["cog"]: c[field] / scale for c in profiler.by_cog(top)}
+
+    labels = ["collection", "op", "shape"]
+    Gauge("db_query_shape_seconds_total", "Tempo total no banco por formato de consulta (top-N)", labels,
+          callback=lambda: {k: v / 1000 for k, v in shapes("total_ms")().items()})
+    Gauge("db_query_shape_calls", "Execuções por formato de consulta (top-N)", labels, callback=shapes("count"))
+    Gauge("db_query_shape_p95_seconds", "p95 da latência por formato de consulta (top-N)", labels,
+          callback=lambda: {k: v / 1000 for k, v in shapes("p95_ms")().items()})
+    Gauge("db_cog_seconds_total", "Tempo total no banco por cog/módulo que chamou", ["cog"], callback=cogs("total_ms"))
+    Gauge("db_cog_p95_seconds", "p95 da latência no banco por cog/módulo", ["cog"], callback=cogs("p95_ms"))
+    Gauge("db_slow_queries", "Consultas acima de DB_SLOW_MS desde o início", callback=lambda: profiler.slow_queries)
+
+
+def register_offload(offload):
+    Gauge("offload_in_flight", "Tarefas em execução nos pools de offload", ["pool"], callback=lambda: dict(offload.in_flight))
+
+
+def register_keyed(queue):
+    Gauge("keyed_queue_active_keys", "Chaves com trabalho em andamento, por fila", ["queue"],
+          callback=lambda: {queue.name: len(queue._workers)})
+    Gauge("keyed_queue_queued", "Trabalhos esperando, por fila", ["queue"],
+          callback=lambda: {queue.name: sum(len(q) for q in queue._queues.values())})
+
+
+def register_pipeline(pipeline):
+    Gauge("pipeline_in_flight", "Mensagens em processamento no pipeline", callback=lambda: pipeline.in_flight)
+    Gauge("pipeline_deferred", "Mensagens com etapas adiadas esperando a carga cair", callback=lambda: len(pipeline._deferred))
+
+
+def register_ratelimiter(limiter):
+    Gauge("ratelimit_buckets", "Token buckets ativos (usuário/servidor) em memória", callback=lambda: len(limiter.buckets))
+    Gauge("ratelimit_denied", "Comandos negados pelo rate limit, por escopo", ["scope"], callback=lambda: dict(limiter.denied))
+
+
+def register_log_sampler(suppressed: Callable[[], int]):
+    Gauge("log_records_suppressed", "Registros de log descartados pela amostragem (core/logging_setup.py)", callback=suppressed)
+
+
+def register_cache(cache):
+    """Expõe hits/misses/tamanho de um ConfigCache (lidos na hora do scrape)."""
+    Gauge("config_cache_hits", "Leituras de config servidas pelo cache", callback=lambda: cache.hits)
+    Gauge("config_cache_misses", "Leituras de config que foram ao banco", callback=lambda: cache.misses)
+    Gauge("config_cache_entries", "Entradas no cache de configs", callback=lambda: len(cache._entries))
+    Gauge("config_cache_hit_ratio", "Taxa de acerto do cache de configs", callback=lambda: cache.stats()["hit_rate"])
+
+
+# ────────────────────────────────────────────────
+# REST do Discord (aiohttp TraceConfig → Client(http_trace=...))
+# ────────────────────────────────────────────────
+
+_SNOWFLAKE = re.compile(r"/\d{15,21}(?=/|$)")
+_TOKEN = re.compile(r"/(webhooks|interactions)/(\{id\})/[^/]+")
+_API_PREFIX = re.compile(r"^/api/v\d+")
+
+
+def normalize_route(path: str) -> str:
+    """`/api/v10/channels/123.../messages/456...` → `/channels/{id}/messages/{id}` (evita explosão de labels)."""
+    path = _API_PREFIX.sub("", path)
+    path = _SNOWFLAKE.sub("/{id}", path)
+    path = _TOKEN.sub(r"/\1/\2/{token}", path)
+    # Reações carregam o emoji na URL
+    return re.sub(r"/reactions/[^/]+", "/reactions/{emoji}", path)
+
+
+def http_trace() -> aiohttp.TraceConfig:
+    trace = aiohttp.TraceConfig()
+
+    async def on_request_start(session, ctx, params):
+        ctx.start = time.perf_counter()
+
+    async def on_request_end(session, ctx, params):
+        route = normalize_route(params.url.path)
+        method = params.method
+        status = params.response.status
+        REST_REQUESTS.inc(method=method, route=route, status=status)
+        REST_LATENCY.observe(time.perf_counter() - ctx.start, method=method, route=route)
+        if status == 429:
+            scope = params.response.headers.get("X-RateLimit-Scope", "unknown")
+            REST_RATELIMITS.inc(method=method, route=route, scope=scope)
+
+    async def on_request_exception(session, ctx, params):
+        REST_REQUESTS.inc(method=params.method, route=normalize_route(params.url.path), status="error")
+
+    trace.on_request_start.append(on_request_start)
+    trace.on_request_end.append(on_request_end)
+    trace.on_request_exception.append(on_request_exception)
+    return trace
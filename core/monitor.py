@@ -0,0 +1,159 @@
+# core/monitor.py
+"""
+Monitor do event loop.
+
+1) Atraso (lag): uma task dorme `interval` segundos e mede quanto acordou
+   atrasada — é o tempo que algum callback segurou o loop sem ceder.
+
+2) Detector de bloqueio: uma thread de watchdog acompanha o "batimento"
+   dessa task. Se o loop ficar parado mais que `block_threshold`, ela
+   captura a pilha da thread do loop (`sys._current_frames`) e descobre
+   qual task/cog estava rodando — I/O síncrono, json.dumps gigante,
+   montagem de HTML... aparecem no log com a linha exata.
+
+Tudo vai para `/metrics` (lag atual, distribuição, bloqueios por cog).
+"""
+import os
+import sys
+import time
+import asyncio
+import logging
+import threading
+import traceback
+import functools
+from typing import Optional
+
+from core import metrics
+
+logger = logging.getLogger(__name__)
+
+LAG_INTERVAL = float(os.getenv("LOOP_LAG_INTERVAL", 0.5))
+LAG_WARN = float(os.getenv("LOOP_LAG_WARN", 0.25))
+BLOCK_THRESHOLD = float(os.getenv("LOOP_BLOCK_THRESHOLD", 0.5))
+STACK_DEPTH = 15
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def attribute_frame(frame) -> str:
+    """
+    Descobre a quem pertence a pilha: o frame mais interno que é código do
+    projeto. `commands/backup/backup.py` → "commands.backup.backup".
+    """
+    fallback = "externo"
+    while frame is not None:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if filename.startswith(PROJECT_ROOT + os.sep):
+            relative = os.path.relpath(filename, PROJECT_ROOT)
+            return os.path.splitext(relative)[0].replace(os.sep, ".")
+        frame = frame.f_back
+    return fallback
+
+
+def describe_task(task: Optional[asyncio.Task]) -> str:
+    if task is None:
+        return "callback fora de task"
+    coro = task.get_coro()
+    name = getattr(coro, "__qualname__", repr(coro))
+    return f"{task.get_name()} ({name})"
+
+
+class LoopMonitor:
+    def __init__(self, interval: float = LAG_INTERVAL, warn_after: float = LAG_WARN,
+                 block_threshold: float = BLOCK_THRESHOLD):
+        self.interval = interval
+        self.warn_after = warn_after
+        self.block_threshold = block_threshold
+        self.lag = 0.0
+        self.max_lag = 0.0
+        self.blocks = 0
+        self.last_block: Optional[dict] = None
+        self._task = None
+        self._loop = None
+        self._loop_thread_id = None
+        self._beat = time.monotonic()
+        self._pending_block: Optional[dict] = None
+        self._stop = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._loop = asyncio.get_running_loop()
+            self._loop_thread_id = threading.get_ident()
+            self._beat = time.monotonic()
+            self._task = asyncio.create_task(self._run(), name="loop-monitor")
+        if self.block_threshold > 0 and (self._watchdog is None or not self._watchdog.is_alive()):
+            self._stop.clear()
+            self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+            self._watchdog.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    # ────────────────────────────────────────────────
+    # Lado do loop: mede o atraso
+    # ────────────────────────────────────────────────
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            self._beat = time.monotonic()
+            await asyncio.sleep(self.interval)
+            self._beat = time.monotonic()
+            lag = max(0.0, loop.time() - start - self.interval)
+            self.lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            metrics.LOOP_LAG.set(lag)
+            metrics.LOOP_LAG_HIST.observe(lag)
+
+            block = self._pending_block
+            if block is not None:
+                # O watchdog viu o bloqueio; agora sabemos quanto durou no total
+                self._pending_block = None
+                block["duration"] = lag
+                self.last_block = block
+                metrics.LOOP_BLOCK_DURATION.observe(lag, source=block["source"])
+                logger.warning(f"Event loop liberado após {lag * 1000:.0f}ms (bloqueado por {block['source']})")
+            elif lag >= self.warn_after:
+                logger.warning(f"Event loop atrasado {lag * 1000:.0f}ms")
+
+    # ────────────────────────────────────────────────
+    # Lado da thread: detecta o bloqueio enquanto ele acontece
+    # ────────────────────────────────────────────────
+
+    def _watch(self):
+        check_every = max(0.05, self.block_threshold / 4)
+        reported_beat = None
+        while not self._stop.wait(check_every):
+            beat = self._beat
+            # A task dorme `interval` entre batimentos; além disso + limite = loop parado
+            stalled = time.monotonic() - beat - self.interval
+            if stalled < self.block_threshold or beat == reported_beat:
+                continue
+            reported_beat = beat
+            self._report_block(stalled)
+
+    def _report_block(self, stalled: float):
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return
+        source = attribute_frame(frame)
+        try:
+            task = asyncio.current_task(self._loop)
+        except RuntimeError:
+            task = None
+        stack = "".join(traceback.format_stack(frame, limit=STACK_DEPTH))
+        del frame
+
+        block = {"source": source, "task": describe_task(task), "stack": stack, "detected_at": time.time()}
+        self._pending_block = block
+        self.blocks += 1
+        self._loop.call_soon_threadsafe(functools.partial(metrics.LOOP_BLOCKS.inc, source=source))
+        logger.warning(
+            f"Event loop bloqueado há {stalled * 1000:.0f}ms por {source} "
+            f"— task: {block['task']}\n{stack}"
+        )
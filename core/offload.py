@@ -0,0 +1,140 @@
+# core/offload.py
+"""
+Trabalho pesado fora do event loop.
+
+Mesmo com orjson (core/jsoncodec.py), serializar/parsar a estrutura de um
+servidor grande segura o loop por tempo suficiente para o heartbeat do
+gateway atrasar. Aqui ficam dois pools compartilhados, em `bot.offload`:
+
+    - processos (CPU): serialização/parsing/renderização — não disputa o
+      GIL com o loop;
+    - threads (I/O bloqueante): escrita/leitura de arquivos.
+
+    data = await bot.offload.json_dumps(backup, pretty=True)    # bytes
+    backup = await bot.offload.json_loads(conteudo_bytes)
+    html = await bot.offload.run_cpu(render_transcript, ..., task="transcript")
+    await bot.offload.run_io(path.write_text, html, task="transcript_write")
+
+Funções enviadas ao pool de processos precisam estar no nível do módulo
+(são importadas pelo processo filho). O pool de processos só é criado no
+primeiro uso.
+
+Variáveis (.env):
+    OFFLOAD_PROCESSES=2        → processos do pool de CPU
+    OFFLOAD_THREADS=4          → threads do pool de I/O
+    OFFLOAD_MAX_BYTES=33554432 → maior payload aceito (32 MiB)
+    OFFLOAD_INLINE_BYTES=262144 → abaixo disso o parsing roda no próprio loop (mais barato que ir ao processo)
+    OFFLOAD_TIMEOUT=60         → segundos até desistir de uma tarefa
+"""
+import os
+import time
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+from core import metrics, jsoncodec
+
+logger = logging.getLogger(__name__)
+
+OFFLOAD_PROCESSES = int(os.getenv("OFFLOAD_PROCESSES", max(1, min(2, os.cpu_count() or 1))))
+OFFLOAD_THREADS = int(os.getenv("OFFLOAD_THREADS", 4))
+OFFLOAD_MAX_BYTES = int(os.getenv("OFFLOAD_MAX_BYTES", 32 * 1024 * 1024))
+OFFLOAD_INLINE_BYTES = int(os.getenv("OFFLOAD_INLINE_BYTES", 256 * 1024))
+OFFLOAD_TIMEOUT = float(os.getenv("OFFLOAD_TIMEOUT", 60))
+
+
+class PayloadTooLarge(ValueError):
+    """Payload maior que OFFLOAD_MAX_BYTES."""
+
+    def __init__(self, size: int, limit: int = OFFLOAD_MAX_BYTES):
+        super().__init__(f"payload de {size / 1024 / 1024:.1f} MiB excede o limite de {limit / 1024 / 1024:.0f} MiB")
+        self.size = size
+        self.limit = limit
+
+
+# ────────────────────────────────────────────────
+# Funções executadas no processo filho
+# ────────────────────────────────────────────────
+
+def _json_dumps(obj: Any, pretty: bool) -> bytes:
+    return jsoncodec.dumps(obj, pretty=pretty)
+
+
+def _json_loads(data: bytes) -> Any:
+    return jsoncodec.loads(data)
+
+
+class Offload:
+    def __init__(self, processes: int = OFFLOAD_PROCESSES, threads: int = OFFLOAD_THREADS):
+        self.processes = processes
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._thread_pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="offload-io")
+        self.in_flight = {"cpu": 0, "io": 0}
+        metrics.register_offload(self)
+
+    def _processes(self) -> ProcessPoolExecutor:
+        if self._process_pool is None:
+            # spawn: um fork com as threads do bot (logging, watchdog) vivas pode travar o filho
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=self.processes, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._process_pool
+
+    async def _run(self, pool: str, executor, fn: Callable, *args, task: str, timeout: float) -> Any:
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        self.in_flight[pool] += 1
+        try:
+            return await asyncio.wait_for(loop.run_in_executor(executor, fn, *args), timeout)
+        except BrokenProcessPool:
+            # Filho morreu (OOM, kill) → o próximo uso cria um pool novo
+            logger.error(f"Offload: pool de processos quebrado durante '{task}' — recriando")
+            self._process_pool = None
+            raise
+        finally:
+            self.in_flight[pool] -= 1
+            metrics.OFFLOAD_DURATION.observe(time.perf_counter() - start, pool=pool, task=task)
+
+    async def run_cpu(self, fn: Callable, *args, task: str = "cpu", timeout: float = OFFLOAD_TIMEOUT) -> Any:
+        """Roda `fn(*args)` no pool de processos (argumentos e retorno precisam ser picklable)."""
+        return await self._run("cpu", self._processes(), fn, *args, task=task, timeout=timeout)
+
+    async def run_io(self, fn: Callable, *args, task: str = "io", timeout: float = OFFLOAD_TIMEOUT) -> Any:
+        """Roda `fn(*args)` no pool de threads (I/O bloqueante)."""
+        return await self._run("io", self._thread_pool, fn, *args, task=task, timeout=timeout)
+
+    # ────────────────────────────────────────────────
+    # Atalhos
+    # ────────────────────────────────────────────────
+
+    def check_size(self, size: int, task: str):
+        if size > OFFLOAD_MAX_BYTES:
+            metrics.OFFLOAD_REJECTED.inc(task=task)
+            raise PayloadTooLarge(size)
+
+    async def json_dumps(self, obj: Any, pretty: bool = False, task: str = "json_dumps") -> bytes:
+        data = await self.run_cpu(_json_dumps, obj, pretty, task=task)
+        self.check_size(len(data), task)
+        return data
+
+    async def json_loads(self, data: bytes, task: str = "json_loads") -> Any:
+        self.check_size(len(data), task)
+        if len(data) < OFFLOAD_INLINE_BYTES:
+            return _json_loads(data)
+        return await self.run_cpu(_json_loads, data, task=task)
+
+    def shutdown(self):
+        self._thread_pool.shutdown(wait=False, cancel_futures=True)
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+            self._process_pool = None
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": dict(self.in_flight),
+            "process_pool": self._process_pool is not None,
+            "processes": self.processes,
+        }
@@ -0,0 +1,227 @@
+# core/pipeline.py
+"""
+Pipeline único de mensagens.
+
+Antes, cada cog (segurança, auto-mod, auto-resposta, XP) tinha o próprio
+`on_message`, relendo a config e refazendo `content.lower()` a cada
+mensagem. Agora o bot registra um único listener e roda as etapas em
+ordem sobre um `MessageContext` montado uma vez só:
+
+    security → automod → autoresponse → xp
+
+Os cogs registram a etapa no `cog_load` e removem no `cog_unload`:
+
+    self.bot.pipeline.register("xp", self.process_message)
+
+Se uma etapa apaga a mensagem (`await ctx.delete()`), as seguintes não
+rodam — spam apagado não ganha XP nem dispara auto-resposta.
+
+Sobrecarga (raid, onda de spam): as etapas críticas (security, automod)
+sempre rodam na hora. Se o atraso do event loop ou o número de mensagens
+em processamento passar do limite, as etapas de baixa prioridade
+(autoresponse, xp) são adiadas para uma fila que só anda quando a carga
+cai; o que ficar velho demais (ou não couber na fila) é descartado.
+
+Variáveis (.env):
+    SHED_LAG_MS=200        → atraso do loop que liga o modo sobrecarga
+    SHED_IN_FLIGHT=200     → mensagens em processamento ao mesmo tempo idem
+    SHED_MAX_AGE=30        → segundos que uma etapa adiada ainda vale a pena rodar
+    SHED_BACKLOG=500       → tamanho máximo da fila de adiadas
+"""
+import os
+import re
+import time
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+import discord
+
+from core import metrics
+from core.logging_setup import bind_log_context
+
+logger = logging.getLogger(__name__)
+
+SHED_LAG = float(os.getenv("SHED_LAG_MS", 200)) / 1000
+SHED_IN_FLIGHT = int(os.getenv("SHED_IN_FLIGHT", 200))
+SHED_MAX_AGE = float(os.getenv("SHED_MAX_AGE", 30))
+SHED_BACKLOG = int(os.getenv("SHED_BACKLOG", 500))
+
+URL_PATTERN = re.compile(r'https?://[^\s]+')
+
+# Ordem padrão das etapas conhecidas (menor roda primeiro)
+STAGE_ORDER = {
+    "security": 10,
+    "automod": 20,
+    "autoresponse": 30,
+    "xp": 40,
+}
+# Etapas que nunca são adiadas nem descartadas
+CRITICAL_STAGES = {"security", "automod"}
+
+
+class MessageContext:
+    """Dados derivados da mensagem, calculados uma vez e compartilhados entre as etapas."""
+
+    def __init__(self, bot, message: discord.Message):
+        self.bot = bot
+        self.message = message
+        self.guild_id = message.guild.id
+        self.content = message.content
+        self.content_lower = message.content.lower()
+        self.mention_count = len(message.raw_mentions) + len(message.raw_role_mentions) + (1 if message.mention_everyone else 0)
+        self.deleted = False
+        self.stopped = False
+        self._urls: Optional[List[str]] = None
+        self._configs: Dict[str, Any] = {}
+
+    @property
+    def urls(self) -> List[str]:
+        if self._urls is None:
+            self._urls = URL_PATTERN.findall(self.content)
+        return self._urls
+
+    async def config(self, name: str, loader: Callable[[int], Awaitable[Any]]):
+        """Busca uma config uma única vez por mensagem (`loader(guild_id)`)."""
+        if name not in self._configs:
+            self._configs[name] = await loader(self.guild_id)
+        return self._configs[name]
+
+    async def guild_config(self) -> Optional[dict]:
+        """Documento de `guild_configs` (somente leitura — compartilhado entre etapas)."""
+        return await self.config(
+            "guild",
+            lambda guild_id: self.bot.configs.get(self.bot.db.guild_configs, guild_id, copy_doc=False),
+        )
+
+    async def delete(self) -> bool:
+        """Apaga a mensagem e interrompe o pipeline. Retorna False se não conseguiu apagar."""
+        try:
+            await self.message.delete()
+        except discord.NotFound:
+            pass
+        except discord.HTTPException:
+            return False
+        self.deleted = True
+        self.stopped = True
+        return True
+
+    def stop(self):
+        """Interrompe as etapas seguintes sem apagar a mensagem."""
+        self.stopped = True
+
+
+@dataclass(order=True)
+class Stage:
+    order: int
+    name: str = field(compare=False)
+    handler: Callable[[MessageContext], Awaitable[None]] = field(compare=False)
+    critical: bool = field(default=False, compare=False)
+
+
+class MessagePipeline:
+    def __init__(self, bot):
+        self.bot = bot
+        self.stages: List[Stage] = []
+        self.in_flight = 0
+        # (instante, contexto, etapas restantes) adiados por sobrecarga
+        self._deferred: Deque[Tuple[float, MessageContext, List[Stage]]] = deque()
+        self._drain_task: Optional[asyncio.Task] = None
+        metrics.register_pipeline(self)
+
+    def register(self, name: str, handler: Callable[[MessageContext], Awaitable[None]],
+                 order: Optional[int] = None, critical: Optional[bool] = None):
+        self.unregister(name)
+        if critical is None:
+            critical = name in CRITICAL_STAGES
+        self.stages.append(Stage(order if order is not None else STAGE_ORDER.get(name, 100), name, handler, critical))
+        self.stages.sort()
+
+    def unregister(self, name: str):
+        self.stages = [s for s in self.stages if s.name != name]
+
+    # ────────────────────────────────────────────────
+    # Sobrecarga
+    # ────────────────────────────────────────────────
+
+    def overloaded(self) -> bool:
+        return self.in_flight > SHED_IN_FLIGHT or self.bot.loop_monitor.lag > SHED_LAG
+
+    def _defer(self, ctx: MessageContext, stages: List[Stage]):
+        if len(self._deferred) >= SHED_BACKLOG:
+            _, _, dropped = self._deferred.popleft()
+            for stage in dropped:
+                metrics.PIPELINE_SHED.inc(stage=stage.name, action="dropped")
+        self._deferred.append((time.monotonic(), ctx, stages))
+        for stage in stages:
+            metrics.PIPELINE_SHED.inc(stage=stage.name, action="deferred")
+        if self._drain_task is None or self._drain_task.done():
+            logger.warning("Pipeline sobrecarregado: adiando etapas de baixa prioridade")
+            self._drain_task = asyncio.create_task(self._drain(), name="pipeline-deferred")
+
+    async def _drain(self):
+        """Roda as etapas adiadas quando a carga cai; descarta as que ficaram velhas."""
+        while self._deferred:
+            if self.overloaded():
+                await asyncio.sleep(0.5)
+                continue
+            queued_at, ctx, stages = self._deferred.popleft()
+            if time.monotonic() - queued_at > SHED_MAX_AGE:
+                for stage in stages:
+                    metrics.PIPELINE_SHED.inc(stage=stage.name, action="dropped")
+                continue
+            if ctx.stopped:
+                continue
+            bind_log_context(guild_id=ctx.guild_id, user_id=ctx.message.author.id)
+            await self._run_stages(ctx, stages)
+            await asyncio.sleep(0)
+        logger.info("Pipeline normalizado: fila de etapas adiadas vazia")
+
+    def stop(self):
+        if self._drain_task is not None:
+            self._drain_task.cancel()
+            self._drain_task = None
+        self._deferred.clear()
+
+    def stats(self) -> dict:
+        return {"in_flight": self.in_flight, "deferred": len(self._deferred), "overloaded": self.overloaded()}
+
+    # ────────────────────────────────────────────────
+    # Execução
+    # ────────────────────────────────────────────────
+
+    async def _run_stages(self, ctx: MessageContext, stages: List[Stage], shed: bool = False):
+        for index, stage in enumerate(stages):
+            if shed and not stage.critical and self.overloaded():
+                # Daqui em diante só roda o que for crítico; o resto espera a carga cair
+                critical = [s for s in stages[index:] if s.critical]
+                self._defer(ctx, [s for s in stages[index:] if not s.critical])
+                if not critical:
+                    return
+                await self._run_stages(ctx, critical)
+                return
+            bind_log_context(cog=stage.name)
+            start = time.perf_counter()
+            try:
+                await stage.handler(ctx)
+            except Exception as e:
+                logger.error(f"Erro na etapa '{stage.name}' do pipeline de mensagens: {e}", exc_info=e)
+            elapsed = (time.perf_counter() - start) * 1000
+            if elapsed > 500:
+                logger.warning(f"Etapa '{stage.name}' demorou {elapsed:.0f}ms (guild {ctx.guild_id})")
+            if ctx.stopped:
+                break
+
+    async def process(self, message: discord.Message):
+        if message.author.bot or not message.guild or not self.stages:
+            return
+
+        ctx = MessageContext(self.bot, message)
+        bind_log_context(guild_id=ctx.guild_id, user_id=message.author.id)
+        self.in_flight += 1
+        try:
+            await self._run_stages(ctx, list(self.stages), shed=True)
+        finally:
+            self.in_flight -= 1
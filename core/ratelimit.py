@@ -0,0 +1,222 @@
+# core/ratelimit.py
+"""
+Rate limit dos slash commands com token buckets.
+
+Cada comando custa `cost` fichas (ver COMMAND_COSTS) e precisa de saldo em
+três baldes ao mesmo tempo:
+
+    usuário → impede um usuário de floodar (o mais comum)
+    servidor → impede um servidor inteiro de monopolizar o bot
+    global   → protege o processo (e o limite global da API do Discord)
+
+Os baldes se recarregam continuamente, então quem usa o bot normalmente
+nunca esbarra no limite; `/coinflip` custa 1 ficha e `/backup` custa 10.
+
+Memória limitada: um balde que voltou a ficar cheio é igual a um balde
+inexistente, então ele é descartado. Para isso cada balde é agendado numa
+timer wheel (1 slot por segundo) para o instante em que estará cheio.
+
+Configuração (.env), no formato "capacidade/segundos":
+    RATELIMIT_USER=10/60      RATELIMIT_GUILD=60/60      RATELIMIT_GLOBAL=300/10
+    COMMAND_COSTS=backup=10,restore=10,rank=3
+"""
+import os
+import time
+import asyncio
+import logging
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COST = 2
+
+# Custo por comando (nome qualificado do slash command)
+COMMAND_COSTS: Dict[str, int] = {
+    # Baratos: só respondem
+    "coinflip": 1, "eightball": 1, "meme": 1, "botinfo": 1, "serverinfo": 1,
+    "balance": 1, "xp": 1,
+    # Consultas mais pesadas ao banco
+    "rank": 3, "casamentos": 3, "infractions": 3,
+    # Muitas chamadas à API do Discord
+    "clear": 4, "lockdown": 5, "unlockdown": 5, "sorteio": 3,
+    "backup": 10, "restore": 10, "cleardb": 10,
+}
+
+
+def parse_rate(value: str, default: Tuple[float, float]) -> Tuple[float, float]:
+    """"10/60" → (capacidade=10, recarga=10 fichas a cada 60s)."""
+    if not value:
+        return default
+    try:
+        capacity, seconds = value.split("/", 1)
+        return float(capacity), float(seconds)
+    except ValueError:
+        logger.warning(f"Rate limit inválido '{value}', usando {default[0]:g}/{default[1]:g}")
+        return default
+
+
+def parse_costs(value: str) -> Dict[str, int]:
+    costs = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        name, _, cost = item.partition("=")
+        try:
+            costs[name.strip()] = int(cost)
+        except ValueError:
+            logger.warning(f"Custo inválido em COMMAND_COSTS: '{item}'")
+    return costs
+
+
+class TokenBucket:
+    __slots__ = ("capacity", "rate", "tokens", "updated")
+
+    def __init__(self, capacity: float, per_seconds: float, now: float):
+        self.capacity = capacity
+        self.rate = capacity / per_seconds  # fichas por segundo
+        self.tokens = capacity
+        self.updated = now
+
+    def _refill(self, now: float):
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def retry_after(self, cost: float, now: float) -> float:
+        """0 se há saldo para `cost`; senão, segundos até haver."""
+        self._refill(now)
+        if self.tokens >= cost:
+            return 0.0
+        if cost > self.capacity:
+            cost = self.capacity  # comando mais caro que o balde: espera encher
+        return (cost - self.tokens) / self.rate
+
+    def consume(self, cost: float):
+        self.tokens = max(0.0, self.tokens - cost)
+
+    def full_at(self) -> float:
+        return self.updated + (self.capacity - self.tokens) / self.rate
+
+
+class TimerWheel:
+    """Timer wheel simples (slots de 1s) para expirar chaves sem varrer o dicionário inteiro."""
+
+    def __init__(self, slots: int = 128):
+        self.slots: List[Set[Hashable]] = [set() for _ in range(slots)]
+        self.position = int(time.monotonic())
+
+    def schedule(self, key: Hashable, when: float):
+        slot = max(int(when), self.position + 1)
+        self.slots[slot % len(self.slots)].add(key)
+
+    def advance(self, now: float) -> List[Hashable]:
+        """Retorna as chaves dos slots que passaram (podem estar reagendadas — o chamador confere)."""
+        due = []
+        target = int(now)
+        # Se ficou muito tempo sem avançar, uma volta completa cobre tudo
+        steps = min(target - self.position, len(self.slots))
+        for i in range(1, steps + 1):
+            bucket = self.slots[(self.position + i) % len(self.slots)]
+            due.extend(bucket)
+            bucket.clear()
+        self.position = max(self.position, target)
+        return due
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        user: Tuple[float, float] = (10, 60),
+        guild: Tuple[float, float] = (60, 60),
+        global_: Tuple[float, float] = (300, 10),
+        costs: Optional[Dict[str, int]] = None,
+        default_cost: int = DEFAULT_COST,
+    ):
+        self.limits = {"user": user, "guild": guild}
+        self.costs = dict(COMMAND_COSTS, **(costs or {}))
+        self.default_cost = default_cost
+        self.buckets: Dict[Tuple[str, int], TokenBucket] = {}
+        self.global_bucket = TokenBucket(*global_, time.monotonic())
+        self.wheel = TimerWheel()
+        self.denied: Dict[str, int] = {"user": 0, "guild": 0, "global": 0}
+        self._task = None
+
+    @classmethod
+    def from_env(cls) -> "RateLimiter":
+        return cls(
+            user=parse_rate(os.getenv("RATELIMIT_USER"), (10, 60)),
+            guild=parse_rate(os.getenv("RATELIMIT_GUILD"), (60, 60)),
+            global_=parse_rate(os.getenv("RATELIMIT_GLOBAL"), (300, 10)),
+            costs=parse_costs(os.getenv("COMMAND_COSTS", "")),
+        )
+
+    def cost_of(self, command: str) -> int:
+        return self.costs.get(command, self.default_cost)
+
+    def _bucket(self, scope: str, key: int, now: float) -> TokenBucket:
+        bucket = self.buckets.get((scope, key))
+        if bucket is None:
+            bucket = self.buckets[(scope, key)] = TokenBucket(*self.limits[scope], now)
+            # Mesmo se o comando for negado em outro escopo, o balde novo precisa expirar
+            self.wheel.schedule((scope, key), now)
+        return bucket
+
+    def acquire(self, user_id: int, guild_id: Optional[int], command: str) -> Optional[Tuple[str, float]]:
+        """
+        Tenta gastar o custo do comando nos três baldes.
+        Retorna None se liberado, ou (escopo, segundos_para_tentar_de_novo).
+        Nada é consumido quando algum balde nega.
+        """
+        now = time.monotonic()
+        cost = self.cost_of(command)
+        buckets = [("user", self._bucket("user", user_id, now))]
+        if guild_id is not None:
+            buckets.append(("guild", self._bucket("guild", guild_id, now)))
+        buckets.append(("global", self.global_bucket))
+
+        for scope, bucket in buckets:
+            wait = bucket.retry_after(cost, now)
+            if wait > 0:
+                self.denied[scope] += 1
+                return scope, wait
+
+        for scope, bucket in buckets:
+            bucket.consume(cost)
+            if scope != "global":
+                self.wheel.schedule((scope, user_id if scope == "user" else guild_id), bucket.full_at())
+        return None
+
+    # ────────────────────────────────────────────────
+    # Expiração (timer wheel)
+    # ────────────────────────────────────────────────
+
+    def evict(self) -> int:
+        now = time.monotonic()
+        evicted = 0
+        for key in self.wheel.advance(now):
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                continue
+            full_at = bucket.full_at()
+            if full_at <= now:
+                del self.buckets[key]
+                evicted += 1
+            else:
+                # Foi usado de novo depois de agendado → reagenda para o novo instante
+                self.wheel.schedule(key, full_at)
+        return evicted
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._evict_loop(), name="ratelimit-evict")
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _evict_loop(self):
+        while True:
+            await asyncio.sleep(1)
+            self.evict()
+
+    def stats(self) -> dict:
+        return {"buckets": len(self.buckets), "denied": dict(self.denied)}
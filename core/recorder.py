@@ -0,0 +1,292 @@
+# core/recorder.py
+"""
+Gravação anonimizada de eventos do gateway (para o bench.py).
+
+Com GATEWAY_RECORD definido, o bot grava os eventos que alimentam os cogs
+do caminho quente num arquivo JSONL compactado com gzip:
+
+    {"format": "gateway-record", "version": 1, "started_at": ..., "events": [...]}   ← cabeçalho
+    [0.0, "READY", {"user": {...}}]
+    [0.013, "GUILD_CREATE", {...}]
+    [1.204, "MESSAGE_CREATE", {...}]                                                  ← [segundos desde o início, tipo, dados]
+
+A gravação pega o payload cru, antes do discord.py montar os objetos
+(`ConnectionState.parsers`), então o replay passa pelo mesmo parsing.
+
+Anonimização (nada identificável sai do processo):
+    - ids (snowflakes): os 42 bits do timestamp são mantidos (idade da
+      conta, ordem das mensagens) e os 22 bits de baixo viram um HMAC com
+      o sal — o mesmo id vira sempre o mesmo id dentro de uma gravação;
+    - texto: cada palavra vira uma pseudo-palavra do mesmo tamanho e com as
+      mesmas maiúsculas (a regra de CAPS e a de repetição continuam
+      valendo); menções `<@id>`/`<#id>`/`<@&id>` têm o id trocado; links
+      viram example.com, exceto convites do Discord (o anti-links trata
+      os dois de formas diferentes);
+    - nomes de usuários, apelidos, servidores e canais viram pseudônimos;
+      nomes de cargos são mantidos (cogs procuram cargos pelo nome, ex.:
+      "Muted");
+    - avatares, ícones, anexos, embeds, tokens de interação e e-mails
+      são removidos ou trocados.
+
+Variáveis (.env):
+    GATEWAY_RECORD=gravacao.jsonl.gz    → liga a gravação (vazio = desligada)
+    GATEWAY_RECORD_SALT=...             → sal do HMAC (padrão: aleatório por gravação)
+    GATEWAY_RECORD_MAX_EVENTS=100000    → para de gravar depois disso
+"""
+import os
+import re
+import gzip
+import hmac
+import time
+import asyncio
+import hashlib
+import logging
+import secrets
+from typing import Any, Iterator, List, Optional, Set, Tuple
+
+from core import jsoncodec
+
+logger = logging.getLogger(__name__)
+
+GATEWAY_RECORD = os.getenv("GATEWAY_RECORD", "").strip()
+GATEWAY_RECORD_SALT = os.getenv("GATEWAY_RECORD_SALT", "").strip()
+GATEWAY_RECORD_MAX_EVENTS = int(os.getenv("GATEWAY_RECORD_MAX_EVENTS", 100_000))
+FLUSH_EVENTS = 200
+
+FORMAT = "gateway-record"
+VERSION = 1
+
+# Eventos gravados (o resto do gateway não passa pelos cogs medidos)
+RECORDED_EVENTS = ("READY", "GUILD_CREATE", "MESSAGE_CREATE", "GUILD_MEMBER_ADD", "INTERACTION_CREATE")
+
+SNOWFLAKE = re.compile(r"^\d{15,20}$")
+MENTION = re.compile(r"<(@!?|@&|#)(\d{15,20})>")
+URL = re.compile(r"https?://[^\s]+")
+INVITE = re.compile(r"https?://(?:www\.)?(?:discord\.gg|discord(?:app)?\.com/invite)/", re.IGNORECASE)
+WORD = re.compile(r"[^\W\d_]+")
+
+# Campos numéricos em string que não são ids
+NOT_SNOWFLAKE = {"permissions", "allow", "deny", "app_permissions", "permissions_new", "nonce"}
+# Removidos (None): imagens e textos livres sem uso nos cogs medidos
+DROPPED = {
+    "avatar", "banner", "icon", "splash", "discovery_splash", "avatar_decoration_data", "bio",
+    "topic", "description", "email", "clan", "primary_guild", "collectibles", "vanity_url_code",
+}
+EMPTIED = {"attachments", "embeds", "sticker_items", "stickers", "emojis", "components", "activities"}
+PSEUDONYMS = {"username": "user", "global_name": "user", "nick": "nick"}
+
+
+class Anonymizer:
+    def __init__(self, salt: Optional[str] = None):
+        self._key = (salt or secrets.token_hex(16)).encode()
+
+    def _digest(self, value: str) -> bytes:
+        return hmac.new(self._key, value.encode(), hashlib.sha256).digest()
+
+    def snowflake(self, value: str) -> str:
+        """Mesmo timestamp (42 bits de cima), bits de baixo trocados pelo HMAC."""
+        number = int(value)
+        low = int.from_bytes(self._digest(value)[:4], "big") & 0x3FFFFF
+        return str(((number >> 22) << 22) | low)
+
+    def pseudonym(self, prefix: str, value: str) -> str:
+        return f"{prefix}-{self._digest(value).hex()[:8]}"
+
+    def _word(self, word: str) -> str:
+        digest = self._digest(word.lower())
+        letters = [chr(ord("a") + digest[i % len(digest)] % 26) for i in range(len(word))]
+        return "".join(c.upper() if o.isupper() else c for c, o in zip(letters, word))
+
+    def _url(self, url: str) -> str:
+        match = INVITE.match(url)
+        if match:
+            return f"https://discord.gg/{self._digest(url).hex()[:8]}"
+        return f"https://example.com/{self._digest(url).hex()[:len(url) % 24 + 4]}"
+
+    def text(self, value: str) -> str:
+        """Mesmo tamanho aproximado, mesmas maiúsculas, menções e tipo de link preservados."""
+        parts = []
+        last = 0
+        for match in URL.finditer(value):
+            parts.append(self._plain(value[last:match.start()]))
+            parts.append(self._url(match.group(0)))
+            last = match.end()
+        parts.append(self._plain(value[last:]))
+        return "".join(parts)
+
+    def _plain(self, value: str) -> str:
+        value = MENTION.sub(lambda m: f"<{m.group(1)}{self.snowflake(m.group(2))}>", value)
+        # Dentro das menções só há dígitos e símbolos, que a regex de palavras não pega
+        return WORD.sub(lambda m: self._word(m.group(0)), value)
+
+    def payload(self, data: Any, key: str = "") -> Any:
+        if isinstance(data, dict):
+            return {self._key_of(k): self._field(k, v) for k, v in data.items()}
+        if isinstance(data, list):
+            return [self.payload(v, key) for v in data]
+        if isinstance(data, str) and key not in NOT_SNOWFLAKE and SNOWFLAKE.match(data):
+            return self.snowflake(data)
+        return data
+
+    def _key_of(self, key: str) -> str:
+        # `resolved` das interações usa ids como chave
+        return self.snowflake(key) if SNOWFLAKE.match(key) else key
+
+    def _field(self, key: str, value: Any) -> Any:
+        if value is None:
+            return None
+        if key in DROPPED:
+            return None
+        if key in EMPTIED:
+            return []
+        if key == "token":
+            return secrets.token_urlsafe(32)
+        if key in PSEUDONYMS and isinstance(value, str):
+            return self.pseudonym(PSEUDONYMS[key], value)
+        if key == "content" and isinstance(value, str):
+            return self.text(value)
+        if key == "value" and isinstance(value, str) and not SNOWFLAKE.match(value):
+            return self.text(value)  # opções de texto de slash commands
+        return self.payload(value, key)
+
+    def guild(self, data: dict) -> dict:
+        data = self.payload(data)
+        data["name"] = self.pseudonym("guild", data.get("name") or "")
+        for channel in data.get("channels") or []:
+            channel["name"] = self.pseudonym("canal", channel.get("name") or "")
+        for thread in data.get("threads") or []:
+            thread["name"] = self.pseudonym("topico", thread.get("name") or "")
+        data["presences"] = []
+        data["voice_states"] = []
+        return data
+
+
+# ────────────────────────────────────────────────
+# Gravação
+# ────────────────────────────────────────────────
+
+class GatewayRecorder:
+    """Envolve os parsers do discord.py e grava os eventos (ver docstring do módulo)."""
+
+    def __init__(self, bot, path: str, salt: Optional[str] = None, max_events: int = GATEWAY_RECORD_MAX_EVENTS):
+        self.bot = bot
+        self.path = path
+        self.max_events = max_events
+        self.anonymizer = Anonymizer(salt)
+        self.events = 0
+        self.started = time.monotonic()
+        self._buffer: List[bytes] = []
+        self.recording = True
+        self._pending: Set[asyncio.Task] = set()
+        self._lock = asyncio.Lock()
+        self._file = gzip.open(path, "wb")
+        self._write([jsoncodec.dumps({
+            "format": FORMAT,
+            "version": VERSION,
+            "started_at": time.time(),
+            "events": list(RECORDED_EVENTS),
+        }) + b"\n"])
+        self._install()
+        logger.warning(f"Gravando eventos do gateway (anonimizados) em {path}")
+
+    @classmethod
+    def from_env(cls, bot) -> Optional["GatewayRecorder"]:
+        if not GATEWAY_RECORD:
+            return None
+        return cls(bot, GATEWAY_RECORD, GATEWAY_RECORD_SALT or None)
+
+    def _install(self):
+        parsers = self.bot._connection.parsers  # o mesmo dict usado pelo websocket
+        for event in RECORDED_EVENTS:
+            original = parsers.get(event)
+            if original is not None:
+                parsers[event] = self._wrap(event, original)
+
+    def _wrap(self, event: str, original):
+        def parser(data):
+            if self.recording:
+                try:
+                    self.record(event, data)
+                except Exception as e:
+                    logger.error(f"Erro ao gravar evento {event}: {e}")
+            return original(data)
+        return parser
+
+    def _anonymize(self, event: str, data: dict) -> dict:
+        if event == "READY":
+            # Só o usuário do bot; os servidores chegam depois, completos, nos GUILD_CREATE
+            return {"user": self.anonymizer.payload(data["user"])}
+        if event == "GUILD_CREATE":
+            return self.anonymizer.guild(data)
+        data = self.anonymizer.payload(data)
+        if event == "INTERACTION_CREATE" and isinstance(data.get("channel"), dict):
+            data["channel"]["name"] = self.anonymizer.pseudonym("canal", data["channel"].get("name") or "")
+        return data
+
+    def record(self, event: str, data: dict):
+        line = [round(time.monotonic() - self.started, 4), event, self._anonymize(event, data)]
+        self._buffer.append(jsoncodec.dumps(line) + b"\n")
+        self.events += 1
+        if self.events >= self.max_events:
+            logger.warning(f"Gravação do gateway atingiu {self.max_events} eventos — parando")
+            self.recording = False
+        if len(self._buffer) >= FLUSH_EVENTS or not self.recording:
+            lines, self._buffer = self._buffer, []
+            task = asyncio.create_task(self._flush(lines), name="gateway-record")
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+
+    async def _flush(self, lines: List[bytes]):
+        async with self._lock:  # mantém a ordem das linhas
+            await self.bot.offload.run_io(self._write, lines, task="gateway_record")
+
+    def _write(self, lines: List[bytes]):
+        if self._file is not None:
+            self._file.write(b"".join(lines))
+
+    async def close(self):
+        if self._file is None:
+            return
+        self.recording = False
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        lines, self._buffer = self._buffer, []
+        self._write(lines)
+        self._file.close()
+        self._file = None
+        logger.info(f"Gravação do gateway encerrada: {self.events} eventos em {self.path}")
+
+    def stats(self) -> dict:
+        return {"path": self.path, "events": self.events, "recording": self.recording}
+
+
+# ────────────────────────────────────────────────
+# Leitura
+# ────────────────────────────────────────────────
+
+def read_recording(path: str) -> Tuple[dict, Iterator[Tuple[float, str, dict]]]:
+    """(cabeçalho, eventos) de um arquivo gravado (ou gerado pelo bench.py)."""
+    handle = gzip.open(path, "rb")
+    header = jsoncodec.loads(handle.readline())
+    if header.get("format") != FORMAT:
+        handle.close()
+        raise ValueError(f"{path} não é uma gravação do gateway")
+
+    def events():
+        with handle:
+            for line in handle:
+                if line.strip():
+                    offset, event, data = jsoncodec.loads(line)
+                    yield offset, event, data
+    return header, events()
+
+
+def write_recording(path: str, events: List[Tuple[float, str, dict]], **header: Any):
+    """Grava uma lista de eventos já anonimizados (gravações sintéticas)."""
+    with gzip.open(path, "wb") as handle:
+        handle.write(jsoncodec.dumps({
+            "format": FORMAT, "version": VERSION, "started_at": time.time(),
+            "events": list(RECORDED_EVENTS), **header,
+        }) + b"\n")
+        for event in events:
+            handle.write(jsoncodec.dumps(list(event)) + b"\n")
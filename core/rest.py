@@ -0,0 +1,261 @@
+# core/rest.py
+"""
+Agendador das chamadas REST em massa (lockdown, restore, anti-raid...).
+
+O discord.py já respeita os rate limits, mas cada chamada entra na fila do
+bucket dela na ordem em que chegou: um restore com 300 canais ocupa os
+workers e o ban do anti-raid de outro servidor espera atrás dele. Aqui os
+trabalhos passam por uma fila central que:
+
+    - olha o estado dos buckets que o discord.py aprendeu (`http._buckets`):
+      bucket esgotado → o trabalho espera o reset sem ocupar vaga; bucket
+      com saldo → roda em paralelo até o limite dele;
+    - atende primeiro MODERATION (ban/kick/mute/lockdown), depois NORMAL,
+      por último BULK (restore, edições cosméticas);
+    - dentro da mesma prioridade, alterna entre servidores (round-robin),
+      então nenhum servidor monopoliza a capacidade;
+    - dentro do mesmo servidor e prioridade, mantém a ordem de envio.
+
+Uso:
+    await bot.rest.run(
+        lambda: member.ban(reason="..."),
+        guild_id=guild.id, route=routes.BAN, priority=Priority.MODERATION,
+    )
+
+Variáveis (.env):
+    REST_CONCURRENCY=8   → máximo de chamadas do agendador em voo ao mesmo tempo
+"""
+import os
+import time
+import asyncio
+import logging
+from enum import IntEnum
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from core import metrics
+
+logger = logging.getLogger(__name__)
+
+REST_CONCURRENCY = int(os.getenv("REST_CONCURRENCY", 8))
+
+
+class Priority(IntEnum):
+    MODERATION = 0
+    NORMAL = 1
+    BULK = 2
+
+
+# ────────────────────────────────────────────────
+# Rotas (mesmo método/caminho que o discord.py usa em discord/http.py)
+# ────────────────────────────────────────────────
+
+@dataclass(frozen=True)
+class RestRoute:
+    method: str
+    path: str
+    major: str  # "channel_id" ou "guild_id" — parâmetro que separa os buckets
+
+    @property
+    def key(self) -> str:
+        return f"{self.method} {self.path}"
+
+
+class routes:
+    EDIT_CHANNEL_PERMISSIONS = RestRoute("PUT", "/channels/{channel_id}/permissions/{target}", "channel_id")
+    DELETE_CHANNEL = RestRoute("DELETE", "/channels/{channel_id}", "channel_id")
+    CREATE_CHANNEL = RestRoute("POST", "/guilds/{guild_id}/channels", "guild_id")
+    CREATE_ROLE = RestRoute("POST", "/guilds/{guild_id}/roles", "guild_id")
+    EDIT_ROLE = RestRoute("PATCH", "/guilds/{guild_id}/roles/{role_id}", "guild_id")
+    DELETE_ROLE = RestRoute("DELETE", "/guilds/{guild_id}/roles/{role_id}", "guild_id")
+    BAN = RestRoute("PUT", "/guilds/{guild_id}/bans/{user_id}", "guild_id")
+    KICK = RestRoute("DELETE", "/guilds/{guild_id}/members/{user_id}", "guild_id")
+    ADD_ROLE = RestRoute("PUT", "/guilds/{guild_id}/members/{user_id}/roles/{role_id}", "guild_id")
+    REMOVE_ROLE = RestRoute("DELETE", "/guilds/{guild_id}/members/{user_id}/roles/{role_id}", "guild_id")
+
+
+@dataclass
+class RestJob:
+    factory: Callable[[], Awaitable[Any]]
+    guild_id: int
+    priority: Priority
+    route: Optional[RestRoute]
+    major_id: Optional[int]
+    future: asyncio.Future
+    queued_at: float = field(default_factory=time.monotonic)
+
+
+class RestScheduler:
+    def __init__(self, bot, concurrency: int = REST_CONCURRENCY):
+        self.bot = bot
+        self.concurrency = concurrency
+        # prioridade → servidor → fila (OrderedDict = ordem do round-robin)
+        self._queues: Dict[Priority, "OrderedDict[int, Deque[RestJob]]"] = {p: OrderedDict() for p in Priority}
+        self._in_flight = 0
+        self._in_flight_by_bucket: Dict[str, int] = {}
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.completed = 0
+        self.failed = 0
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._dispatch_loop(), name="rest-scheduler")
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for queues in self._queues.values():
+            for queue in queues.values():
+                for job in queue:
+                    if not job.future.done():
+                        job.future.cancel()
+            queues.clear()
+
+    # ────────────────────────────────────────────────
+    # API
+    # ────────────────────────────────────────────────
+
+    def submit(
+        self,
+        factory: Callable[[], Awaitable[Any]],
+        *,
+        guild_id: int,
+        route: Optional[RestRoute] = None,
+        major_id: Optional[int] = None,
+        priority: Priority = Priority.NORMAL,
+    ) -> asyncio.Future:
+        """
+        Enfileira `factory` (função que cria a corrotina da chamada) e devolve
+        um Future com o resultado. `major_id` é o id do canal/servidor que
+        separa o bucket (padrão: o próprio servidor).
+        """
+        if major_id is None and route is not None and route.major == "guild_id":
+            major_id = guild_id
+        future = asyncio.get_running_loop().create_future()
+        job = RestJob(factory, guild_id, Priority(priority), route, major_id, future)
+        self._queues[job.priority].setdefault(guild_id, deque()).append(job)
+        metrics.REST_QUEUE.inc(priority=job.priority.name.lower())
+        self._wakeup.set()
+        if self._task is None:
+            self.start()
+        return future
+
+    async def run(self, factory, **kwargs) -> Any:
+        return await self.submit(factory, **kwargs)
+
+    async def run_many(self, factories: Iterable[Callable[[], Awaitable[Any]]], **kwargs) -> List[Any]:
+        """Enfileira várias chamadas de uma vez; exceções voltam na lista (como gather(return_exceptions=True))."""
+        futures = [self.submit(factory, **kwargs) for factory in factories]
+        return await asyncio.gather(*futures, return_exceptions=True)
+
+    # ────────────────────────────────────────────────
+    # Buckets (estado aprendido pelo discord.py)
+    # ────────────────────────────────────────────────
+
+    def _bucket_key(self, job: RestJob) -> Optional[str]:
+        if job.route is None:
+            return None
+        http = self.bot.http
+        major = str(job.major_id) if job.major_id is not None else ""
+        bucket_hash = http._bucket_hashes.get(job.route.key)
+        return f"{bucket_hash or job.route.key}:{major}"
+
+    def _capacity(self, key: Optional[str], now: float) -> Tuple[int, Optional[float]]:
+        """(vagas livres no bucket, instante do reset se estiver esgotado)."""
+        if key is None:
+            return self.concurrency, None
+        in_flight = self._in_flight_by_bucket.get(key, 0)
+        ratelimit = self.bot.http._buckets.get(key)
+        if ratelimit is None or not ratelimit.dirty:
+            # Bucket ainda desconhecido → uma chamada por vez até o Discord dizer o limite
+            return 1 - in_flight, None
+        if ratelimit.expires is not None and now < ratelimit.expires:
+            if ratelimit.remaining <= 0:
+                return 0, ratelimit.expires
+            return ratelimit.remaining - in_flight, None
+        return max(1, ratelimit.limit) - in_flight, None
+
+    def _next_job(self) -> Tuple[Optional[RestJob], Optional[float]]:
+        """Próximo trabalho que pode rodar agora, e quando reavaliar se nenhum puder."""
+        now = asyncio.get_running_loop().time()
+        retry_at = None
+        for priority in Priority:
+            queues = self._queues[priority]
+            for guild_id in list(queues):
+                queue = queues[guild_id]
+                job = queue[0]
+                key = self._bucket_key(job)
+                free, reset_at = self._capacity(key, now)
+                if free <= 0:
+                    if reset_at is not None:
+                        retry_at = reset_at if retry_at is None else min(retry_at, reset_at)
+                    continue
+                queue.popleft()
+                # Round-robin: o servidor atendido vai para o fim da fila
+                del queues[guild_id]
+                if queue:
+                    queues[guild_id] = queue
+                return job, retry_at
+        return None, retry_at
+
+    # ────────────────────────────────────────────────
+    # Execução
+    # ────────────────────────────────────────────────
+
+    async def _dispatch_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            self._wakeup.clear()
+            job, retry_at = (None, None) if self._in_flight >= self.concurrency else self._next_job()
+            if job is None:
+                timeout = None if retry_at is None else max(0.05, retry_at - loop.time())
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            if job.future.cancelled():
+                metrics.REST_QUEUE.dec(priority=job.priority.name.lower())
+                continue
+            key = self._bucket_key(job)
+            self._in_flight += 1
+            if key is not None:
+                self._in_flight_by_bucket[key] = self._in_flight_by_bucket.get(key, 0) + 1
+            asyncio.create_task(self._execute(job, key), name=f"rest-job-{job.guild_id}")
+
+    async def _execute(self, job: RestJob, key: Optional[str]):
+        priority = job.priority.name.lower()
+        metrics.REST_QUEUE.dec(priority=priority)
+        metrics.REST_QUEUE_WAIT.observe(time.monotonic() - job.queued_at, priority=priority)
+        try:
+            result = await job.factory()
+        except Exception as e:
+            self.failed += 1
+            if not job.future.done():
+                job.future.set_exception(e)
+        else:
+            self.completed += 1
+            if not job.future.done():
+                job.future.set_result(result)
+        finally:
+            self._in_flight -= 1
+            if key is not None:
+                remaining = self._in_flight_by_bucket.get(key, 1) - 1
+                if remaining > 0:
+                    self._in_flight_by_bucket[key] = remaining
+                else:
+                    self._in_flight_by_bucket.pop(key, None)
+            self._wakeup.set()
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self._in_flight,
+            "queued": {p.name.lower(): sum(len(q) for q in self._queues[p].values()) for p in Priority},
+            "guilds_waiting": len({g for queues in self._queues.values() for g in queues}),
+            "completed": self.completed,
+            "failed": self.failed,
+        }
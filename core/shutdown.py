@@ -0,0 +1,105 @@
+# core/shutdown.py
+"""
+Encerramento ordenado (SIGTERM de redeploy no Render/Railway).
+
+    1. para de aceitar interações novas (quem chega recebe "reiniciando");
+    2. espera os comandos e trabalhos em andamento até o prazo
+       (SHUTDOWN_GRACE, padrão 20s — o Render mata com SIGKILL aos 30s);
+    3. cancela o que sobrou e roda os "flushes" registrados (ex.: a agenda
+       de tarefas salva o que ainda está pendente);
+    4. fecha o gateway e o MongoDB (`bot.close()`).
+
+Comandos slash são rastreados automaticamente pelo check global do main.py.
+Trabalho fora de comandos (botões, views) usa `async with bot.shutdown.hold():`.
+"""
+import os
+import time
+import asyncio
+import logging
+import contextlib
+from typing import Awaitable, Callable, List, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+SHUTDOWN_GRACE = float(os.getenv("SHUTDOWN_GRACE", 20))
+FLUSH_TIMEOUT = float(os.getenv("SHUTDOWN_FLUSH_TIMEOUT", 5))
+
+
+class ShuttingDown(Exception):
+    """Levantada por `hold()` quando o bot já está encerrando."""
+
+
+class ShutdownCoordinator:
+    def __init__(self, bot, grace: float = SHUTDOWN_GRACE):
+        self.bot = bot
+        self.grace = grace
+        self.accepting = True
+        self._in_flight: Set[asyncio.Task] = set()
+        self._flushes: List[Tuple[str, Callable[[], Awaitable[None]]]] = []
+        self._done = asyncio.Event()
+        self._started = False
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._in_flight)
+
+    def track(self, task: asyncio.Task = None) -> bool:
+        """
+        Marca a task (padrão: a atual) como trabalho em andamento até ela terminar.
+        Retorna False se o bot já está encerrando (o chamador deve desistir).
+        """
+        if not self.accepting:
+            return False
+        task = task or asyncio.current_task()
+        if task is not None and task not in self._in_flight:
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+        return True
+
+    @contextlib.asynccontextmanager
+    async def hold(self):
+        """Trecho que não deve ser interrompido por um redeploy (até o prazo)."""
+        if not self.track():
+            raise ShuttingDown()
+        yield
+
+    def register_flush(self, name: str, flush: Callable[[], Awaitable[None]]):
+        """`flush()` roda uma vez no encerramento, depois de drenar o trabalho em andamento."""
+        self._flushes.append((name, flush))
+
+    async def shutdown(self):
+        if self._started:
+            await self._done.wait()
+            return
+        self._started = True
+        self.accepting = False
+        started = time.monotonic()
+
+        # 2. Drena o que está em andamento (menos a própria task do encerramento)
+        pending = {t for t in self._in_flight if t is not asyncio.current_task() and not t.done()}
+        if pending:
+            logger.info(f"Encerrando: aguardando {len(pending)} comando(s)/tarefa(s) em andamento (até {self.grace:.0f}s)")
+            _, still_running = await asyncio.wait(pending, timeout=self.grace)
+            if still_running:
+                logger.warning(f"Encerrando: {len(still_running)} tarefa(s) não terminaram no prazo — cancelando")
+                for task in still_running:
+                    task.cancel()
+                await asyncio.wait(still_running, timeout=2)
+
+        # 3. Flushes (agenda de tarefas, buffers...)
+        for name, flush in self._flushes:
+            try:
+                await asyncio.wait_for(flush(), timeout=FLUSH_TIMEOUT)
+            except Exception as e:
+                logger.error(f"Encerrando: falha no flush '{name}': {e}")
+
+        # 4. Gateway → MongoDB (ver MyBot.close)
+        try:
+            if not self.bot.is_closed():
+                await self.bot.close()
+        except Exception as e:
+            # Ex.: sinal chegou antes do login terminar
+            logger.warning(f"Erro ao fechar o bot: {e}")
+
+        logger.info(f"Encerramento concluído em {time.monotonic() - started:.1f}s")
+        self._done.set()
@@ -0,0 +1,641 @@
+# core/sqlite_store.py
+"""
+Armazenamento local em SQLite (WAL) com a mesma interface do motor.
+
+Sem MONGO_URI o bot usava `db = None` e a maioria dos cogs quebrava em
+`self.bot.db.<coleção>`. Agora, sem Mongo (ou com STORAGE_BACKEND=sqlite),
+o `Database` de core/database.py envolve este client em vez do
+AsyncIOMotorClient — os cogs, o cache de configs, as métricas e a agenda
+continuam iguais:
+
+    client = SQLiteClient("data/bot.db")
+    db = Database(client, "discordbot")
+    await db.levels.find_one({"guild_id": 1, "user_id": 2})
+
+Cada coleção é uma tabela `<banco>__<coleção>` com (id, doc JSON). O
+suportado é o que os cogs usam:
+
+    find_one / find (sort, skip, limit, projection) / count_documents
+    insert_one / insert_many / replace_one / update_one / update_many
+    find_one_and_update / delete_one / delete_many / distinct
+    filtros: igualdade, $and, $or, $in, $nin, $ne, $gt, $gte, $lt, $lte, $exists
+    updates: $set, $unset, $inc, $setOnInsert
+    aggregate: $match, $group ($sum, $max, $min, $avg, $first), $sort, $skip, $limit, $project
+
+Igualdades simples (`{"guild_id": 1}`) e ordenação por um campo viram SQL
+com índice em `guild_id`/`user_id`; o resto do filtro é avaliado em Python
+sobre as linhas já pré-filtradas. Todas as operações rodam numa única
+thread (não bloqueiam o loop e ficam serializadas — `find_one_and_update`
+é atômico também entre processos, via BEGIN IMMEDIATE). Change streams não
+existem aqui: o cache de configs fica só com o TTL.
+"""
+import os
+import re
+import json
+import uuid
+import asyncio
+import sqlite3
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+_FIELD = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_INDEXED_FIELDS = ("guild_id", "user_id")
+_SCALAR = (str, int, float)
+
+
+# ────────────────────────────────────────────────
+# Codificação dos documentos
+# ────────────────────────────────────────────────
+
+def _encode_default(value):
+    if isinstance(value, datetime.datetime):
+        return {"$date": value.isoformat()}
+    if isinstance(value, (set, tuple)):
+        return list(value)
+    return str(value)
+
+
+def _decode_hook(obj: dict):
+    if len(obj) == 1 and "$date" in obj:
+        return datetime.datetime.fromisoformat(obj["$date"])
+    return obj
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, default=_encode_default, ensure_ascii=False, separators=(",", ":"))
+
+
+def _loads(text: str):
+    return json.loads(text, object_hook=_decode_hook)
+
+
+# ────────────────────────────────────────────────
+# Filtros, updates e ordenação (semântica do Mongo, no que os cogs usam)
+# ────────────────────────────────────────────────
+
+_MISSING = object()
+
+
+def _get(doc: dict, path: str):
+    value = doc
+    for part in path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return _MISSING
+        value = value[part]
+    return value
+
+
+def _set(doc: dict, path: str, value):
+    parts = path.split(".")
+    for part in parts[:-1]:
+        doc = doc.setdefault(part, {})
+    doc[parts[-1]] = value
+
+
+def _unset(doc: dict, path: str):
+    parts = path.split(".")
+    for part in parts[:-1]:
+        doc = doc.get(part)
+        if not isinstance(doc, dict):
+            return
+    doc.pop(parts[-1], None)
+
+
+def _compare(value, op: str, operand) -> bool:
+    if op == "$exists":
+        return (value is not _MISSING) == bool(operand)
+    if op == "$ne":
+        return value is _MISSING or value != operand
+    if op == "$in":
+        return value is not _MISSING and value in operand
+    if op == "$nin":
+        return value is _MISSING or value not in operand
+    if value is _MISSING or value is None:
+        return False
+    try:
+        if op == "$gt":
+            return value > operand
+        if op == "$gte":
+            return value >= operand
+        if op == "$lt":
+            return value < operand
+        if op == "$lte":
+            return value <= operand
+    except TypeError:
+        return False
+    raise NotImplementedError(f"Operador de filtro não suportado no SQLite: {op}")
+
+
+def matches(doc: dict, query: Optional[dict]) -> bool:
+    for key, condition in (query or {}).items():
+        if key == "$or":
+            if not any(matches(doc, sub) for sub in condition):
+                return False
+        elif key == "$and":
+            if not all(matches(doc, sub) for sub in condition):
+                return False
+        elif isinstance(condition, dict) and condition and all(k.startswith("$") for k in condition):
+            value = _get(doc, key)
+            if not all(_compare(value, op, operand) for op, operand in condition.items()):
+                return False
+        else:
+            value = _get(doc, key)
+            if value is _MISSING:
+                if condition is not None:
+                    return False
+            elif value != condition:
+                return False
+    return True
+
+
+def _apply_update(doc: dict, update: dict, inserting: bool = False):
+    if not any(key.startswith("$") for key in update):
+        raise ValueError("update sem operadores ($set, $inc...) — use replace_one")
+    for op, fields in update.items():
+        if op == "$set":
+            for path, value in fields.items():
+                _set(doc, path, value)
+        elif op == "$setOnInsert":
+            if inserting:
+                for path, value in fields.items():
+                    _set(doc, path, value)
+        elif op == "$unset":
+            for path in fields:
+                _unset(doc, path)
+        elif op == "$inc":
+            for path, amount in fields.items():
+                current = _get(doc, path)
+                _set(doc, path, (0 if current is _MISSING or current is None else current) + amount)
+        else:
+            raise NotImplementedError(f"Operador de update não suportado no SQLite: {op}")
+
+
+def _seed_from_filter(query: Optional[dict]) -> dict:
+    """Campos de igualdade do filtro (viram parte do documento num upsert)."""
+    doc = {}
+    for key, value in (query or {}).items():
+        if key.startswith("$") or (isinstance(value, dict) and any(k.startswith("$") for k in value)):
+            continue
+        _set(doc, key, value)
+    return doc
+
+
+_TYPE_ORDER = {type(None): 0, int: 1, float: 1, str: 2, dict: 3, list: 4, bool: 5, datetime.datetime: 6}
+
+
+def _sort_key(value):
+    if value is _MISSING:
+        value = None
+    rank = _TYPE_ORDER.get(type(value), 7)
+    if rank in (3, 4, 7):
+        value = str(value)
+    return rank, value if value is not None else 0
+
+
+def _sort_docs(docs: List[dict], sort: List[Tuple[str, int]]) -> List[dict]:
+    # Ordenação estável: aplica do último critério para o primeiro
+    for field, direction in reversed(sort):
+        docs.sort(key=lambda d: _sort_key(_get(d, field)), reverse=direction < 0)
+    return docs
+
+
+def _normalize_sort(key_or_list, direction=None) -> List[Tuple[str, int]]:
+    if key_or_list is None:
+        return []
+    if isinstance(key_or_list, str):
+        return [(key_or_list, direction if direction is not None else 1)]
+    if isinstance(key_or_list, dict):
+        return list(key_or_list.items())
+    return [(k, d) for k, d in key_or_list]
+
+
+def _project(doc: dict, projection: Optional[dict]) -> dict:
+    if not projection:
+        return doc
+    include = {k for k, v in projection.items() if v}
+    if include:
+        result = {k: doc[k] for k in include if k in doc}
+        if projection.get("_id", 1) and "_id" in doc:
+            result["_id"] = doc["_id"]
+        return result
+    return {k: v for k, v in doc.items() if k not in projection}
+
+
+# ────────────────────────────────────────────────
+# aggregate (pipeline simples, em Python)
+# ────────────────────────────────────────────────
+
+def _expr(doc: dict, expr):
+    if isinstance(expr, str) and expr.startswith("$"):
+        value = _get(doc, expr[1:])
+        return None if value is _MISSING else value
+    return expr
+
+
+def _group(docs: List[dict], spec: dict) -> List[dict]:
+    key_expr = spec["_id"]
+    groups: Dict[Any, dict] = {}
+    counts: Dict[Any, Dict[str, int]] = {}
+    for doc in docs:
+        key = _expr(doc, key_expr)
+        hashable = _dumps(key)
+        out = groups.get(hashable)
+        if out is None:
+            out = groups[hashable] = {"_id": key}
+            counts[hashable] = {}
+        for name, accumulator in spec.items():
+            if name == "_id":
+                continue
+            (op, arg), = accumulator.items()
+            value = _expr(doc, arg)
+            if op == "$sum":
+                out[name] = out.get(name, 0) + (value if isinstance(value, (int, float)) and not isinstance(value, bool) else 0)
+            elif op in ("$max", "$min"):
+                if value is not None and (name not in out or out[name] is None or
+                                          (value > out[name] if op == "$max" else value < out[name])):
+                    out[name] = value
+                else:
+                    out.setdefault(name, None)
+            elif op == "$avg":
+                if isinstance(value, (int, float)):
+                    n = counts[hashable].get(name, 0)
+                    out[name] = ((out.get(name) or 0) * n + value) / (n + 1)
+                    counts[hashable][name] = n + 1
+                else:
+                    out.setdefault(name, None)
+            elif op == "$first":
+                out.setdefault(name, value)
+            else:
+                raise NotImplementedError(f"Acumulador não suportado no SQLite: {op}")
+    return list(groups.values())
+
+
+def run_pipeline(docs: List[dict], pipeline: Iterable[dict]) -> List[dict]:
+    for stage in pipeline:
+        (op, spec), = stage.items()
+        if op == "$match":
+            docs = [d for d in docs if matches(d, spec)]
+        elif op == "$group":
+            docs = _group(docs, spec)
+        elif op == "$sort":
+            docs = _sort_docs(docs, list(spec.items()))
+        elif op == "$skip":
+            docs = docs[spec:]
+        elif op == "$limit":
+            docs = docs[:spec]
+        elif op == "$project":
+            docs = [_project(d, spec) for d in docs]
+        else:
+            raise NotImplementedError(f"Etapa de aggregate não suportada no SQLite: {op}")
+    return docs
+
+
+# ────────────────────────────────────────────────
+# Resultados (mesmos atributos do pymongo)
+# ────────────────────────────────────────────────
+
+class InsertOneResult:
+    def __init__(self, inserted_id):
+        self.inserted_id = inserted_id
+        self.acknowledged = True
+
+
+class InsertManyResult:
+    def __init__(self, inserted_ids):
+        self.inserted_ids = inserted_ids
+        self.acknowledged = True
+
+
+class UpdateResult:
+    def __init__(self, matched_count: int, modified_count: int, upserted_id=None):
+        self.matched_count = matched_count
+        self.modified_count = modified_count
+        self.upserted_id = upserted_id
+        self.acknowledged = True
+
+
+class DeleteResult:
+    def __init__(self, deleted_count: int):
+        self.deleted_count = deleted_count
+        self.acknowledged = True
+
+
+# ────────────────────────────────────────────────
+# Client / banco / coleção
+# ────────────────────────────────────────────────
+
+class SQLiteClient:
+    """Equivalente ao AsyncIOMotorClient: `client[nome_do_banco]`, `admin.command("ping")`, `close()`."""
+
+    backend = "sqlite"
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite")
+        self._conn: Optional[sqlite3.Connection] = None
+        self._tables = set()
+        self.admin = _Admin(self)
+
+    def __getitem__(self, name: str) -> "SQLiteDatabase":
+        return SQLiteDatabase(self, name)
+
+    # Tudo abaixo roda na thread do executor
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._conn = conn
+        return self._conn
+
+    def _ensure_table(self, table: str):
+        if table in self._tables:
+            return
+        conn = self._connection()
+        conn.execute(f'CREATE TABLE IF NOT EXISTS "{table}" (id TEXT PRIMARY KEY, doc TEXT NOT NULL)')
+        for field in _INDEXED_FIELDS:
+            conn.execute(
+                f'CREATE INDEX IF NOT EXISTS "{table}__{field}" ON "{table}" (json_extract(doc, \'$.{field}\'))'
+            )
+        self._tables.add(table)
+
+    async def run(self, fn, *args):
+        # Uma thread só: a conexão nunca é usada por duas operações ao mesmo tempo
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    def close(self):
+        def _close():
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+        self._executor.submit(_close)
+        self._executor.shutdown(wait=True)
+
+
+class _Admin:
+    def __init__(self, client: SQLiteClient):
+        self._client = client
+
+    async def command(self, name: str, *args, **kwargs):
+        if name != "ping":
+            raise NotImplementedError(f"Comando não suportado no SQLite: {name}")
+        await self._client.run(lambda: self._client._connection().execute("SELECT 1").fetchone())
+        return {"ok": 1.0}
+
+
+class SQLiteDatabase:
+    def __init__(self, client: SQLiteClient, name: str):
+        self.client = client
+        self.name = name
+
+    def __getitem__(self, name: str) -> "SQLiteCollection":
+        return SQLiteCollection(self, name)
+
+    def watch(self, *args, **kwargs):
+        raise NotImplementedError("SQLite não tem change streams")
+
+
+class SQLiteCursor:
+    """Cursor preguiçoso: `sort`/`skip`/`limit` encadeáveis, executa em `to_list` ou `async for`."""
+
+    def __init__(self, collection: "SQLiteCollection", query: Optional[dict] = None,
+                 projection: Optional[dict] = None, pipeline: Optional[list] = None):
+        self._collection = collection
+        self._query = query
+        self._projection = projection
+        self._pipeline = pipeline
+        self._sort: List[Tuple[str, int]] = []
+        self._skip = 0
+        self._limit = 0
+
+    def sort(self, key_or_list, direction=None):
+        self._sort = _normalize_sort(key_or_list, direction)
+        return self
+
+    def skip(self, count: int):
+        self._skip = count
+        return self
+
+    def limit(self, count: int):
+        self._limit = count
+        return self
+
+    async def to_list(self, length=None):
+        if self._pipeline is not None:
+            docs = await self._collection._client.run(self._collection._aggregate, self._pipeline)
+        else:
+            docs = await self._collection._client.run(
+                self._collection._find, self._query, self._projection, self._sort, self._skip, self._limit
+            )
+        return docs if length is None else docs[:length]
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in await self.to_list():
+            yield doc
+
+
+class SQLiteCollection:
+    def __init__(self, database: SQLiteDatabase, name: str):
+        self.database = database
+        self.name = name
+        self._client = database.client
+        self._table = f"{database.name}__{name}"
+
+    # ── SQL (thread do executor) ─────────────────────
+
+    def _conn(self) -> sqlite3.Connection:
+        self._client._ensure_table(self._table)
+        return self._client._connection()
+
+    @staticmethod
+    def _where(query: Optional[dict]) -> Tuple[str, list, bool]:
+        """Igualdades simples → SQL. Retorna (where, params, filtro_inteiro_no_sql)."""
+        clauses, params, exact = [], [], True
+        for key, value in (query or {}).items():
+            if key == "_id" and isinstance(value, _SCALAR):
+                clauses.append("id = ?")
+                params.append(_dumps(value))
+            elif _FIELD.match(key) and isinstance(value, _SCALAR) and not isinstance(value, bool):
+                clauses.append(f"json_extract(doc, '$.{key}') = ?")
+                params.append(value)
+            else:
+                exact = False
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params, exact
+
+    def _select(self, query: Optional[dict], sort: List[Tuple[str, int]] = (), limit: int = 0) -> List[dict]:
+        where, params, exact = self._where(query)
+        sql = f'SELECT doc FROM "{self._table}"{where}'
+        sql_sorted = False
+        if exact and len(sort) == 1 and _FIELD.match(sort[0][0]) and sort[0][0] != "_id":
+            field, direction = sort[0]
+            sql += f" ORDER BY json_extract(doc, '$.{field}') {'DESC' if direction < 0 else 'ASC'}"
+            sql_sorted = True
+        if exact and limit and (sql_sorted or not sort):
+            sql += f" LIMIT {int(limit)}"
+        docs = [_loads(row[0]) for row in self._conn().execute(sql, params)]
+        if not exact:
+            docs = [d for d in docs if matches(d, query)]
+        if sort and not sql_sorted:
+            docs = _sort_docs(docs, list(sort))
+        return docs
+
+    def _write(self, doc: dict):
+        self._conn().execute(
+            f'INSERT OR REPLACE INTO "{self._table}" (id, doc) VALUES (?, ?)', (_dumps(doc["_id"]), _dumps(doc))
+        )
+
+    def _delete(self, doc_id):
+        self._conn().execute(f'DELETE FROM "{self._table}" WHERE id = ?', (_dumps(doc_id),))
+
+    def _transaction(self, fn, *args):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = fn(*args)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return result
+
+    def _find(self, query, projection, sort, skip, limit) -> List[dict]:
+        docs = self._select(query, sort, (skip + limit) if limit else 0)
+        docs = docs[skip:skip + limit] if limit else docs[skip:]
+        return [_project(d, projection) for d in docs]
+
+    def _aggregate(self, pipeline: list) -> List[dict]:
+        pipeline = list(pipeline)
+        query = None
+        if pipeline and "$match" in pipeline[0]:
+            query = pipeline.pop(0)["$match"]
+        return run_pipeline(self._select(query), pipeline)
+
+    def _insert(self, docs: List[dict]) -> list:
+        ids = []
+        for doc in docs:
+            doc.setdefault("_id", uuid.uuid4().hex)
+            if self._conn().execute(f'SELECT 1 FROM "{self._table}" WHERE id = ?', (_dumps(doc["_id"]),)).fetchone():
+                raise sqlite3.IntegrityError(f"_id duplicado: {doc['_id']}")
+            self._write(doc)
+            ids.append(doc["_id"])
+        return ids
+
+    def _replace(self, query, replacement: dict, upsert: bool) -> UpdateResult:
+        found = self._select(query, limit=1)
+        if found:
+            doc = dict(replacement, _id=found[0]["_id"])
+            self._write(doc)
+            return UpdateResult(1, 1)
+        if not upsert:
+            return UpdateResult(0, 0)
+        doc = dict(replacement)
+        doc.setdefault("_id", _seed_from_filter(query).get("_id", uuid.uuid4().hex))
+        self._write(doc)
+        return UpdateResult(0, 0, doc["_id"])
+
+    def _update(self, query, update: dict, upsert: bool, many: bool, return_doc: Optional[bool] = None,
+                sort=None, projection=None):
+        found = self._select(query, _normalize_sort(sort), 0 if many else 1)
+        if not found:
+            if not upsert:
+                return None if return_doc is not None else UpdateResult(0, 0)
+            doc = _seed_from_filter(query)
+            _apply_update(doc, update, inserting=True)
+            doc.setdefault("_id", uuid.uuid4().hex)
+            self._write(doc)
+            if return_doc is not None:
+                return _project(doc, projection) if return_doc else None
+            return UpdateResult(0, 0, doc["_id"])
+        modified = 0
+        for doc in found:
+            before = _dumps(doc)
+            original = _loads(before)
+            _apply_update(doc, update)
+            if _dumps(doc) != before:
+                self._write(doc)
+                modified += 1
+            if return_doc is not None:
+                return _project(doc if return_doc else original, projection)
+        return UpdateResult(len(found), modified)
+
+    def _remove(self, query, many: bool) -> DeleteResult:
+        found = self._select(query, limit=0 if many else 1)
+        for doc in found:
+            self._delete(doc["_id"])
+        return DeleteResult(len(found))
+
+    # ── API assíncrona (igual à do motor) ────────────
+
+    def find(self, filter: Optional[dict] = None, projection: Optional[dict] = None, **kwargs) -> SQLiteCursor:
+        cursor = SQLiteCursor(self, filter, projection)
+        if kwargs.get("sort") is not None:
+            cursor.sort(kwargs["sort"])
+        if kwargs.get("limit"):
+            cursor.limit(kwargs["limit"])
+        return cursor
+
+    def aggregate(self, pipeline: list, **kwargs) -> SQLiteCursor:
+        return SQLiteCursor(self, pipeline=pipeline)
+
+    async def find_one(self, filter: Optional[dict] = None, projection: Optional[dict] = None, sort=None, **kwargs):
+        docs = await self._client.run(self._find, filter, projection, _normalize_sort(sort), 0, 1)
+        return docs[0] if docs else None
+
+    async def count_documents(self, filter: Optional[dict] = None, **kwargs) -> int:
+        return len(await self._client.run(self._select, filter))
+
+    async def estimated_document_count(self, **kwargs) -> int:
+        return await self._client.run(lambda: self._conn().execute(f'SELECT COUNT(*) FROM "{self._table}"').fetchone()[0])
+
+    async def distinct(self, key: str, filter: Optional[dict] = None, **kwargs) -> list:
+        values = []
+        for doc in await self._client.run(self._select, filter):
+            value = _get(doc, key)
+            if value is not _MISSING and value not in values:
+                values.append(value)
+        return values
+
+    async def insert_one(self, document: dict, **kwargs) -> InsertOneResult:
+        ids = await self._client.run(self._transaction, self._insert, [document])
+        return InsertOneResult(ids[0])
+
+    async def insert_many(self, documents: Iterable[dict], **kwargs) -> InsertManyResult:
+        return InsertManyResult(await self._client.run(self._transaction, self._insert, list(documents)))
+
+    async def replace_one(self, filter: dict, replacement: dict, upsert: bool = False, **kwargs) -> UpdateResult:
+        return await self._client.run(self._transaction, self._replace, filter, replacement, upsert)
+
+    async def update_one(self, filter: dict, update: dict, upsert: bool = False, **kwargs) -> UpdateResult:
+        return await self._client.run(self._transaction, self._update, filter, update, upsert, False)
+
+    async def update_many(self, filter: dict, update: dict, upsert: bool = False, **kwargs) -> UpdateResult:
+        return await self._client.run(self._transaction, self._update, filter, update, upsert, True)
+
+    async def find_one_and_update(self, filter: dict, update: dict, projection: Optional[dict] = None,
+                                  sort=None, upsert: bool = False, return_document: bool = False, **kwargs):
+        # return_document: False = antes (ReturnDocument.BEFORE), True = depois (ReturnDocument.AFTER)
+        return await self._client.run(
+            self._transaction, self._update, filter, update, upsert, False, bool(return_document), sort, projection
+        )
+
+    async def delete_one(self, filter: dict, **kwargs) -> DeleteResult:
+        return await self._client.run(self._transaction, self._remove, filter, False)
+
+    async def delete_many(self, filter: dict, **kwargs) -> DeleteResult:
+        return await self._client.run(self._transaction, self._remove, filter, True)
+
+    async def create_index(self, keys, **kwargs) -> str:
+        # guild_id/user_id já têm índice; o resto é filtrado em Python
+        return "_".join(k if isinstance(k, str) else k[0] for k in ([keys] if isinstance(keys, str) else keys))
+
+    async def drop(self):
+        await self._client.run(lambda: self._conn().execute(f'DELETE FROM "{self._table}"'))
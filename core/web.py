@@ -0,0 +1,69 @@
+# core/web.py
+"""
+Webserver (FastAPI + uvicorn) do processo do bot: keep-alive, /health e /metrics.
+
+Fica fora do main.py porque fastapi/pydantic são a maior fatia do tempo de
+import (~0,4s): os workers do cluster.py nunca sobem o webserver e não
+pagam por ele (o cluster.py só importa fastapi/uvicorn e este módulo no
+processo supervisor, em `create_app`), e no modo de processo único o
+main.py importa este módulo em uma thread enquanto o bot já está conectando.
+"""
+import contextlib
+
+import uvicorn
+from fastapi import FastAPI, Response
+from fastapi.responses import JSONResponse
+
+from core import metrics, jsoncodec
+
+
+class CodecJSONResponse(JSONResponse):
+    """JSONResponse com orjson (core/jsoncodec.py) e snowflakes como string."""
+
+    def render(self, content) -> bytes:
+        return jsoncodec.dumps(content, safe_ints=True)
+
+
+def create_app(bot) -> FastAPI:
+    # Webserver para Render + UptimeRobot
+    app = FastAPI(
+        title="Bot Keep-Alive", description="Mantém o bot Discord ativo no Railway",
+        default_response_class=CodecJSONResponse,
+    )
+
+    @app.api_route("/", methods=["GET", "HEAD"])
+    async def root():
+        return {
+            "status": "okay",
+            "message": "Bot is running"
+        }
+
+    @app.get("/health")
+    async def health(strict: bool = False):
+        # Retrato amostrado em background pelo HealthSampler (core/health.py) — barato de consultar.
+        # ?strict=1 devolve 503 quando não está "healthy" (para monitores que só olham o status HTTP).
+        snapshot = bot.health.snapshot
+        if strict and snapshot["status"] != "healthy":
+            return CodecJSONResponse(snapshot, status_code=503)
+        return snapshot
+
+    @app.get("/metrics")
+    async def prometheus_metrics():
+        return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+    return app
+
+
+class EmbeddedServer(uvicorn.Server):
+    """uvicorn rodando no mesmo loop do bot — os sinais ficam com o launcher."""
+
+    @contextlib.contextmanager
+    def capture_signals(self):
+        # O uvicorn normalmente instala os próprios handlers e re-envia o sinal
+        # no fim, o que mataria o processo antes do bot fechar a conexão.
+        yield
+
+
+def create_server(bot, port: int) -> EmbeddedServer:
+    # log_config=None → os logs do uvicorn sobem para o root e passam pela mesma fila (core/logging_setup.py)
+    return EmbeddedServer(uvicorn.Config(create_app(bot), host="0.0.0.0", port=port, log_level="info", log_config=None))
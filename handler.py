@@ -1,6 +1,11 @@
 # handler.py
 import os
+import ast
+import time
+import asyncio
 import logging
+import importlib
+import importlib.util
 from discord.ext import commands
 
 logger = logging.getLogger(__name__)
@@ -50,6 +55,8 @@ COGS_ENABLED = {
     "owner":  [
         "commands.owner.botupdate",
         "commands.owner.cleardb",
+        "commands.owner.importtime",
+        "commands.owner.dbprofile",
     ],
     
     "welcome": [
@@ -74,48 +81,206 @@ COGS_ENABLED = {
     # "music": [...],
 }
 
+# ==============================================
+#  DEPENDÊNCIAS E POLÍTICA DE FALHA
+# ==============================================
+# Os cogs carregam em paralelo. Se um cog precisa que outro já esteja
+# carregado (ex: usa bot.get_cog(...) no cog_load), declare aqui:
+#   "commands.categoria.cog": ["commands.outra.dependencia"],
+# Obs: a ordem das etapas do on_message NÃO depende disso (core/pipeline.py).
+COGS_DEPENDENCIES = {
+}
+
+# Por categoria: "degraded" → loga a falha e segue sem o cog (padrão)
+#                "fail_fast" → aborta a inicialização do bot
+# Também dá para forçar via .env: COGS_FAIL_FAST=moderation,levels
+CATEGORY_POLICY = {
+}
+
+# Quantos cogs executam setup/cog_load ao mesmo tempo (protege o pool do MongoDB)
+LOAD_CONCURRENCY = int(os.getenv("COGS_LOAD_CONCURRENCY", 8))
+
+
+class CogLoadError(RuntimeError):
+    """Falha de um cog em uma categoria marcada como fail_fast."""
+
+
+def _category_policy(category: str) -> str:
+    forced = {c.strip() for c in os.getenv("COGS_FAIL_FAST", "").split(",") if c.strip()}
+    if category in forced:
+        return "fail_fast"
+    return CATEGORY_POLICY.get(category, "degraded")
+
+
+def _find_cycles(cogs) -> set:
+    """Cogs que fazem parte de um ciclo em COGS_DEPENDENCIES (seriam um deadlock)."""
+    in_cycle = set()
+    state = {}  # cog → "visiting" | "done"
+
+    def visit(cog, stack):
+        state[cog] = "visiting"
+        stack.append(cog)
+        for dependency in COGS_DEPENDENCIES.get(cog, []):
+            if dependency not in cogs:
+                continue
+            if state.get(dependency) == "visiting":
+                in_cycle.update(stack[stack.index(dependency):])
+            elif dependency not in state:
+                visit(dependency, stack)
+        stack.pop()
+        state[cog] = "done"
+
+    for cog in cogs:
+        if cog not in state:
+            visit(cog, [])
+    return in_cycle
+
+
+def _cog_dependencies(cog_path: str, cogs) -> list:
+    """Módulos importados no topo do arquivo do cog (lidos com ast, sem executar o cog)."""
+    try:
+        spec = importlib.util.find_spec(cog_path)
+    except (ImportError, ValueError):
+        return []
+    if spec is None or not spec.origin or not spec.origin.endswith(".py"):
+        return []
+    with open(spec.origin, "rb") as file:
+        tree = ast.parse(file.read(), spec.origin)
+
+    names = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            names.append(node.module)
+            # `from core import jsoncodec` → core.jsoncodec (se não for submódulo, o import só falha)
+            names.extend(f"{node.module}.{alias.name}" for alias in node.names if alias.name != "*")
+    # Outros cogs ficam de fora: load_extension reexecuta o módulo mesmo se já estiver em sys.modules
+    return [name for name in dict.fromkeys(names) if name not in cogs]
+
+
+def _timed_dependencies(cog_path: str, cogs) -> float:
+    # Roda numa thread: importa as dependências do cog (discord, core.*, libs) sem
+    # travar o event loop. O módulo do cog em si não — bot.load_extension sempre o
+    # executa de novo (find_spec → exec_module, ignora sys.modules).
+    start = time.perf_counter()
+    for name in _cog_dependencies(cog_path, cogs):
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass  # nome importado de dentro do módulo, ou erro real — o load_extension reporta
+    return time.perf_counter() - start
+
+
 # ==============================================
 # FUNÇÃO PRINCIPAL DE CARREGAMENTO
 # ==============================================
 
 async def load_cogs(bot: commands.Bot):
     """
-    Carrega apenas os cogs listados acima.
-    Mostra no console por categoria: o que foi ativado, falhas e avisos.
+    Carrega apenas os cogs listados acima, em paralelo:
+      1) import das dependências de cada cog em threads (tempo de deps)
+      2) bot.load_extension respeitando COGS_DEPENDENCIES (tempo de carga:
+         execução do módulo do cog + setup)
+    Mostra no console por categoria: o que foi ativado, falhas, avisos e tempos.
     """
     logger.info("═" * 50)
-    logger.info("INICIANDO CARREGAMENTO DE COGS (por categoria)")
+    logger.info("INICIANDO CARREGAMENTO DE COGS (por categoria, em paralelo)")
     logger.info("═" * 50)
+    started = time.perf_counter()
+
+    category_of = {cog: category for category, cogs in COGS_ENABLED.items() for cog in cogs}
+    results = {cog: {"status": "pending", "deps": None, "load": None, "error": None} for cog in category_of}
 
+    # ── 1) Dependências dos cogs em paralelo (threads) ──
+    async def import_dependencies(cog_path: str):
+        try:
+            results[cog_path]["deps"] = await asyncio.to_thread(_timed_dependencies, cog_path, results)
+        except Exception as e:
+            # Só aquecimento: o erro de verdade (se houver) aparece no load_extension
+            logger.debug(f"Falha ao pré-importar dependências de {cog_path}: {e}")
+
+    await asyncio.gather(*(import_dependencies(cog) for cog in results))
+    deps_elapsed = time.perf_counter() - started
+
+    # ── 2) Setup em paralelo, respeitando dependências ──
+    semaphore = asyncio.Semaphore(max(1, LOAD_CONCURRENCY))
+    tasks = {}
+
+    async def load_one(cog_path: str):
+        result = results[cog_path]
+        if result["status"] != "pending":
+            return False
+
+        for dependency in COGS_DEPENDENCIES.get(cog_path, []):
+            dep_task = tasks.get(dependency)
+            if dep_task is None or not await dep_task:
+                result.update(status="skipped", error=f"dependência {dependency} não carregou")
+                return False
+
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await bot.load_extension(cog_path)
+            except commands.ExtensionNotFound:
+                result.update(status="not_found")
+            except commands.ExtensionFailed as e:
+                result.update(status="failed", error=e)
+            except Exception as e:
+                result.update(status="failed", error=e)
+            else:
+                result["status"] = "loaded"
+            result["load"] = time.perf_counter() - start
+        return result["status"] == "loaded"
+
+    # Dependências cíclicas travariam o carregamento → esses cogs são pulados
+    for cog_path in _find_cycles(results):
+        results[cog_path].update(status="skipped", error="dependência cíclica em COGS_DEPENDENCIES")
+    for cog_path, deps in COGS_DEPENDENCIES.items():
+        for dependency in deps:
+            if dependency not in results:
+                logger.warning(f"Dependência desconhecida: {cog_path} → {dependency}")
+    for cog_path in results:
+        tasks[cog_path] = asyncio.ensure_future(load_one(cog_path))
+    await asyncio.gather(*tasks.values())
+
+    # ── Relatório por categoria ──
     total_loaded = 0
     total_failed = 0
-    total_skipped = 0
+    fail_fast_errors = []
+
+    def ms(value):
+        return f"{value * 1000:.0f}ms" if value is not None else "-"
 
     for category, cog_list in COGS_ENABLED.items():
-        logger.info(f"→ Categoria: {category.upper():<12} ({len(cog_list)} cogs configurados)")
+        policy = _category_policy(category)
+        logger.info(f"→ Categoria: {category.upper():<12} ({len(cog_list)} cogs configurados, política: {policy})")
 
         category_loaded = 0
         category_failed = 0
 
         for cog_path in cog_list:
-            try:
-                await bot.load_extension(cog_path)
-                logger.info(f"   ✓ ATIVADO: {cog_path}")
+            result = results[cog_path]
+            timing = f"(deps {ms(result['deps'])}, carga {ms(result['load'])})"
+            if result["status"] == "loaded":
+                logger.info(f"   ✓ ATIVADO: {cog_path} {timing}")
                 category_loaded += 1
-                total_loaded += 1
-            except commands.ExtensionNotFound:
+                continue
+
+            if result["status"] == "not_found":
                 logger.warning(f"   ✗ NÃO ENCONTRADO: {cog_path}")
-                category_failed += 1
-                total_failed += 1
-            except commands.ExtensionFailed as e:
-                logger.error(f"   ✗ FALHA AO CARREGAR: {cog_path} → {e}")
-                category_failed += 1
-                total_failed += 1
-            except Exception as e:
-                logger.error(f"   ✗ ERRO INESPERADO: {cog_path} → {e}")
-                category_failed += 1
-                total_failed += 1
+            elif result["status"] == "skipped":
+                logger.warning(f"   ✗ PULADO: {cog_path} → {result['error']}")
+            elif isinstance(result["error"], commands.ExtensionFailed):
+                logger.error(f"   ✗ FALHA AO CARREGAR: {cog_path} → {result['error']} {timing}")
+            else:
+                logger.error(f"   ✗ ERRO INESPERADO: {cog_path} → {result['error']} {timing}")
+            category_failed += 1
+            if policy == "fail_fast":
+                fail_fast_errors.append(cog_path)
 
+        total_loaded += category_loaded
+        total_failed += category_failed
         if category_failed == 0 and category_loaded > 0:
             logger.info(f"   → Sucesso total na categoria {category}")
         elif category_loaded == 0:
@@ -132,7 +297,7 @@ async def load_cogs(bot: commands.Bot):
                 module = rel.replace(os.sep, '.')[:-3]
                 all_possible_cogs.add(module)
 
-    enabled_flat = {cog for cats in COGS_ENABLED.values() for cog in cats}
+    enabled_flat = set(category_of)
     not_listed = all_possible_cogs - enabled_flat
 
     if not_listed:
@@ -143,10 +308,28 @@ async def load_cogs(bot: commands.Bot):
         logger.warning("Adicione-os em COGS_ENABLED se quiser usar.")
         logger.warning("═" * 50)
 
+    # Os mais lentos (deps + carga), para saber onde está o tempo do cold start
+    slowest = sorted(
+        (r for r in results.items() if r[1]["status"] == "loaded"),
+        key=lambda item: (item[1]["deps"] or 0) + (item[1]["load"] or 0),
+        reverse=True,
+    )[:5]
+
     # Resumo final
+    total_elapsed = time.perf_counter() - started
     logger.info("═" * 50)
     logger.info(f"RESUMO FINAL:")
     logger.info(f"   Cogs ativados com sucesso: {total_loaded}")
     logger.info(f"   Falhas / não encontrados:   {total_failed}")
     logger.info(f"   Total configurados:         {sum(len(lst) for lst in COGS_ENABLED.values())}")
+    logger.info(f"   Tempo total:                {ms(total_elapsed)} (dependências {ms(deps_elapsed)})")
+    if slowest:
+        logger.info(f"   Mais lentos:")
+        for cog_path, result in slowest:
+            logger.info(f"      {cog_path:<36} deps {ms(result['deps']):>6} | carga {ms(result['load']):>6}")
     logger.info("═" * 50)
+
+    bot.cog_load_report = results
+
+    if fail_fast_errors:
+        raise CogLoadError(f"Cogs obrigatórios falharam: {', '.join(fail_fast_errors)}")
@@ -3,131 +3,264 @@ from discord.ext import commands
 import os
 import logging
 import asyncio
-from typing import Dict
+import time
+import signal
+import importlib
+import contextlib
 from dotenv import load_dotenv
-import pymongo
-from fastapi import FastAPI
-import uvicorn
-import threading
 
 # Importa o handler de cogs (seu arquivo handler.py)
 from handler import load_cogs
+from core.database import Database, create_storage_client, DB_NAME, COGS_DB_NAME
+from core.cache import ConfigCache
+from core.pipeline import MessagePipeline
+from core.monitor import LoopMonitor
+from core.health import HealthSampler, PROCESS_STARTED_AT
+from core.ratelimit import RateLimiter
+from core.rest import RestScheduler
+from core.shutdown import ShutdownCoordinator
+from core.jobs import JobScheduler
+from core.keyed import KeyedQueue
+from core.offload import Offload
+from core.gateway import IdentifyLimiter, check_session_budget
+from core.recorder import GatewayRecorder
+from core.commandsync import sync_commands
+from core.logging_setup import setup_logging, bind_log_context, suppressed_count
+from core.members import build_intents, build_member_cache_flags, log_cache_report
+from core import metrics
 
 # ────────────────────────────────────────────────
-# Configuração de logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s | %(levelname)s | %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S'
-)
-logger = logging.getLogger(__name__)
-
 # Carrega variáveis de ambiente
 load_dotenv()
 
+# Workers do pool de processos (core/offload.py, spawn) reimportam este arquivo
+# como "__mp_main__": lá não se configura logging nem se cria bot, banco ou gravação
+OFFLOAD_WORKER = __name__ == "__mp_main__"
+
+# Configuração de logging (fila + thread de escrita, JSON opcional — core/logging_setup.py)
+if not OFFLOAD_WORKER:
+    setup_logging()
+logger = logging.getLogger(__name__)
+
 # Variáveis obrigatórias
 TOKEN = os.getenv('DISCORD_TOKEN')
 APPLICATION_ID = os.getenv('APPLICATION_ID')
 MONGO_URI = os.getenv('MONGO_URI')
-DB_NAME = os.getenv('DATABASE_NAME', 'discordbot')
 PORT = int(os.getenv('PORT', 10000))
 
+# Sharding (opcional) — sem SHARD_COUNT o discord.py usa o número recomendado pelo Discord.
+# SHARD_IDS aceita lista e intervalos ("0,1,2" ou "0-3"); o cluster.py preenche os dois por processo.
+def parse_shard_ids(value: str):
+    ids = []
+    for part in value.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start, end = part.split("-", 1)
+            ids.extend(range(int(start), int(end) + 1))
+        else:
+            ids.append(int(part))
+    return ids
+
+SHARD_COUNT = int(os.getenv('SHARD_COUNT')) if os.getenv('SHARD_COUNT') else None
+SHARD_IDS = parse_shard_ids(os.getenv('SHARD_IDS', '')) or None
+CLUSTER_ID = int(os.getenv('CLUSTER_ID', 0))
+
 # Validação inicial
 required_vars = {
     'DISCORD_TOKEN': TOKEN,
     'APPLICATION_ID': APPLICATION_ID
 }
 for var_name, var_value in required_vars.items():
-    if not var_value:
+    if not var_value and not OFFLOAD_WORKER:
         logger.critical(f"{var_name} não encontrado no .env")
         exit(1)
 
-if not MONGO_URI:
-    logger.warning("MONGO_URI não encontrado — rodando sem banco de dados")
+if not MONGO_URI and not OFFLOAD_WORKER:
+    logger.warning("MONGO_URI não encontrado — usando o banco local SQLite (core/sqlite_store.py)")
 
-# Conexão MongoDB (opcional)
-db = None
-if MONGO_URI:
-    try:
-        mongo_client = pymongo.MongoClient(MONGO_URI)
-        mongo_client.admin.command('ping')
-        db = mongo_client[DB_NAME]
-        logger.info("MongoDB conectado com sucesso")
-    except Exception as e:
-        logger.error(f"Erro ao conectar no MongoDB: {e}")
-        db = None
-
-# Intents necessárias
-intents = discord.Intents.default()
-intents.message_content = True
-intents.members = True
-intents.presences = True
-
-# Classe de cooldown global por usuário (6 segundos)
-class UserCooldown:
-    def __init__(self, cooldown_seconds: float = 6.0):
-        self.cooldown = cooldown_seconds
-        self.last_used: Dict[int, float] = {}  # user_id → timestamp
-
-    def is_on_cooldown(self, user_id: int) -> bool:
-        now = asyncio.get_event_loop().time()
-        last = self.last_used.get(user_id, 0)
-        return now - last < self.cooldown
-
-    def update(self, user_id: int):
-        self.last_used[user_id] = asyncio.get_event_loop().time()
-
-    def remaining(self, user_id: int) -> float:
-        now = asyncio.get_event_loop().time()
-        last = self.last_used.get(user_id, 0)
-        return max(0, self.cooldown - (now - last))
-
-cooldown_manager = UserCooldown(cooldown_seconds=6.0)
+# Intents e cache de membros (configuráveis pelo .env — ver core/members.py)
+intents = build_intents()
+member_cache_flags = build_member_cache_flags(intents)
 
 # ────────────────────────────────────────────────
-class MyBot(commands.Bot):
+class MyBot(commands.AutoShardedBot):
     def __init__(self):
+        shard_options = {}
+        if SHARD_COUNT is not None:
+            shard_options["shard_count"] = SHARD_COUNT
+            if SHARD_IDS is not None:
+                shard_options["shard_ids"] = SHARD_IDS
         super().__init__(
             command_prefix="!",
             intents=intents,
+            member_cache_flags=member_cache_flags,
+            chunk_guilds_at_startup=False,  # cache parcial basta (ver core/members.py)
             application_id=int(APPLICATION_ID),
-            help_command=None
+            help_command=None,
+            http_trace=metrics.http_trace(),  # métricas das chamadas REST ao Discord
+            **shard_options
         )
-        self.db = db
+        # Um único client (MongoDB ou SQLite local) para todos os cogs — o ping é feito no setup_hook
+        self.db = Database(create_storage_client(MONGO_URI), DB_NAME)
+        self.cogs_db = self.db.sibling(COGS_DB_NAME)
+        # Cache das configs por servidor (lidas a cada mensagem/entrada de membro)
+        self.configs = ConfigCache()
+        # Um único on_message; os cogs registram etapas (segurança → automod → auto-resposta → XP)
+        self.pipeline = MessagePipeline(self)
+        self.add_listener(self.pipeline.process, "on_message")
+        self.loop_monitor = LoopMonitor()
+        self.health = HealthSampler(self)
+        # Token buckets por usuário/servidor/global, com custo por comando
+        self.ratelimiter = RateLimiter.from_env()
+        metrics.register_ratelimiter(self.ratelimiter)
+        # Fila central das chamadas REST em massa (prioridade + revezamento entre servidores)
+        self.rest = RestScheduler(self)
+        # Ler-alterar-gravar por (servidor, usuário) em fila: XP, /daily, /work
+        self.keyed = KeyedQueue("user")
+        # Pools para CPU (processos) e I/O bloqueante (threads): backup, restore, transcripts
+        self.offload = Offload()
+        # Encerramento ordenado (drena comandos) e agenda persistente (unmute, sorteios...)
+        self.shutdown = ShutdownCoordinator(self)
+        self.jobs = JobScheduler(self)
+        self.shutdown.register_flush("agenda", self.jobs.flush)
+        # IDENTIFY em paralelo até o max_concurrency do Discord (em vez de 5s por shard)
+        self.identify_limiter = IdentifyLimiter()
+        # Gravação anonimizada dos eventos para o bench.py (só com GATEWAY_RECORD)
+        self.recorder = GatewayRecorder.from_env(self)
+        metrics.register_cache(self.configs)
+        metrics.register_log_sampler(suppressed_count)
+        # Início do processo → primeiro on_ready (exibido no /importtime)
+        self.boot_seconds = None
+
+    def dispatch(self, event_name: str, /, *args, **kwargs):
+        # Conta os eventos do gateway sem criar uma task por evento
+        if event_name == "socket_event_type":
+            metrics.GATEWAY_EVENTS.inc(event=args[0])
+        super().dispatch(event_name, *args, **kwargs)
+
+    async def before_identify_hook(self, shard_id, *, initial=False):
+        await self.identify_limiter.wait(shard_id)
 
     async def setup_hook(self):
+        self.loop_monitor.start()
+        self.health.start()
+        self.ratelimiter.start()
+        self.rest.start()
+
+        # Testa a conexão com o banco antes de carregar os cogs
+        if self.db is not None:
+            try:
+                await self.db.ping()
+                logger.info(f"Banco conectado com sucesso ({self.db.backend})")
+                if self.db.backend == "mongo":
+                    # Change streams só existem no Mongo; no SQLite o cache fica só com o TTL
+                    self.configs.start_watching(self.db, self.cogs_db)
+            except Exception as e:
+                logger.error(f"Erro ao conectar no banco ({self.db.backend}): {e}")
+                self.db.close()
+                self.db = None
+                self.cogs_db = None
+
+        # Cota diária de IDENTIFY e max_concurrency (antes de o gateway conectar)
+        try:
+            await check_session_budget(self)
+        except Exception as e:
+            logger.warning(f"Não foi possível consultar /gateway/bot: {e}")
+
         # Carrega cogs via handler
         await load_cogs(self)
-
-        # Sincronização dos slash commands
+        self.jobs.start()  # depois dos cogs: eles registram os handlers da agenda
+
+        # Sincronização dos slash commands (só se a árvore mudou — core/commandsync.py).
+        # Com vários clusters, apenas o cluster 0 sincroniza.
+        if CLUSTER_ID == 0:
+            try:
+                await sync_commands(self)
+            except Exception as e:
+                logger.error(f"Erro ao sincronizar comandos: {e}")
+
+    async def close(self):
+        # Ordem de encerramento: gateway → change streams → pool do MongoDB
         try:
-            synced = await self.tree.sync()
-            logger.info(f"Comandos slash sincronizados: {len(synced)} comandos")
-        except Exception as e:
-            logger.error(f"Erro ao sincronizar comandos: {e}")
+            await super().close()
+        finally:
+            self.loop_monitor.stop()
+            self.health.stop()
+            self.ratelimiter.stop()
+            self.rest.stop()
+            self.jobs.stop()
+            self.pipeline.stop()
+            self.keyed.stop()
+            if self.recorder is not None:
+                await self.recorder.close()
+            self.offload.shutdown()
+            self.configs.stop_watching()
+            if self.db is not None:
+                self.db.close()
+                logger.info("Conexão com o banco encerrada")
 
     async def on_ready(self):
         logger.info(f"Bot online → {self.user} (ID: {self.user.id})")
-        logger.info(f"Conectado a {len(self.guilds)} servidor(es)")
-
-    # Check global de cooldown para TODOS os comandos slash
+        logger.info(f"Conectado a {len(self.guilds)} servidor(es) em {len(self.shards)} shard(s) (cluster {CLUSTER_ID})")
+        log_cache_report(self)
+        if self.boot_seconds is None:
+            self.boot_seconds = time.time() - PROCESS_STARTED_AT
+            logger.info(f"Pronto em {self.boot_seconds:.2f}s desde o início do processo")
+
+    async def on_shard_ready(self, shard_id: int):
+        logger.info(f"Shard {shard_id} pronto")
+
+    @staticmethod
+    def _record_command(interaction: discord.Interaction, outcome: str):
+        command = interaction.command.qualified_name if interaction.command else "desconhecido"
+        metrics.COMMANDS.inc(command=command, outcome=outcome)
+        started_at = interaction.extras.get("started_at")
+        if started_at is not None:
+            metrics.COMMAND_LATENCY.observe(time.perf_counter() - started_at, command=command)
+
+    async def on_app_command_completion(self, interaction: discord.Interaction, command):
+        self._record_command(interaction, "ok")
+
+    # Check global de rate limit para TODOS os comandos slash (core/ratelimit.py)
     async def on_app_command_invoke(self, interaction: discord.Interaction) -> bool:
-        if cooldown_manager.is_on_cooldown(interaction.user.id):
-            remaining = cooldown_manager.remaining(interaction.user.id)
-            embed = discord.Embed(
-                description=f"⏳ Aguarde **{remaining:.1f} segundos** antes de usar outro comando.",
-                color=discord.Color.orange()
+        interaction.extras["started_at"] = time.perf_counter()
+        command = interaction.command.qualified_name if interaction.command else ""
+        bind_log_context(guild_id=interaction.guild_id, user_id=interaction.user.id, command=command)
+
+        # Encerrando (redeploy): não começa nada novo; o resto é drenado pelo core/shutdown.py
+        if not self.shutdown.track():
+            await interaction.response.send_message(
+                "🔄 O bot está reiniciando. Tente de novo em alguns segundos.", ephemeral=True
             )
+            interaction.extras.pop("started_at", None)
+            self._record_command(interaction, "shutting_down")
+            return False
+
+        limited = self.ratelimiter.acquire(interaction.user.id, interaction.guild_id, command)
+        if limited:
+            scope, remaining = limited
+            if scope == "user":
+                description = f"⏳ Aguarde **{remaining:.1f} segundos** antes de usar outro comando."
+            elif scope == "guild":
+                description = f"⏳ Muitos comandos neste servidor agora. Tente de novo em **{remaining:.1f} segundos**."
+            else:
+                description = f"⏳ O bot está sobrecarregado. Tente de novo em **{remaining:.1f} segundos**."
+            embed = discord.Embed(description=description, color=discord.Color.orange())
             await interaction.response.send_message(embed=embed, ephemeral=True)
+            interaction.extras.pop("started_at", None)
+            self._record_command(interaction, f"ratelimited_{scope}")
             return False  # impede o comando de rodar
 
-        cooldown_manager.update(interaction.user.id)
         return True
 
     # Tratamento global de erros nos slash commands
     async def on_app_command_error(self, interaction: discord.Interaction, error):
         from discord import app_commands
 
+        self._record_command(interaction, "denied" if isinstance(error, app_commands.CheckFailure) else "error")
+
         # Ignora cooldown aqui (já tratado no invoke)
         if isinstance(error, app_commands.CommandOnCooldown):
             return
@@ -158,34 +291,16 @@ class MyBot(commands.Bot):
         except discord.HTTPException:
             pass  # já respondido / canal deletado / etc
 
-# Instancia o bot
-bot = MyBot()
-
-# Registra o check global de interação (cooldown)
-bot.tree.interaction_check = bot.on_app_command_invoke
+# Instancia o bot (não nos workers do pool de processos — ver OFFLOAD_WORKER)
+bot = None
+if not OFFLOAD_WORKER:
+    bot = MyBot()
 
-# Registra o handler global de erros dos slash commands
-bot.tree.on_error = bot.on_app_command_error
+    # Registra o check global de interação (cooldown)
+    bot.tree.interaction_check = bot.on_app_command_invoke
 
-# ────────────────────────────────────────────────
-# Webserver para Render + UptimeRobot
-app = FastAPI(title="Bot Keep-Alive", description="Mantém o bot Discord ativo no Railway")
-
-@app.api_route("/", methods=["GET", "HEAD"])
-async def root():
-    return {
-        "status": "okay",
-        "message": "Bot is running"
-    }
-
-@app.get("/health")
-async def health():
-    return {
-        "status": "healthy" if bot.is_ready() else "starting",
-        "bot_online": bot.is_ready(),
-        "guilds": len(bot.guilds) if bot.is_ready() else 0,
-        "uptime": "N/A"  # Pode adicionar uptime se quiser
-    }
+    # Registra o handler global de erros dos slash commands
+    bot.tree.on_error = bot.on_app_command_error
 
 # ────────────────────────────────────────────────
 async def start_bot():
@@ -209,17 +324,63 @@ async def start_bot():
     else:
         logger.critical("Falhou em todas as tentativas de iniciar o bot.")
 
+async def run_all():
+    """
+    Bot e FastAPI no MESMO event loop: os endpoints podem ler caches e o
+    pool do banco do bot diretamente, sem atravessar threads.
+
+    Início: o bot começa a conectar enquanto o webserver (fastapi/uvicorn,
+    o import mais pesado) é importado numa thread; o health check responde
+    "starting" até o bot ficar pronto.
+    Fim (SIGTERM/SIGINT ou um dos dois parar): bot (gateway + MongoDB) → webserver.
+    """
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        with contextlib.suppress(NotImplementedError):  # Windows
+            loop.add_signal_handler(sig, stop.set)
+
+    bot_task = asyncio.create_task(start_bot(), name="bot")
+
+    logger.info(f"Iniciando webserver na porta {PORT}...")
+    web = await asyncio.to_thread(importlib.import_module, "core.web")
+    server = web.create_server(bot, PORT)
+    web_task = asyncio.create_task(server.serve(), name="webserver")
+    while not server.started and not web_task.done():
+        await asyncio.sleep(0.05)
+
+    stop_task = asyncio.create_task(stop.wait(), name="stop-signal")
+
+    done, _ = await asyncio.wait({web_task, bot_task, stop_task}, return_when=asyncio.FIRST_COMPLETED)
+    if stop_task in done:
+        logger.info("Sinal de encerramento recebido")
+    elif bot_task in done:
+        logger.warning("Bot parou — encerrando o webserver")
+    else:
+        logger.error("Webserver parou — encerrando o bot")
+
+    # 1) Bot: recusa interações novas, drena as em andamento, salva a agenda,
+    #    fecha o gateway e o MongoDB (core/shutdown.py)
+    await bot.shutdown.shutdown()
+    try:
+        await asyncio.wait_for(bot_task, timeout=15)
+    except asyncio.TimeoutError:
+        logger.warning("Bot não encerrou em 15s — cancelando")
+        bot_task.cancel()
+    except Exception as e:
+        logger.error(f"Erro ao encerrar bot: {e}")
+
+    # 2) Webserver
+    server.should_exit = True
+    with contextlib.suppress(Exception):
+        await web_task
+    stop_task.cancel()
+    logger.info("Aplicação encerrada")
+
+
 def run_webserver():
     try:
-        logger.info(f"Iniciando webserver na porta {PORT}...")
-        
-        # Inicia o bot em um thread separado para não bloquear o webserver
-        bot_thread = threading.Thread(target=lambda: asyncio.run(start_bot()), daemon=True)
-        bot_thread.start()
-        logger.info("Thread do bot iniciada.")
-        
-        # Roda o webserver com uvicorn
-        uvicorn.run(app, host="0.0.0.0", port=PORT, log_level="info")
+        asyncio.run(run_all())
     except Exception as e:
         logger.error(f"Erro ao iniciar webserver: {e}")
 
@@ -0,0 +1,26 @@
+import asyncio
+import types
+
+from core.health import HealthSampler
+
+
+def _bucket(remaining, expires):
+    return types.SimpleNamespace(remaining=remaining, expires=expires, _pending_requests=[])
+
+
+def test_rest_counts_exhausted_buckets_on_loop_clock():
+    async def run():
+        loop = asyncio.get_running_loop()
+        http = types.SimpleNamespace(_global_over=asyncio.Event(), _buckets={
+            "esgotado": _bucket(0, loop.time() + 5),
+            "expirado": _bucket(0, loop.time() - 5),
+            "livre": _bucket(3, loop.time() + 5),
+        })
+        http._global_over.set()
+        sampler = HealthSampler(types.SimpleNamespace(http=http))
+        return sampler._rest()
+
+    rest = asyncio.run(run())
+    assert rest["buckets"] == 3
+    assert rest["exhausted_buckets"] == 1
+    assert rest["global_ratelimited"] is False
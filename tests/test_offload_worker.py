@@ -0,0 +1,34 @@
+import os
+import sys
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# O spawn do ProcessPoolExecutor reimporta o __main__ do pai (main.py) assim
+WORKER_BOOTSTRAP = """
+import runpy
+namespace = runpy.run_path("main.py", run_name="__mp_main__")
+assert namespace["OFFLOAD_WORKER"] is True
+assert namespace["bot"] is None
+print("ok")
+"""
+
+
+def test_offload_worker_does_not_build_the_bot(tmp_path):
+    recording = tmp_path / "gravacao.jsonl.gz"
+    env = {
+        **os.environ,
+        "DISCORD_TOKEN": "x",
+        "APPLICATION_ID": "1",
+        "STORAGE_BACKEND": "sqlite",
+        "SQLITE_PATH": str(tmp_path / "bot.db"),
+        "GATEWAY_RECORD": str(recording),
+    }
+    result = subprocess.run(
+        [sys.executable, "-c", WORKER_BOOTSTRAP], cwd=ROOT, env=env, capture_output=True, text=True, timeout=60
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().endswith("ok")
+    # Nem gravação nem banco foram abertos pelo worker
+    assert not recording.exists()
+    assert not (tmp_path / "bot.db").exists()